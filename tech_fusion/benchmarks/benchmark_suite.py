@@ -0,0 +1,194 @@
+"""
+Offline benchmark suite for the simulation hot paths.
+
+Measures single-call latency and whole-universe throughput of company generation,
+valuation, integration scoring, target matching and full simulation steps across
+universe sizes, together with the peak memory traced during each case.
+
+Usage:
+    python -m tech_fusion.benchmarks.benchmark_suite --save baseline.json
+    python -m tech_fusion.benchmarks.benchmark_suite --baseline baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from tech_fusion.src.analytics.integration import IntegrationComplexity
+from tech_fusion.src.data_generator.company_generator import CompanyGenerator, SECTORS
+from tech_fusion.src.market.environment import MarketEnvironment
+from tech_fusion.src.market.participants import get_sample_participants
+from tech_fusion.src.market.valuation import Valuation
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+from tech_fusion.src.simulation.target_index import SectorIndex
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Simulation steps run with one generated acquirer per this many companies, up to DEFAULT_MAX_ACQUIRERS,
+# so that matching, auctions and candidate queues do market-scale work
+COMPANIES_PER_ACQUIRER = 50
+DEFAULT_MAX_ACQUIRERS = 2_000
+
+# Benchmarks slower, or with a higher memory peak, than baseline by more than this fraction are flagged
+DEFAULT_TOLERANCE = 0.25
+# Memory peaks below this many bytes are too small to compare meaningfully
+MIN_COMPARED_PEAK_BYTES = 1_000_000
+
+def measure(func, repeats=3):
+    """
+    Times a callable and traces its peak memory.
+
+    Returns:
+        dict: The median wall time in seconds over `repeats` runs, and the peak traced bytes of one run.
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'seconds': float(np.median(timings)), 'peak_bytes': int(peak)}
+
+def measure_per_call(func, calls=1_000, repeats=3):
+    """Times `calls` back-to-back invocations and reports the per-call latency."""
+    def batch():
+        for _ in range(calls):
+            func()
+    result = measure(batch, repeats)
+    result['seconds'] /= calls
+    return result
+
+def run_benchmarks(sizes=DEFAULT_SIZES, steps=3, seed=0, max_acquirers=DEFAULT_MAX_ACQUIRERS):
+    """
+    Runs every benchmark case at every universe size.
+
+    Returns:
+        dict: Results keyed by case name, e.g. 'valuation.batch[n=1000]'.
+    """
+    results = {}
+    rng = np.random.default_rng(seed)
+    generator = CompanyGenerator()
+    valuation = Valuation()
+    market = MarketEnvironment(events=EventStream(NullSink()))
+    analyzer = IntegrationComplexity()
+    strategic, _, _ = get_sample_participants()
+
+    # Single-call latency of the scalar APIs, independent of universe size
+    company = generator.generate_company()
+    results['generation.single'] = measure_per_call(generator.generate_company)
+    results['valuation.single'] = measure_per_call(lambda: valuation.calculate_valuation(company, market))
+    results['integration.single'] = measure_per_call(lambda: analyzer.calculate_score(strategic[0], company))
+
+    for n in sizes:
+        print(f"Benchmarking universe size {n:,}...", file=sys.stderr)
+        results[f'generation.batch[n={n}]'] = measure(lambda: generator.generate_universe(n, rng=rng), repeats=1)
+        universe = generator.generate_universe(n, rng=rng)
+
+        results[f'valuation.batch[n={n}]'] = measure(lambda: valuation.calculate_valuations(universe, market, rng=rng))
+        results[f'integration.matrix[n={n}]'] = measure(lambda: analyzer.calculate_score_matrix(strategic, universe))
+
+        results[f'matching.index_build[n={n}]'] = measure(lambda: SectorIndex(SECTORS, universe['sector']), repeats=1)
+        index = SectorIndex(SECTORS, universe['sector'])
+        all_sectors = tuple(range(len(SECTORS)))
+        results[f'matching.sample[n={n}]'] = measure_per_call(lambda: index.sample(all_sectors))
+
+        results[f'engine.init[n={n}]'] = measure(
+            lambda: SimulationEngine(num_companies=n, seed=seed, events=EventStream(NullSink())), repeats=1)
+        num_acquirers = max(1, min(max_acquirers, n // COMPANIES_PER_ACQUIRER))
+        for bidding, target_selection, case in (('auction', 'random', 'engine.step'),
+                                                ('vectorized', 'random', 'engine.step.vectorized'),
+                                                ('auction', 'ranked', 'engine.step.ranked')):
+            engine = SimulationEngine(num_companies=n, seed=seed, events=EventStream(NullSink()), bidding=bidding,
+                                      target_selection=target_selection, num_acquirers=num_acquirers)
+
+            def run_steps():
+                for _ in range(steps):
+                    engine.market_env.update()
+                    engine.update_all_valuations()
+                    engine.run_simulation_step()
+                    engine.current_step += 1
+            result = measure(run_steps, repeats=1)
+            result['seconds'] /= steps
+            results[f'{case}[n={n},acquirers={num_acquirers}]'] = result
+
+    return results
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares results against a baseline run, on both wall time and peak memory.
+
+    Returns:
+        list: (case, metric, baseline value, current value, ratio) for every case whose time or
+            memory peak grew by more than the tolerance allows.
+    """
+    regressions = []
+    for case, result in sorted(results.items()):
+        if case not in baseline:
+            continue
+        time_ratio = result['seconds'] / baseline[case]['seconds']
+        memory_ratio = result['peak_bytes'] / max(baseline[case]['peak_bytes'], 1)
+        flags = []
+        if time_ratio > 1 + tolerance:
+            flags.append('TIME')
+            regressions.append((case, 'seconds', baseline[case]['seconds'], result['seconds'], time_ratio))
+        if memory_ratio > 1 + tolerance and result['peak_bytes'] >= MIN_COMPARED_PEAK_BYTES:
+            flags.append('MEMORY')
+            regressions.append((case, 'peak_bytes', baseline[case]['peak_bytes'], result['peak_bytes'], memory_ratio))
+        flag = f"REGRESSION ({', '.join(flags)})" if flags else ""
+        print(f"{case:<50} {baseline[case]['seconds']:>12.6f}s {result['seconds']:>12.6f}s {time_ratio:>7.2f}x "
+              f"{baseline[case]['peak_bytes'] / 1e6:>9.1f} MB {result['peak_bytes'] / 1e6:>9.1f} MB {memory_ratio:>7.2f}x {flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TechFusion simulation hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Universe sizes to benchmark.")
+    parser.add_argument('--steps', type=int, default=3, help="Simulation steps timed per size.")
+    parser.add_argument('--max-acquirers', type=int, default=DEFAULT_MAX_ACQUIRERS,
+                        help="Cap on the generated acquirers of simulation step cases.")
+    parser.add_argument('--save', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare against the results in this JSON file.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown or memory growth before flagging.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(sizes=args.sizes, steps=args.steps, max_acquirers=args.max_acquirers)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform()
+        },
+        'results': results
+    }
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) of more than {args.tolerance:.0%} in time or memory.")
+            return 1
+        print("\nNo regressions.")
+    else:
+        for case, result in sorted(results.items()):
+            print(f"{case:<50} {result['seconds']:>12.6f}s {result['peak_bytes'] / 1e6:>10.1f} MB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
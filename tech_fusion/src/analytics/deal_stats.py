@@ -0,0 +1,358 @@
+import math
+
+import numpy as np
+
+# Deal attributes that statistics are broken down by, and the metrics tracked for each group
+DIMENSIONS = ['sector', 'acquirer_type', 'structure']
+METRICS = ['final_price', 'negotiated_premium', 'synergy_premium', 'total_premium']
+
+# Quantiles reported in summaries
+SUMMARY_QUANTILES = [0.05, 0.5, 0.95]
+
+# Below this many deals, a batch is cheaper to fold in one deal at a time than with NumPy
+MIN_VECTORIZED_BATCH = 16
+
+class RunningStats:
+    """
+    Count, sum, mean, variance and range of a stream of values, in constant memory.
+
+    Uses Welford's update, which stays accurate where summing squares would cancel, and
+    Chan et al.'s pairwise formula to merge the statistics of separate streams.
+    """
+    __slots__ = ('count', 'total', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other):
+        """Folds another stream's statistics into these ones."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @classmethod
+    def from_moments(cls, count, total, mean, m2, minimum, maximum):
+        """Creates the statistics of a batch whose moments were computed elsewhere, to merge them in."""
+        stats = cls()
+        stats.count, stats.total, stats.mean, stats.m2 = count, total, mean, m2
+        stats.minimum, stats.maximum = minimum, maximum
+        return stats
+
+    @property
+    def variance(self):
+        """The sample variance, 0 for fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'mean': self.mean, 'm2': self.m2,
+                'min': self.minimum, 'max': self.maximum}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count, stats.total, stats.mean, stats.m2 = data['count'], data['total'], data['mean'], data['m2']
+        stats.minimum, stats.maximum = data['min'], data['max']
+        return stats
+
+class QuantileSketch:
+    """
+    A mergeable quantile sketch with relative-error guarantees, after DDSketch.
+
+    Positive values fall in logarithmic buckets (gamma^(i-1), gamma^i] with
+    gamma = (1 + a) / (1 - a), so any quantile is returned within relative accuracy a
+    of a true value. Merging adds bucket counts, so sketches from separate runs combine
+    exactly. Past `max_buckets`, the lowest buckets are collapsed into one, trading
+    accuracy at the bottom of the distribution for bounded memory.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        # Values too small to bucket; the tracked premiums are never negative
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        """Merges the lowest buckets into one until the sketch is back within `max_buckets`."""
+        indices = sorted(self.buckets)
+        excess = len(indices) - self.max_buckets + 1
+        into = indices[excess]
+        for index in indices[:excess]:
+            self.buckets[into] += self.buckets.pop(index)
+
+    def merge(self, other):
+        """Folds another sketch with the same relative accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q):
+        """Returns the approximate q-quantile, or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # The bucket's midpoint in relative terms, within relative_accuracy of its values
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        # Bucket indices are stored as pairs since JSON object keys can only be strings
+        return {'relative_accuracy': self.relative_accuracy, 'max_buckets': self.max_buckets,
+                'zero_count': self.zero_count, 'count': self.count, 'buckets': sorted(self.buckets.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.zero_count, sketch.count = data['zero_count'], data['count']
+        sketch.buckets = {int(index): count for index, count in data['buckets']}
+        return sketch
+
+class MetricSummary:
+    """Running statistics and a quantile sketch of one metric."""
+    __slots__ = ('stats', 'sketch')
+
+    def __init__(self, relative_accuracy=0.01):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        self.stats.add(value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+
+    def summary(self):
+        stats = self.stats
+        summary = {'count': stats.count, 'sum': stats.total, 'mean': stats.mean, 'std': math.sqrt(stats.variance),
+                   'min': stats.minimum, 'max': stats.maximum}
+        for q in SUMMARY_QUANTILES:
+            summary[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+
+    def to_dict(self):
+        return {'stats': self.stats.to_dict(), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls.__new__(cls)
+        summary.stats = RunningStats.from_dict(data['stats'])
+        summary.sketch = QuantileSketch.from_dict(data['sketch'])
+        return summary
+
+class DealAnalytics:
+    """
+    Streaming statistics of closed deals, overall and by sector, acquirer type and structure.
+
+    Deals are folded in as they close and then dropped, so memory depends on the number of
+    groups rather than the number of deals. Accumulators of separate runs or processes
+    merge into the statistics of all their deals together.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        # (dimension, group) -> metric -> MetricSummary, with every deal also in ('all', 'all')
+        self.groups = {}
+
+    def _group(self, key):
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {metric: MetricSummary(self.relative_accuracy) for metric in METRICS}
+        return group
+
+    def record(self, deal):
+        """
+        Folds a closed deal into the statistics.
+
+        Args:
+            deal (DealRecord): The closed deal.
+        """
+        self._record_values(deal.target_sector, deal.acquirer.type, deal.structure, deal.final_price,
+                            deal.negotiated_premium, deal.synergy_premium)
+
+    def _record_values(self, sector, acquirer_type, structure, final_price, negotiated_premium, synergy_premium):
+        values = {
+            'final_price': final_price,
+            'negotiated_premium': negotiated_premium,
+            'synergy_premium': synergy_premium,
+            'total_premium': negotiated_premium + synergy_premium
+        }
+        keys = [('all', 'all'), ('sector', sector), ('acquirer_type', acquirer_type), ('structure', structure)]
+        for key in keys:
+            group = self._group(key)
+            for metric, value in values.items():
+                group[metric].add(value)
+
+    def record_deals(self, deals):
+        """Folds a list of closed deals into the statistics as one batch."""
+        if deals:
+            self.record_batch([deal.target_sector for deal in deals], [deal.acquirer.type for deal in deals],
+                              [deal.structure for deal in deals], [deal.final_price for deal in deals],
+                              [deal.negotiated_premium for deal in deals], [deal.synergy_premium for deal in deals])
+
+    def record_batch(self, sectors, acquirer_types, structures, final_prices, negotiated_premiums, synergy_premiums):
+        """
+        Folds many closed deals into the statistics at once.
+
+        Every group's moments and sketch buckets are computed together with `np.bincount`
+        and `np.unique`, so a batch costs a fixed number of NumPy calls plus one dict update
+        per distinct (group, bucket) pair, however many deals and groups it spans. Batches
+        smaller than MIN_VECTORIZED_BATCH are folded in one deal at a time.
+
+        Args:
+            sectors (array-like): The target sector of each deal.
+            acquirer_types (array-like): The acquirer type of each deal.
+            structures (array-like): The structure of each deal.
+            final_prices (array-like): The final price of each deal.
+            negotiated_premiums (array-like): The negotiated premium of each deal.
+            synergy_premiums (array-like): The synergy premium of each deal.
+        """
+        num_deals = len(final_prices)
+        if num_deals < MIN_VECTORIZED_BATCH:
+            for fields in zip(*(np.asarray(column).tolist() for column in (sectors, acquirer_types, structures, final_prices,
+                                                                           negotiated_premiums, synergy_premiums))):
+                self._record_values(*fields)
+            return
+        negotiated_premiums = np.asarray(negotiated_premiums, dtype=float)
+        synergy_premiums = np.asarray(synergy_premiums, dtype=float)
+        # One row per metric, in METRICS order
+        values = np.array([final_prices, negotiated_premiums, synergy_premiums, negotiated_premiums + synergy_premiums],
+                          dtype=float)
+
+        # Every deal belongs to one group per dimension; list it once per dimension with that group's ID
+        keys = [('all', 'all')]
+        group_ids = [np.zeros(num_deals, dtype=np.intp)]
+        for dimension, labels in zip(DIMENSIONS, (sectors, acquirer_types, structures)):
+            unique, inverse = np.unique(np.asarray(labels), return_inverse=True)
+            group_ids.append(inverse.reshape(-1) + len(keys))
+            keys.extend((dimension, str(label)) for label in unique)
+        group_ids = np.concatenate(group_ids)
+        values = np.tile(values, len(DIMENSIONS) + 1)
+        num_groups = len(keys)
+        counts = np.bincount(group_ids, minlength=num_groups)
+        groups = [self._group(key) for key in keys]
+
+        for metric, metric_values in zip(METRICS, values):
+            totals = np.bincount(group_ids, weights=metric_values, minlength=num_groups)
+            means = totals / np.maximum(counts, 1)
+            m2 = np.bincount(group_ids, weights=np.square(metric_values - means[group_ids]), minlength=num_groups)
+            minima = np.full(num_groups, np.inf)
+            np.minimum.at(minima, group_ids, metric_values)
+            maxima = np.full(num_groups, -np.inf)
+            np.maximum.at(maxima, group_ids, metric_values)
+
+            positive = metric_values > 0
+            zero_counts = np.bincount(group_ids[~positive], minlength=num_groups)
+            buckets = np.ceil(np.log(metric_values[positive]) / groups[0][metric].sketch.log_gamma).astype(np.int64)
+            # (group, bucket) pairs packed into one integer so that a single np.unique counts them all
+            pairs, pair_counts = np.unique(group_ids[positive].astype(np.int64) << 32 | (buckets & 0xFFFFFFFF),
+                                           return_counts=True)
+
+            for group_id, (group, count) in enumerate(zip(groups, counts.tolist())):
+                summary = group[metric]
+                summary.stats.merge(RunningStats.from_moments(count, float(totals[group_id]), float(means[group_id]),
+                                                              float(m2[group_id]), float(minima[group_id]),
+                                                              float(maxima[group_id])))
+                summary.sketch.count += count
+                summary.sketch.zero_count += int(zero_counts[group_id])
+            for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+                sketch = groups[pair >> 32][metric].sketch
+                # Undo the packing, sign-extending the 32-bit bucket index
+                index = ((pair & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000
+                sketch.buckets[index] = sketch.buckets.get(index, 0) + count
+            for group in groups:
+                if len(group[metric].sketch.buckets) > group[metric].sketch.max_buckets:
+                    group[metric].sketch._collapse()
+
+    def merge(self, other):
+        """Folds another accumulator's statistics into this one and returns it."""
+        for key, other_group in other.groups.items():
+            group = self._group(key)
+            for metric, summary in other_group.items():
+                group[metric].merge(summary)
+        return self
+
+    @property
+    def num_deals(self):
+        group = self.groups.get(('all', 'all'))
+        return group['final_price'].stats.count if group else 0
+
+    def summary(self):
+        """
+        Returns the statistics of every group.
+
+        Returns:
+            dict: Overall statistics under 'all' and per-group statistics under each
+                dimension, each mapping metrics to their count, sum, mean, standard
+                deviation, range and approximate quantiles.
+        """
+        summary = {'all': {}, **{dimension: {} for dimension in DIMENSIONS}}
+        for (dimension, group), metrics in sorted(self.groups.items()):
+            metric_summaries = {metric: metrics[metric].summary() for metric in METRICS}
+            if dimension == 'all':
+                summary['all'] = metric_summaries
+            else:
+                summary[dimension][group] = metric_summaries
+        return summary
+
+    def to_dict(self):
+        """Returns the accumulator as JSON-serializable data, for caching or passing between processes."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'groups': [[dimension, group, {metric: summary.to_dict() for metric, summary in metrics.items()}]
+                       for (dimension, group), metrics in self.groups.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        analytics = cls(data['relative_accuracy'])
+        for dimension, group, metrics in data['groups']:
+            analytics.groups[(dimension, group)] = {metric: MetricSummary.from_dict(summary)
+                                                    for metric, summary in metrics.items()}
+        return analytics
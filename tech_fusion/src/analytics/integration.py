@@ -1,4 +1,8 @@
 import random
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import TECH_STACKS, TEAM_CULTURES, PRODUCT_ARCHITECTURES
+from tech_fusion.src.utils.helpers import encode_mask, popcount
 
 class IntegrationComplexity:
     """Calculates a score representing the difficulty of integrating a target company."""
@@ -52,6 +56,77 @@ class IntegrationComplexity:
 
         return round(weighted_score, 2)
 
+    def encode_acquirers(self, acquirers):
+        """
+        Encodes acquirer integration factors for batch scoring.
+
+        Tech stacks become bitmasks and cultures and architectures become integer codes,
+        against the target vocabularies extended with any values only acquirers use.
+        Penalty tables hold the culture and architecture scores for every pair of codes.
+
+        Returns:
+            dict: Acquirer code arrays and the penalty tables.
+        """
+        tech_vocab = list(TECH_STACKS)
+        culture_vocab = list(TEAM_CULTURES)
+        arch_vocab = list(PRODUCT_ARCHITECTURES)
+        for acquirer in acquirers:
+            factors = acquirer.integration_factors
+            tech_vocab += [tech for tech in factors['tech_stack'] if tech not in tech_vocab]
+            if factors['team_culture'] not in culture_vocab:
+                culture_vocab.append(factors['team_culture'])
+            if factors['product_architecture'] not in arch_vocab:
+                arch_vocab.append(factors['product_architecture'])
+
+        return {
+            'tech_stack': np.array([encode_mask(set(a.integration_factors['tech_stack']), tech_vocab) for a in acquirers], dtype=np.uint64),
+            'team_culture': np.array([culture_vocab.index(a.integration_factors['team_culture']) for a in acquirers], dtype=np.intp),
+            'product_architecture': np.array([arch_vocab.index(a.integration_factors['product_architecture']) for a in acquirers], dtype=np.intp),
+            'culture_penalties': np.array([[self._score_team_culture(a, b) for b in culture_vocab] for a in culture_vocab], dtype=float),
+            'architecture_penalties': np.array([[self._score_product_architecture(a, b) for b in arch_vocab] for a in arch_vocab], dtype=float)
+        }
+
+    def calculate_pair_scores(self, encoded_acquirers, acquirer_idx, universe, company_ids):
+        """
+        Calculates integration complexity scores for (acquirer, target) pairs in one pass.
+
+        Args:
+            encoded_acquirers (dict): The output of `encode_acquirers`.
+            acquirer_idx (np.ndarray): Acquirer positions in the encoded list.
+            universe (CompanyUniverse): The target universe.
+            company_ids (np.ndarray): Target company IDs, broadcastable against `acquirer_idx`.
+
+        Returns:
+            np.ndarray: The same scores `calculate_score` returns, one per pair.
+        """
+        acquirer_stack = encoded_acquirers['tech_stack'][acquirer_idx]
+        target_stack = universe['tech_stack'][company_ids].astype(np.uint64)
+        overlap = popcount(acquirer_stack & target_stack)
+        total_unique = popcount(acquirer_stack | target_stack)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.where(total_unique > 0, overlap / total_unique, 1)
+        tech_score = (1 - similarity) * 100
+
+        culture_score = encoded_acquirers['culture_penalties'][
+            encoded_acquirers['team_culture'][acquirer_idx], universe['team_culture'][company_ids]]
+        arch_score = encoded_acquirers['architecture_penalties'][
+            encoded_acquirers['product_architecture'][acquirer_idx], universe['product_architecture'][company_ids]]
+
+        weighted_score = (
+            tech_score * self.weights['tech_stack'] +
+            culture_score * self.weights['team_culture'] +
+            arch_score * self.weights['product_architecture']
+        )
+        return np.round(weighted_score, 2)
+
+    def calculate_score_matrix(self, acquirers, universe, company_ids=None):
+        """Calculates the full acquirer x target integration score matrix in one vectorized call."""
+        if company_ids is None:
+            company_ids = np.arange(len(universe))
+        encoded = self.encode_acquirers(acquirers)
+        acquirer_idx = np.arange(len(acquirers))[:, None]
+        return self.calculate_pair_scores(encoded, acquirer_idx, universe, np.asarray(company_ids)[None, :])
+
 if __name__ == '__main__':
     from tech_fusion.src.market.participants import get_sample_participants
     from tech_fusion.src.data_generator.company_generator import CompanyGenerator
@@ -1,35 +1,76 @@
 import random
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import TECHNOLOGY_ASSETS
+from tech_fusion.src.utils.helpers import decode_mask, encode_mask, popcount
+
+def decode_matched_assets(matched_assets_mask):
+    """Decodes a matched-asset bitmask into asset names, for reporting."""
+    return decode_mask(matched_assets_mask, TECHNOLOGY_ASSETS)
 
 class Synergy:
     """Calculates the synergy between an acquirer and a target."""
 
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+
     def calculate_synergy(self, acquirer, target):
         """
         Calculates a synergy score and potential premium based on strategic fit.
 
         Returns:
-            dict: A dictionary containing the synergy score (0-1) and the premium (0-1).
+            dict: A dictionary containing the synergy score (0-1), the premium (0-1) and,
+                when assets match, a bitmask of the matched assets.
         """
         if acquirer.type != 'Strategic':
             return {'score': 0, 'premium': 0}
 
-        needs = set(acquirer.strategic_needs)
-        assets = set(target['technology']['assets'])
+        needs = acquirer.strategic_needs_mask
+        assets = target['technology'].get('assets_mask')
+        if assets is None:
+            assets = encode_mask(target['technology']['assets'], TECHNOLOGY_ASSETS)
         
-        matches = needs.intersection(assets)
+        matches = needs & assets
         
         if not matches:
             return {'score': 0, 'premium': 0}
 
         # Score is based on how many of the acquirer's needs are met
-        score = len(matches) / len(needs)
+        score = bin(matches).count('1') / bin(needs).count('1')
         
         # Premium is a function of the synergy score
         # A perfect score might justify up to a 40% premium
-        premium = score * random.uniform(0.2, 0.4)
+        premium = score * self.rng.uniform(0.2, 0.4)
         
         return {
             'score': round(score, 2),
             'premium': round(premium, 2),
-            'matched_assets': list(matches)
+            'matched_assets_mask': matches
+        }
+
+    def calculate_synergy_batch(self, need_masks, asset_masks, rng=None):
+        """
+        Calculates synergy for arrays of (acquirer, target) pairs at once.
+
+        Args:
+            need_masks (np.ndarray): Strategic-needs bitmask of each pair's acquirer, 0 for financial buyers.
+            asset_masks (np.ndarray): Technology-asset bitmask of each pair's target.
+            rng (np.random.Generator, optional): The random generator to draw premiums from.
+
+        Returns:
+            dict: Arrays of scores, premiums and matched-asset bitmasks, one per pair.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        need_masks = np.asarray(need_masks, dtype=np.uint64)
+        matches = need_masks & np.asarray(asset_masks, dtype=np.uint64)
+
+        needed = popcount(need_masks)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.where(needed > 0, popcount(matches) / needed, 0.0)
+        premium = score * rng.uniform(0.2, 0.4, size=score.shape)
+
+        return {
+            'score': np.round(score, 2),
+            'premium': np.round(premium, 2),
+            'matched_assets_mask': matches
         }
@@ -1,28 +1,121 @@
-import faker
 import random
 import numpy as np
 
+from tech_fusion.src.data_generator import name_pool
+from tech_fusion.src.utils.helpers import decode_mask, sample_masks
+
+SECTORS = ['AI', 'Cybersecurity', 'SaaS', 'Infrastructure', 'Marketing Tech', 'Computer Vision']
+
+TECHNOLOGY_ASSETS = [
+    'Natural Language Processing', 'Computer Vision Model',
+    'Recommendation Engine', 'Predictive Analytics Suite',
+    'Fraud Detection System', 'Autonomous Vehicle Tech',
+    'Voice Recognition API', 'Data-Intensive Cloud Platform'
+]
+
+COMPETITIVE_MOATS = ["Network Effects", "High Switching Costs", "Brand Equity", "Proprietary Tech", "Scale Advantage"]
+
+TECH_STACKS = ['Python', 'Java', 'Go', 'AWS', 'Azure', 'GCP', 'React', 'Vue', 'Kubernetes']
+TEAM_CULTURES = ['agile', 'hierarchical', 'remote-first', 'sales-driven']
+PRODUCT_ARCHITECTURES = ['monolith', 'microservices', 'hybrid']
+
+# Growth and EBITDA margin scaling applied per sector
+SECTOR_ADJUSTMENTS = {
+    'AI': (1.5, 0.8),
+    'Cybersecurity': (1.2, 1.1)
+}
+
+class CompanyUniverse:
+    """A struct-of-arrays company universe, one NumPy column per company attribute."""
+
+    def __init__(self, columns, name_seed=0):
+        self.columns = columns
+        self.name_seed = name_seed
+
+    def __len__(self):
+        return len(self.columns['arr'])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def company_identity(self, company_id):
+        """Returns the (name, location) of a company, derived deterministically from its ID."""
+        return name_pool.company_identity(self.name_seed, int(company_id))
+
+    def company(self, company_id, identity=True):
+        """
+        Builds the nested dict view of a single company, as produced by `generate_company`.
+
+        Args:
+            company_id (int): The company ID.
+            identity (bool): Whether to include the name and location; headless callers
+                skip them so that no names are ever generated.
+        """
+        c = self.columns
+        i = company_id
+        runway = float(c['runway_months'][i])
+        company = {
+            "id": i,
+            "sector": SECTORS[c['sector'][i]],
+            "year_founded": int(c['year_founded'][i]),
+            "financials": {
+                "arr": float(c['arr'][i]),
+                "growth_rate": float(c['growth_rate'][i]),
+                "ebitda_margin": float(c['ebitda_margin'][i]),
+                "burn_rate": float(c['burn_rate'][i]),
+                "runway_months": runway if runway != float('inf') else 'infinite'
+            },
+            "technology": {
+                "patents": int(c['patents'][i]),
+                "assets": decode_mask(c['assets'][i], TECHNOLOGY_ASSETS),
+                "assets_mask": int(c['assets'][i])
+            },
+            "market_position": {
+                "customer_concentration": float(c['customer_concentration'][i]),
+                "churn_rate": float(c['churn_rate'][i]),
+                "competitive_moat": COMPETITIVE_MOATS[c['competitive_moat'][i]]
+            },
+            "team": {
+                "total_employees": int(c['total_employees'][i]),
+                "engineering_ratio": float(c['engineering_ratio'][i]),
+                "ai_ml_experts": int(c['ai_ml_experts'][i]),
+                "retention_rate": float(c['retention_rate'][i])
+            },
+            "operations": {
+                "cloud_costs_per_month": float(c['cloud_costs_per_month'][i]),
+                "customer_acquisition_cost": float(c['customer_acquisition_cost'][i]),
+                "lifetime_value": float(c['lifetime_value'][i])
+            },
+            "integration_factors": {
+                "tech_stack": decode_mask(c['tech_stack'][i], TECH_STACKS),
+                "team_culture": TEAM_CULTURES[c['team_culture'][i]],
+                "product_architecture": PRODUCT_ARCHITECTURES[c['product_architecture'][i]]
+            }
+        }
+        if identity:
+            company["name"], company["location"] = self.company_identity(i)
+        return company
+
 class CompanyGenerator:
     """Generates synthetic company data for M&A simulation."""
 
-    def __init__(self):
-        self.fake = faker.Faker()
+    def __init__(self, rng=None):
+        # Scalar draws come from a random.Random-like stream, the global one by default
+        self.rng = rng if rng is not None else random
 
     def _generate_financial_metrics(self, sector):
         """Generates financial metrics for a company."""
-        arr = random.uniform(1_000_000, 500_000_000)
-        growth_rate = random.uniform(-0.1, 0.5)
-        ebitda_margin = random.uniform(-0.5, 0.3)
-        burn_rate = abs(random.uniform(-500_000, -10_000)) if ebitda_margin < 0 else 0
+        arr = self.rng.uniform(1_000_000, 500_000_000)
+        growth_rate = self.rng.uniform(-0.1, 0.5)
+        ebitda_margin = self.rng.uniform(-0.5, 0.3)
+        burn_rate = abs(self.rng.uniform(-500_000, -10_000)) if ebitda_margin < 0 else 0
         runway = (arr / 12 * ebitda_margin) / burn_rate if burn_rate > 0 else float('inf')
 
         # Sector specific adjustments
-        if sector == 'AI':
-            growth_rate *= 1.5
-            ebitda_margin *= 0.8
-        elif sector == 'Cybersecurity':
-            growth_rate *= 1.2
-            ebitda_margin *= 1.1
+        if sector in SECTOR_ADJUSTMENTS:
+            growth_factor, margin_factor = SECTOR_ADJUSTMENTS[sector]
+            growth_rate *= growth_factor
+            ebitda_margin *= margin_factor
 
         return {
             "arr": round(arr, 2),
@@ -34,69 +127,63 @@ class CompanyGenerator:
 
     def _generate_technology_profile(self):
         """Generates a profile of the company's technology assets."""
-        all_assets = [
-            'Natural Language Processing', 'Computer Vision Model', 
-            'Recommendation Engine', 'Predictive Analytics Suite',
-            'Fraud Detection System', 'Autonomous Vehicle Tech',
-            'Voice Recognition API', 'Data-Intensive Cloud Platform'
-        ]
         return {
-            "patents": random.randint(0, 500),
-            "assets": random.sample(all_assets, k=random.randint(1, 3))
+            "patents": self.rng.randint(0, 500),
+            "assets": self.rng.sample(TECHNOLOGY_ASSETS, k=self.rng.randint(1, 3))
         }
 
     def _generate_market_position(self):
         """Generates market position details."""
         return {
-            "customer_concentration": round(random.uniform(0.05, 0.4), 2),
-            "churn_rate": round(random.uniform(0.02, 0.25), 2),
-            "competitive_moat": random.choice(["Network Effects", "High Switching Costs", "Brand Equity", "Proprietary Tech", "Scale Advantage"])
+            "customer_concentration": round(self.rng.uniform(0.05, 0.4), 2),
+            "churn_rate": round(self.rng.uniform(0.02, 0.25), 2),
+            "competitive_moat": self.rng.choice(COMPETITIVE_MOATS)
         }
 
     def _generate_team_composition(self):
         """Generates team composition details."""
-        total_employees = random.randint(50, 5000)
-        engineering_ratio = random.uniform(0.3, 0.7)
+        total_employees = self.rng.randint(50, 5000)
+        engineering_ratio = self.rng.uniform(0.3, 0.7)
         engineers = int(total_employees * engineering_ratio)
-        ai_ml_expertise_ratio = random.uniform(0.1, 0.5)
+        ai_ml_expertise_ratio = self.rng.uniform(0.1, 0.5)
         return {
             "total_employees": total_employees,
             "engineering_ratio": round(engineering_ratio, 2),
             "ai_ml_experts": int(engineers * ai_ml_expertise_ratio),
-            "retention_rate": round(random.uniform(0.75, 0.98), 2)
+            "retention_rate": round(self.rng.uniform(0.75, 0.98), 2)
         }
 
     def _generate_operational_metrics(self):
         """Generates operational metrics."""
-        cac = random.uniform(500, 10000)
-        ltv = cac * random.uniform(3, 10)
+        cac = self.rng.uniform(500, 10000)
+        ltv = cac * self.rng.uniform(3, 10)
         return {
-            "cloud_costs_per_month": round(random.uniform(100_000, 2_000_000), 2),
+            "cloud_costs_per_month": round(self.rng.uniform(100_000, 2_000_000), 2),
             "customer_acquisition_cost": round(cac, 2),
             "lifetime_value": round(ltv, 2)
         }
 
     def generate_company(self):
         """Generates a single synthetic company profile."""
-        sector = random.choice(['AI', 'Cybersecurity', 'SaaS', 'Infrastructure', 'Marketing Tech', 'Computer Vision'])
-        company_name = self.fake.company()
+        sector = self.rng.choice(SECTORS)
+        company_name, location = name_pool.random_identity(self.rng)
         
         financials = self._generate_financial_metrics(sector)
         
         company = {
             "name": company_name,
             "sector": sector,
-            "year_founded": random.randint(2010, 2024),
-            "location": self.fake.city(),
+            "year_founded": self.rng.randint(2010, 2024),
+            "location": location,
             "financials": financials,
             "technology": self._generate_technology_profile(),
             "market_position": self._generate_market_position(),
             "team": self._generate_team_composition(),
             "operations": self._generate_operational_metrics(),
             "integration_factors": {
-                "tech_stack": random.sample(['Python', 'Java', 'Go', 'AWS', 'Azure', 'GCP', 'React', 'Vue', 'Kubernetes'], k=random.randint(2, 4)),
-                "team_culture": random.choice(['agile', 'hierarchical', 'remote-first', 'sales-driven']),
-                "product_architecture": random.choice(['monolith', 'microservices', 'hybrid'])
+                "tech_stack": self.rng.sample(TECH_STACKS, k=self.rng.randint(2, 4)),
+                "team_culture": self.rng.choice(TEAM_CULTURES),
+                "product_architecture": self.rng.choice(PRODUCT_ARCHITECTURES)
             }
         }
         return company
@@ -105,8 +192,85 @@ class CompanyGenerator:
         """Generates a list of synthetic company profiles."""
         return [self.generate_company() for _ in range(num_companies)]
 
+    def generate_universe(self, num_companies, rng=None):
+        """
+        Generates a whole company universe as columns in a few vectorized draws.
+
+        Uses the same distributions and sector adjustments as `generate_company`, but
+        stores sectors, cultures and architectures as integer codes and assets and tech
+        stacks as bitmasks. Names and locations are only produced when a company's dict
+        view is requested.
+
+        Args:
+            num_companies (int): The number of companies to generate.
+            rng (np.random.Generator, optional): The random generator to draw from.
+
+        Returns:
+            CompanyUniverse: The generated universe.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n = num_companies
+
+        sector = rng.integers(0, len(SECTORS), size=n).astype(np.uint8)
+
+        # Financial metrics
+        arr = rng.uniform(1_000_000, 500_000_000, size=n)
+        growth_rate = rng.uniform(-0.1, 0.5, size=n)
+        ebitda_margin = rng.uniform(-0.5, 0.3, size=n)
+        burn_rate = np.where(ebitda_margin < 0, np.abs(rng.uniform(-500_000, -10_000, size=n)), 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            runway = np.where(burn_rate > 0, (arr / 12 * ebitda_margin) / burn_rate, np.inf)
+
+        growth_factor = np.ones(len(SECTORS))
+        margin_factor = np.ones(len(SECTORS))
+        for name, (growth_adj, margin_adj) in SECTOR_ADJUSTMENTS.items():
+            growth_factor[SECTORS.index(name)] = growth_adj
+            margin_factor[SECTORS.index(name)] = margin_adj
+        growth_rate *= growth_factor[sector]
+        ebitda_margin *= margin_factor[sector]
+
+        # Team composition
+        total_employees = rng.integers(50, 5001, size=n)
+        engineering_ratio = rng.uniform(0.3, 0.7, size=n)
+        engineers = (total_employees * engineering_ratio).astype(np.int64)
+        ai_ml_experts = (engineers * rng.uniform(0.1, 0.5, size=n)).astype(np.int64)
+
+        # Operational metrics
+        cac = rng.uniform(500, 10000, size=n)
+        ltv = cac * rng.uniform(3, 10, size=n)
+
+        columns = {
+            'sector': sector,
+            'year_founded': rng.integers(2010, 2025, size=n).astype(np.int16),
+            'arr': np.round(arr, 2),
+            'growth_rate': np.round(growth_rate, 2),
+            'ebitda_margin': np.round(ebitda_margin, 2),
+            'burn_rate': np.round(burn_rate, 2),
+            'runway_months': np.round(runway, 1),
+            'patents': rng.integers(0, 501, size=n).astype(np.int16),
+            'assets': sample_masks(rng, n, len(TECHNOLOGY_ASSETS), 1, 3).astype(np.uint8),
+            'customer_concentration': np.round(rng.uniform(0.05, 0.4, size=n), 2),
+            'churn_rate': np.round(rng.uniform(0.02, 0.25, size=n), 2),
+            'competitive_moat': rng.integers(0, len(COMPETITIVE_MOATS), size=n).astype(np.uint8),
+            'total_employees': total_employees.astype(np.int32),
+            'engineering_ratio': np.round(engineering_ratio, 2),
+            'ai_ml_experts': ai_ml_experts.astype(np.int32),
+            'retention_rate': np.round(rng.uniform(0.75, 0.98, size=n), 2),
+            'cloud_costs_per_month': np.round(rng.uniform(100_000, 2_000_000, size=n), 2),
+            'customer_acquisition_cost': np.round(cac, 2),
+            'lifetime_value': np.round(ltv, 2),
+            'tech_stack': sample_masks(rng, n, len(TECH_STACKS), 2, 4).astype(np.uint16),
+            'team_culture': rng.integers(0, len(TEAM_CULTURES), size=n).astype(np.uint8),
+            'product_architecture': rng.integers(0, len(PRODUCT_ARCHITECTURES), size=n).astype(np.uint8)
+        }
+        return CompanyUniverse(columns, name_seed=int(rng.integers(0, 2**31)))
+
 if __name__ == '__main__':
     generator = CompanyGenerator()
     companies = generator.generate_companies(5)
     import json
     print(json.dumps(companies, indent=2))
+
+    universe = generator.generate_universe(100_000)
+    print(f"\nGenerated a columnar universe of {len(universe):,} companies. First company:")
+    print(json.dumps(universe.company(0), indent=2))
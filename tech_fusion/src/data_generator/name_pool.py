@@ -0,0 +1,80 @@
+# Company names and cities derived on demand from a company ID. Faker is only imported,
+# and the pool of last names and cities only generated, the first time a name is needed,
+# so headless runs never pay for either; after that an identity is a hash and a few lookups.
+
+NUM_LAST_NAMES = 500
+NUM_CITIES = 500
+POOL_SEED = 0
+
+# Faker's en_US company formats and suffixes, which the pool reproduces
+COMPANY_SUFFIXES = ['Inc', 'and Sons', 'LLC', 'Group', 'PLC', 'Ltd']
+
+_MASK = (1 << 64) - 1
+
+_pool = None
+
+def _mix(value):
+    """SplitMix64 finalizer: spreads an integer key over 64 well-mixed bits."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+class NamePool:
+    """A fixed pool of last names and cities that company identities are composed from."""
+
+    def __init__(self, last_names, cities):
+        self.last_names = last_names
+        self.cities = cities
+
+    @classmethod
+    def generate(cls, num_last_names=NUM_LAST_NAMES, num_cities=NUM_CITIES, seed=POOL_SEED):
+        """Generates a deterministic pool of distinct names with Faker."""
+        import faker
+        fake = faker.Faker()
+        fake.seed_instance(seed)
+        return cls(cls._distinct(fake.last_name, num_last_names), cls._distinct(fake.city, num_cities))
+
+    @staticmethod
+    def _distinct(draw, count, max_draws_per_value=50):
+        """Draws up to `count` distinct values, keeping draw order, giving up once the source runs dry."""
+        values = {}
+        for _ in range(count * max_draws_per_value):
+            values[draw()] = None
+            if len(values) == count:
+                break
+        return list(values)
+
+    def company_name(self, key):
+        """Composes a company name from a 64-bit key, in one of Faker's company formats."""
+        names = self.last_names
+        first = names[(key >> 8) % len(names)]
+        second = names[(key >> 24) % len(names)]
+        form = key % 3
+        if form == 0:
+            return f"{first} {COMPANY_SUFFIXES[(key >> 40) % len(COMPANY_SUFFIXES)]}"
+        if form == 1:
+            return f"{first}-{second}"
+        return f"{first}, {second} and {names[(key >> 40) % len(names)]}"
+
+    def city(self, key):
+        return self.cities[_mix(key) % len(self.cities)]
+
+def get_name_pool():
+    """Returns the process-wide name pool, generating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = NamePool.generate()
+    return _pool
+
+def company_identity(name_seed, company_id):
+    """Returns the (name, city) of a company, derived deterministically from its universe's seed and its ID."""
+    key = _mix(((name_seed & 0xFFFFFFFF) << 32) | (company_id & 0xFFFFFFFF))
+    pool = get_name_pool()
+    return pool.company_name(key), pool.city(key)
+
+def random_identity(rng):
+    """Returns a (name, city) drawn from a random.Random-like stream."""
+    key = rng.getrandbits(64)
+    pool = get_name_pool()
+    return pool.company_name(key), pool.city(key)
@@ -1,32 +1,46 @@
 import random
 
+from tech_fusion.src.simulation.events import EventStream
+
+# Market dynamics, shared with the vectorized scenario generator
+INITIAL_RATE_RANGE = (0.01, 0.05) # 1% to 5%
+RATE_SHOCK_RANGE = (0.95, 1.05)
+RATE_BOUNDS = (0.005, 0.08) # Clamp between 0.5% and 8%
+BULL_PROBABILITY = 0.1
+BEAR_PROBABILITY = 0.1
+
+SENTIMENT_MULTIPLIERS = {
+    'bull': 1.2,
+    'neutral': 1.0,
+    'bear': 0.8
+}
+
 class MarketEnvironment:
     """Models the overall economic environment."""
-    def __init__(self):
-        self.interest_rate = random.uniform(0.01, 0.05) # 1% to 5%
+    def __init__(self, rng=None, events=None):
+        self.rng = rng if rng is not None else random
+        self.events = events if events is not None else EventStream()
+        self.interest_rate = self.rng.uniform(*INITIAL_RATE_RANGE)
         self.market_sentiment = 'neutral' # neutral, bull, bear
-        self.sentiment_multipliers = {
-            'bull': 1.2,
-            'neutral': 1.0,
-            'bear': 0.8
-        }
+        self.sentiment_multipliers = dict(SENTIMENT_MULTIPLIERS)
 
     def update(self):
         """Simulates a change in the market environment for the next step."""
         # Fluctuate interest rates
-        self.interest_rate *= random.uniform(0.95, 1.05)
-        self.interest_rate = max(0.005, min(self.interest_rate, 0.08)) # Clamp between 0.5% and 8%
+        self.interest_rate *= self.rng.uniform(*RATE_SHOCK_RANGE)
+        self.interest_rate = max(RATE_BOUNDS[0], min(self.interest_rate, RATE_BOUNDS[1]))
 
         # Change market sentiment
-        roll = random.random()
-        if roll < 0.1:
+        roll = self.rng.random()
+        if roll < BULL_PROBABILITY:
             self.market_sentiment = 'bull'
-        elif roll < 0.2:
+        elif roll < BULL_PROBABILITY + BEAR_PROBABILITY:
             self.market_sentiment = 'bear'
         else:
             self.market_sentiment = 'neutral'
             
-        print(f"\n[Market Update] Sentiment: {self.market_sentiment.upper()} | Interest Rate: {self.interest_rate:.2%}")
+        if self.events.enabled:
+            self.events.emit('market_update', sentiment=self.market_sentiment, interest_rate=self.interest_rate)
 
     def get_sentiment_multiplier(self):
         """Returns the valuation multiplier for the current market sentiment."""
@@ -1,7 +1,35 @@
+import math
 import random
 
+from tech_fusion.src.data_generator.company_generator import SECTORS, TECHNOLOGY_ASSETS, TECH_STACKS
+from tech_fusion.src.utils.helpers import encode_mask
+
+# Relative weight of each investment focus when drawing acquirer populations. Cloud and
+# Logistics match no target sector, so, as with the sample acquirers, they only ever come
+# alongside at least one focus that does.
+FOCUS_WEIGHTS = {
+    'AI': 5, 'Cybersecurity': 3, 'SaaS': 4, 'Infrastructure': 3,
+    'Marketing Tech': 1, 'Computer Vision': 2, 'Cloud': 3, 'Logistics': 1
+}
+SECTOR_FOCUS_WEIGHTS = {focus: weight for focus, weight in FOCUS_WEIGHTS.items() if focus in SECTORS}
+
+# Strategic acquirers are established companies, so they lean hierarchical and away from monoliths
+STRATEGIC_CULTURE_WEIGHTS = {'agile': 3, 'hierarchical': 4, 'remote-first': 2, 'sales-driven': 1}
+ARCHITECTURE_WEIGHTS = {'monolith': 1, 'microservices': 4, 'hybrid': 3}
+
+# Share of financial buyers that are generalist growth funds
+GENERALIST_SHARE = 0.15
+
+# Fund sizes are roughly log-normal: many small funds and a few megafunds, in billions
+DRY_POWDER_MEDIAN_B = 15
+DRY_POWDER_SIGMA = 1.3
+DRY_POWDER_RANGE_B = (1, 500)
+
 class Acquirer:
     """Base class for an acquirer."""
+    # Slotted so that populations of thousands of acquirers stay compact
+    __slots__ = ('name', 'type', 'investment_focus')
+
     def __init__(self, name, acquirer_type, investment_focus):
         self.name = name
         self.type = acquirer_type
@@ -9,17 +37,24 @@ class Acquirer:
 
 class StrategicAcquirer(Acquirer):
     """Represents a strategic acquirer, e.g., a tech giant."""
-    def __init__(self, name, investment_focus, integration_factors, strategic_needs):
+    __slots__ = ('synergy_potential', 'integration_factors', 'strategic_needs', 'strategic_needs_mask')
+
+    def __init__(self, name, investment_focus, integration_factors, strategic_needs, rng=random):
         super().__init__(name, "Strategic", investment_focus)
-        self.synergy_potential = random.uniform(0.1, 0.5)
+        self.synergy_potential = rng.uniform(0.1, 0.5)
         self.integration_factors = integration_factors
         self.strategic_needs = strategic_needs
+        self.strategic_needs_mask = encode_mask(strategic_needs, TECHNOLOGY_ASSETS)
 
 class FinancialBuyer(Acquirer):
     """Represents a financial buyer, e.g., a private equity firm."""
-    def __init__(self, name, investment_focus):
+    __slots__ = ('dry_powder_b',)
+
+    def __init__(self, name, investment_focus, rng=random, dry_powder_b=None):
         super().__init__(name, "Financial", investment_focus)
-        self.dry_powder_b = random.uniform(1, 500) # in billions
+        if dry_powder_b is None:
+            dry_powder_b = rng.uniform(1, 500)
+        self.dry_powder_b = dry_powder_b # in billions
 
 class Advisor:
     """Represents an advisory firm."""
@@ -29,33 +64,91 @@ class Advisor:
         self.specialization = specialization
 
 
-def get_sample_participants():
-    """Returns a list of sample market participants."""
+def get_sample_participants(rng=random):
+    """Returns a list of sample market participants, drawing their random traits from `rng`."""
     strategic_acquirers = [
         StrategicAcquirer("TechCorp (Google-like)", ["AI", "Cloud", "Infrastructure"], 
                           {'tech_stack': ['Python', 'Go', 'GCP', 'Kubernetes'], 'team_culture': 'agile', 'product_architecture': 'microservices'},
-                          strategic_needs=['Voice Recognition API', 'Predictive Analytics Suite']),
+                          strategic_needs=['Voice Recognition API', 'Predictive Analytics Suite'], rng=rng),
         StrategicAcquirer("Innovate Inc. (Microsoft-like)", ["SaaS", "Cybersecurity", "AI"], 
                           {'tech_stack': ['C#', 'Java', 'Azure', 'React'], 'team_culture': 'hierarchical', 'product_architecture': 'hybrid'},
-                          strategic_needs=['Recommendation Engine', 'Fraud Detection System']),
+                          strategic_needs=['Recommendation Engine', 'Fraud Detection System'], rng=rng),
         StrategicAcquirer("Global Solutions (Amazon-like)", ["Infrastructure", "Logistics", "AI"], 
                           {'tech_stack': ['Java', 'Python', 'AWS', 'Kubernetes'], 'team_culture': 'remote-first', 'product_architecture': 'microservices'},
-                          strategic_needs=['Data-Intensive Cloud Platform', 'Autonomous Vehicle Tech'])
+                          strategic_needs=['Data-Intensive Cloud Platform', 'Autonomous Vehicle Tech'], rng=rng)
     ]
 
     financial_buyers = [
-        FinancialBuyer("Vista Equity Partners-like", ["SaaS"]),
-        FinancialBuyer("Thoma Bravo-like", ["Cybersecurity", "SaaS"]),
-        FinancialBuyer("Sequoia Growth-like", ["High-Growth Tech"])
+        FinancialBuyer("Vista Equity Partners-like", ["SaaS"], rng=rng),
+        FinancialBuyer("Thoma Bravo-like", ["Cybersecurity", "SaaS"], rng=rng),
+        FinancialBuyer("Sequoia Growth-like", ["High-Growth Tech"], rng=rng)
     ]
 
-    advisors = [
+    return strategic_acquirers, financial_buyers, get_sample_advisors()
+
+def get_sample_advisors():
+    """Returns the sample advisory firms."""
+    return [
         Advisor("Goldman Sachs-like", "Investment Bank", "Tech M&A"),
         Advisor("Kirkland & Ellis-like", "Legal Firm", "Private Equity Deals"),
         Advisor("Deloitte-like", "Accounting Firm", "Due Diligence")
     ]
 
-    return strategic_acquirers, financial_buyers, advisors
+def _weighted_sample(weights, k, rng):
+    """Draws k distinct keys of `weights` with probability proportional to their weight."""
+    # Efraimidis-Spirakis: keep the k largest u ** (1 / weight)
+    keys = sorted(weights, key=lambda key: rng.random() ** (1 / weights[key]), reverse=True)
+    return keys[:k]
+
+def _weighted_choice(weights, rng):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def _draw_focus(k, rng):
+    """Draws k distinct investment foci, at least one of them a target sector."""
+    investment_focus = _weighted_sample(FOCUS_WEIGHTS, k, rng)
+    if not any(focus in SECTORS for focus in investment_focus):
+        # An acquirer without a target sector could never find a target
+        investment_focus[-1] = _weighted_choice(SECTOR_FOCUS_WEIGHTS, rng)
+    return investment_focus
+
+def generate_strategic_acquirer(index, rng=random):
+    """Generates a strategic acquirer with randomly drawn focus, integration factors and needs."""
+    investment_focus = _draw_focus(rng.randint(2, 3), rng)
+    integration_factors = {
+        'tech_stack': rng.sample(TECH_STACKS, rng.randint(3, 5)),
+        'team_culture': _weighted_choice(STRATEGIC_CULTURE_WEIGHTS, rng),
+        'product_architecture': _weighted_choice(ARCHITECTURE_WEIGHTS, rng)
+    }
+    strategic_needs = rng.sample(TECHNOLOGY_ASSETS, rng.randint(1, 3))
+    return StrategicAcquirer(f"Strategic Acquirer {index:04d}", investment_focus, integration_factors,
+                             strategic_needs=strategic_needs, rng=rng)
+
+def generate_financial_buyer(index, rng=random):
+    """Generates a financial buyer with a randomly drawn focus and a log-normal fund size."""
+    if rng.random() < GENERALIST_SHARE:
+        investment_focus = ["High-Growth Tech"]
+    else:
+        investment_focus = _draw_focus(rng.randint(1, 2), rng)
+    dry_powder_b = rng.lognormvariate(math.log(DRY_POWDER_MEDIAN_B), DRY_POWDER_SIGMA)
+    dry_powder_b = min(max(dry_powder_b, DRY_POWDER_RANGE_B[0]), DRY_POWDER_RANGE_B[1])
+    return FinancialBuyer(f"Financial Buyer {index:04d}", investment_focus, rng=rng, dry_powder_b=dry_powder_b)
+
+def generate_participants(num_acquirers, strategic_share=0.4, rng=random):
+    """
+    Generates a market-wide population of acquirers.
+
+    Args:
+        num_acquirers (int): The total number of acquirers.
+        strategic_share (float): The fraction of acquirers that are strategic.
+        rng (random.Random, optional): The random stream to draw traits from.
+
+    Returns:
+        tuple: Strategic acquirers, financial buyers and advisors, like `get_sample_participants`.
+    """
+    num_strategic = round(num_acquirers * strategic_share)
+    strategic_acquirers = [generate_strategic_acquirer(i, rng=rng) for i in range(num_strategic)]
+    financial_buyers = [generate_financial_buyer(i, rng=rng) for i in range(num_acquirers - num_strategic)]
+    return strategic_acquirers, financial_buyers, get_sample_advisors()
 
 if __name__ == '__main__':
     strategic, financial, advisors = get_sample_participants()
@@ -71,3 +164,8 @@ if __name__ == '__main__':
     print("\n--- Advisors ---")
     for adv in advisors:
         print(f"{adv.name} ({adv.type} - {adv.specialization})")
+
+    strategic, financial, _ = generate_participants(5_000)
+    print(f"\n--- Generated Population ({len(strategic)} strategic, {len(financial)} financial) ---")
+    for acq in strategic[:2] + financial[:2]:
+        print(f"{acq.name} (Focus: {', '.join(acq.investment_focus)})")
@@ -0,0 +1,158 @@
+import numpy as np
+
+from tech_fusion.src.market.environment import (
+    BEAR_PROBABILITY, BULL_PROBABILITY, INITIAL_RATE_RANGE, RATE_BOUNDS, RATE_SHOCK_RANGE, SENTIMENT_MULTIPLIERS
+)
+from tech_fusion.src.simulation.events import EventStream
+
+# Sentiments in the order they are encoded in scenario arrays
+SENTIMENTS = ['neutral', 'bull', 'bear']
+
+class MarketScenarios:
+    """
+    A batch of market paths: interest rates and sentiment codes, one row per path and
+    one column per simulation step, plus the rate each path starts from.
+
+    Column t holds the market state after the (t + 1)-th update, which is what a
+    simulation sees during step t + 1.
+    """
+
+    def __init__(self, initial_rates, interest_rates, sentiments):
+        self.initial_rates = np.asarray(initial_rates, dtype=float)
+        self.interest_rates = np.asarray(interest_rates, dtype=float)
+        self.sentiments = np.asarray(sentiments, dtype=np.int8)
+        if self.interest_rates.shape != self.sentiments.shape or self.interest_rates.shape[:1] != self.initial_rates.shape:
+            raise ValueError("Scenario rates, sentiments and initial rates must describe the same paths")
+
+    @classmethod
+    def generate(cls, num_paths, num_steps, rng=None):
+        """
+        Draws many paths at once with the dynamics of `MarketEnvironment.update`.
+
+        Rates are shocked and clamped one step at a time for all paths together, since
+        clamping makes each step depend on the last; sentiment regimes are independent
+        across steps and drawn in a single call.
+
+        Args:
+            num_paths (int): The number of paths.
+            num_steps (int): The number of steps per path.
+            rng (np.random.Generator, optional): The random generator to draw from.
+
+        Returns:
+            MarketScenarios: The generated paths.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        initial_rates = rng.uniform(*INITIAL_RATE_RANGE, size=num_paths)
+        shocks = rng.uniform(*RATE_SHOCK_RANGE, size=(num_paths, num_steps))
+        interest_rates = np.empty((num_paths, num_steps))
+        rate = initial_rates
+        for step in range(num_steps):
+            rate = np.clip(rate * shocks[:, step], *RATE_BOUNDS)
+            interest_rates[:, step] = rate
+
+        rolls = rng.random((num_paths, num_steps))
+        sentiments = np.where(rolls < BULL_PROBABILITY, SENTIMENTS.index('bull'),
+                              np.where(rolls < BULL_PROBABILITY + BEAR_PROBABILITY, SENTIMENTS.index('bear'),
+                                       SENTIMENTS.index('neutral')))
+        return cls(initial_rates, interest_rates, sentiments)
+
+    @classmethod
+    def from_paths(cls, interest_rates, sentiments, initial_rates=None):
+        """
+        Builds scenarios from user-supplied paths, such as stress scenarios.
+
+        Args:
+            interest_rates (array-like): Rates per step, for one path or a (paths, steps) array.
+            sentiments (array-like): Sentiment names or codes per step, shaped like `interest_rates`.
+            initial_rates (array-like, optional): The rate each path starts from, its first rate by default.
+
+        Returns:
+            MarketScenarios: The supplied paths.
+        """
+        interest_rates = np.atleast_2d(np.asarray(interest_rates, dtype=float))
+        sentiments = np.atleast_2d(np.asarray(sentiments))
+        if sentiments.dtype.kind in 'US':
+            unknown = set(np.unique(sentiments)) - set(SENTIMENTS)
+            if unknown:
+                raise ValueError(f"Unknown sentiments: {sorted(unknown)}")
+            codes = np.empty(sentiments.shape, dtype=np.int8)
+            for code, sentiment in enumerate(SENTIMENTS):
+                codes[sentiments == sentiment] = code
+            sentiments = codes
+        if initial_rates is None:
+            initial_rates = interest_rates[:, 0]
+        return cls(np.atleast_1d(initial_rates), interest_rates, sentiments)
+
+    def __len__(self):
+        return len(self.interest_rates)
+
+    @property
+    def num_steps(self):
+        return self.interest_rates.shape[1]
+
+    def select(self, indices):
+        """Returns the scenarios of the given path indices, a single index giving a one-path batch."""
+        indices = np.atleast_1d(indices)
+        return MarketScenarios(self.initial_rates[indices], self.interest_rates[indices], self.sentiments[indices])
+
+    def sentiment_multipliers(self):
+        """Returns the valuation multiplier of every path and step as one array."""
+        table = np.array([SENTIMENT_MULTIPLIERS[sentiment] for sentiment in SENTIMENTS])
+        return table[self.sentiments]
+
+    def path(self, index, events=None):
+        """Returns a market that replays one path, for use in place of a MarketEnvironment."""
+        return ScenarioMarket(self.initial_rates[index], self.interest_rates[index], self.sentiments[index], events=events)
+
+class ScenarioMarket:
+    """
+    Replays one precomputed market path with the MarketEnvironment interface.
+
+    Each `update` moves to the next step of the path instead of drawing, so the same path
+    can be replayed exactly across engine configurations.
+    """
+
+    def __init__(self, initial_rate, interest_rates, sentiments, events=None):
+        self.events = events if events is not None else EventStream()
+        self.interest_rates = interest_rates
+        self.sentiments = sentiments
+        self.step = 0
+        self.interest_rate = float(initial_rate)
+        self.market_sentiment = 'neutral'
+        self.sentiment_multipliers = dict(SENTIMENT_MULTIPLIERS)
+
+    @property
+    def remaining_steps(self):
+        """The number of updates left before the path runs out."""
+        return len(self.interest_rates) - self.step
+
+    def update(self):
+        """Advances to the market state of the next step of the path."""
+        if self.step >= len(self.interest_rates):
+            raise ValueError(f"The market path only has {len(self.interest_rates)} steps")
+        self.interest_rate = float(self.interest_rates[self.step])
+        self.market_sentiment = SENTIMENTS[self.sentiments[self.step]]
+        self.step += 1
+
+        if self.events.enabled:
+            self.events.emit('market_update', sentiment=self.market_sentiment, interest_rate=self.interest_rate)
+
+    def get_sentiment_multiplier(self):
+        """Returns the valuation multiplier for the current market sentiment."""
+        return self.sentiment_multipliers[self.market_sentiment]
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    scenarios = MarketScenarios.generate(num_paths=10_000, num_steps=120, rng=np.random.default_rng(42))
+    print(f"Generated {len(scenarios):,} paths of {scenarios.num_steps} steps in {time.perf_counter() - start:.3f}s")
+    print(f"Final rates: mean {scenarios.interest_rates[:, -1].mean():.2%}, "
+          f"p5 {np.percentile(scenarios.interest_rates[:, -1], 5):.2%}, p95 {np.percentile(scenarios.interest_rates[:, -1], 95):.2%}")
+    print(f"Bull share: {np.mean(scenarios.sentiments == SENTIMENTS.index('bull')):.1%}, "
+          f"bear share: {np.mean(scenarios.sentiments == SENTIMENTS.index('bear')):.1%}")
+
+    stress = MarketScenarios.from_paths([0.06, 0.07, 0.08, 0.08, 0.07], ['bear', 'bear', 'bear', 'neutral', 'neutral'])
+    market = stress.path(0)
+    for _ in range(stress.num_steps):
+        market.update()
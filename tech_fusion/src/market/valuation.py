@@ -1,5 +1,6 @@
 import random
-from tech_fusion.src.data_generator.company_generator import CompanyGenerator
+import numpy as np
+from tech_fusion.src.data_generator.company_generator import SECTORS
 
 # Based on the project description
 SECTOR_MULTIPLIERS = {
@@ -19,13 +20,30 @@ GROWTH_MULTIPLIER_ADJUSTMENT = {
     'low_growth': (0.7, 0.9) # <10%
 }
 
+DEFAULT_SECTOR_MULTIPLIER = (5, 12)
+
+# Growth bands in the order they are encoded by `growth_bands`
+GROWTH_BANDS = ['low_growth', 'medium_growth', 'high_growth']
+
+def growth_bands(growth_rates):
+    """Encodes growth rates as indices into GROWTH_BANDS."""
+    return np.where(growth_rates > 0.20, 2, np.where(growth_rates >= 0.10, 1, 0))
+
 class Valuation:
     """Calculates the valuation of a target company."""
 
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        # Multiplier ranges as lookup tables indexed by sector code and growth band
+        sector_ranges = [SECTOR_MULTIPLIERS.get(sector, DEFAULT_SECTOR_MULTIPLIER) for sector in SECTORS]
+        self.sector_low, self.sector_high = np.array(sector_ranges, dtype=float).T
+        growth_ranges = [GROWTH_MULTIPLIER_ADJUSTMENT[band] for band in GROWTH_BANDS]
+        self.growth_low, self.growth_high = np.array(growth_ranges, dtype=float).T
+
     def get_base_multiplier(self, sector):
         """Get the base revenue multiplier for a given sector."""
-        multipliers = SECTOR_MULTIPLIERS.get(sector, (5, 12)) # Default for other sectors
-        return random.uniform(*multipliers)
+        multipliers = SECTOR_MULTIPLIERS.get(sector, DEFAULT_SECTOR_MULTIPLIER) # Default for other sectors
+        return self.rng.uniform(*multipliers)
 
     def get_growth_adjustment(self, growth_rate):
         """Get the valuation adjustment factor based on growth rate."""
@@ -35,7 +53,7 @@ class Valuation:
             adj_range = GROWTH_MULTIPLIER_ADJUSTMENT['medium_growth']
         else:
             adj_range = GROWTH_MULTIPLIER_ADJUSTMENT['low_growth']
-        return random.uniform(*adj_range)
+        return self.rng.uniform(*adj_range)
 
     def calculate_valuation(self, company, market_environment):
         """Calculates the valuation of a company based on its metrics and the market environment."""
@@ -49,7 +67,7 @@ class Valuation:
         # Talent acquisition premium for AI/ML experts
         ai_talent_premium = 0
         if company['team']['ai_ml_experts'] > 100: # Arbitrary threshold
-            ai_talent_premium = random.uniform(0.1, 0.3) # 10-30% premium
+            ai_talent_premium = self.rng.uniform(0.1, 0.3) # 10-30% premium
 
         sentiment_multiplier = market_environment.get_sentiment_multiplier()
 
@@ -66,7 +84,147 @@ class Valuation:
             "final_multiplier": round(final_multiplier * (1 + ai_talent_premium), 2)
         }
 
+    def calculate_valuations(self, universe, market_environment, rng=None):
+        """
+        Values every company in a universe in one vectorized pass.
+
+        Draws from the same multiplier ranges as `calculate_valuation`, one draw per company.
+
+        Args:
+            universe (CompanyUniverse): The companies to value.
+            market_environment (MarketEnvironment): The current market environment.
+            rng (np.random.Generator, optional): The random generator to draw from.
+
+        Returns:
+            dict: Arrays keyed like the `calculate_valuation` result, plus the scalar sentiment adjustment.
+        """
+        components = self.draw_components(universe, rng=rng)
+        return self.apply_sentiment(universe, components, market_environment.get_sentiment_multiplier())
+
+    def draw_components(self, universe, rng=None, company_ids=None):
+        """
+        Draws the company-specific valuation components, which do not depend on the market.
+
+        Args:
+            universe (CompanyUniverse): The companies to value.
+            rng (np.random.Generator, optional): The random generator to draw from.
+            company_ids (np.ndarray, optional): Only draw for these companies; all by default.
+
+        Returns:
+            dict: Arrays of base multipliers, growth adjustments and AI talent premiums.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        ids = slice(None) if company_ids is None else company_ids
+        sector = universe['sector'][ids]
+        band = growth_bands(universe['growth_rate'][ids])
+
+        base_multiplier = rng.uniform(self.sector_low[sector], self.sector_high[sector])
+        growth_adjustment = rng.uniform(self.growth_low[band], self.growth_high[band])
+
+        # Talent acquisition premium for AI/ML experts
+        talent_draw = rng.uniform(0.1, 0.3, size=len(sector))
+        ai_talent_premium = np.where(universe['ai_ml_experts'][ids] > 100, talent_draw, 0.0)
+
+        return {
+            "base_multiplier": base_multiplier,
+            "growth_adjustment": growth_adjustment,
+            "ai_talent_premium": ai_talent_premium
+        }
+
+    def apply_sentiment(self, universe, components, sentiment_multiplier, company_ids=None):
+        """
+        Combines valuation components with a market sentiment multiplier into valuation arrays.
+
+        With `company_ids`, the components are those of only these companies, as drawn by
+        `draw_components` with the same IDs.
+        """
+        base_multiplier = components['base_multiplier']
+        growth_adjustment = components['growth_adjustment']
+        ai_talent_premium = components['ai_talent_premium']
+
+        final_multiplier = base_multiplier * growth_adjustment * sentiment_multiplier
+        valuation = universe['arr'][slice(None) if company_ids is None else company_ids] * final_multiplier
+        valuation *= (1 + ai_talent_premium)
+
+        return {
+            "valuation": np.round(valuation, 2),
+            "base_multiplier": np.round(base_multiplier, 2),
+            "growth_adjustment": np.round(growth_adjustment, 2),
+            "sentiment_adjustment": sentiment_multiplier,
+            "ai_talent_premium": np.round(ai_talent_premium, 2),
+            "final_multiplier": np.round(final_multiplier * (1 + ai_talent_premium), 2)
+        }
+
+class ValuationCache:
+    """
+    Values a universe incrementally across simulation steps.
+
+    ARR, growth band, sector and AI-talent eligibility never change during a run, so the
+    random valuation components are drawn once and only rescaled by the market sentiment
+    multiplier. Sentiment takes a handful of values, so the rescaled arrays are memoized
+    per multiplier and a step whose sentiment was seen before costs a dict lookup.
+    Call `invalidate` when company fundamentals change.
+    """
+
+    def __init__(self, valuation_engine, universe, rng=None, redraw=False):
+        """
+        Args:
+            valuation_engine (Valuation): The engine that draws and combines components.
+            universe (CompanyUniverse): The companies to value.
+            rng (np.random.Generator, optional): The random generator components are drawn from.
+            redraw (bool): Redraw every component on every call, as `calculate_valuations` does,
+                for runs that want the extra per-step variance.
+        """
+        self.valuation_engine = valuation_engine
+        self.universe = universe
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.redraw = redraw
+        self.components = None
+        self.by_sentiment = {}
+
+    def __getstate__(self):
+        # The universe is stored separately, the owner reattaches both it and the
+        # valuation engine on load, and the memoized arrays are cheap to rebuild
+        state = self.__dict__.copy()
+        state['universe'] = None
+        state['valuation_engine'] = None
+        state['by_sentiment'] = {}
+        return state
+
+    def invalidate(self, company_ids=None):
+        """
+        Redraws the cached components of companies whose fundamentals changed.
+
+        Args:
+            company_ids (np.ndarray, optional): The changed companies; all of them if omitted.
+        """
+        self.by_sentiment = {}
+        if company_ids is None or self.components is None:
+            self.components = None
+            return
+        fresh = self.valuation_engine.draw_components(self.universe, rng=self.rng, company_ids=company_ids)
+        for name, values in fresh.items():
+            components = self.components[name]
+            if not components.flags.writeable:
+                # Components shared read-only with other states are copied on write
+                components = self.components[name] = components.copy()
+            components[company_ids] = values
+
+    def valuations(self, market_environment):
+        """Returns valuation arrays, keyed like `calculate_valuations`, for the current market."""
+        sentiment_multiplier = market_environment.get_sentiment_multiplier()
+        if self.redraw or self.components is None:
+            self.components = self.valuation_engine.draw_components(self.universe, rng=self.rng)
+            self.by_sentiment = {}
+        result = self.by_sentiment.get(sentiment_multiplier)
+        if result is None:
+            result = self.valuation_engine.apply_sentiment(self.universe, self.components, sentiment_multiplier)
+            if not self.redraw:
+                self.by_sentiment[sentiment_multiplier] = result
+        return result
+
 if __name__ == '__main__':
+    from tech_fusion.src.data_generator.company_generator import CompanyGenerator
     from tech_fusion.src.market.environment import MarketEnvironment
     company_gen = CompanyGenerator()
     valuation_engine = Valuation()
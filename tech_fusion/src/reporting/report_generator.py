@@ -1,14 +1,189 @@
 import csv
+import json
 import os
 from datetime import datetime
 
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.simulation.deal import DEAL_STRUCTURES
+
+# Columns of the streaming deals report, in order, with their storage type. Categorical
+# columns hold integer codes into a category list kept in the report schema.
+DEAL_REPORT_COLUMNS = [
+    ('step', 'int32'),
+    ('acquirer', 'category'),
+    ('acquirer_type', 'category'),
+    ('target_id', 'int64'),
+    ('target', 'string'),
+    ('target_sector', 'category'),
+    ('base_valuation', 'float64'),
+    ('final_price', 'float64'),
+    ('deal_structure', 'category'),
+    ('negotiated_premium', 'float64'),
+    ('synergy_premium', 'float64'),
+    ('synergy_score', 'float64'),
+    ('matched_assets_mask', 'uint16')
+]
+
+SCHEMA_FILE = 'schema.json'
+
+def _deal_row(step, deal):
+    """Extracts the raw report values of a deal."""
+    target = deal.target
+    return {
+        'step': step,
+        'acquirer': deal.acquirer.name,
+        'acquirer_type': deal.acquirer.type,
+        'target_id': target['id'],
+        'target': target['name'],
+        'target_sector': target['sector'],
+        'base_valuation': deal.base_valuation,
+        'final_price': deal.final_price,
+        'deal_structure': deal.structure,
+        'negotiated_premium': deal.negotiated_premium,
+        'synergy_premium': deal.synergy_premium,
+        'synergy_score': deal.synergy_details.get('score', 0),
+        'matched_assets_mask': deal.synergy_details.get('matched_assets_mask', 0)
+    }
+
+class CsvDealWriter:
+    """Appends closed deals to a CSV file with raw, unformatted values."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=[name for name, _ in DEAL_REPORT_COLUMNS])
+        self.writer.writeheader()
+
+    def write_deals(self, step, deals):
+        """Appends one step's closed deals."""
+        self.writer.writerows(_deal_row(step, deal) for deal in deals)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class ColumnarDealWriter:
+    """
+    Appends closed deals to a typed columnar report.
+
+    The report is a directory with one raw little-endian binary file per column and a
+    JSON schema holding the row count and category lists. Strings are stored as UTF-8
+    bytes plus an offsets file. Only the current step's deals are ever held in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.num_rows = 0
+        self.categories = {name: [] for name, kind in DEAL_REPORT_COLUMNS if kind == 'category'}
+        # Fixed vocabularies keep their codes stable across reports
+        self.categories['target_sector'] = list(SECTORS)
+        self.categories['deal_structure'] = list(DEAL_STRUCTURES)
+        self.category_codes = {name: {value: code for code, value in enumerate(values)}
+                               for name, values in self.categories.items()}
+        self.files = {}
+        for name, kind in DEAL_REPORT_COLUMNS:
+            if kind == 'string':
+                self.files[name + '.offsets'] = open(os.path.join(path, name + '.offsets'), 'wb')
+                self.files[name + '.utf8'] = open(os.path.join(path, name + '.utf8'), 'wb')
+                self.files[name + '.offsets'].write(np.zeros(1, dtype='<i8').tobytes())
+            else:
+                self.files[name] = open(os.path.join(path, name + '.bin'), 'wb')
+        self.string_bytes = {name: 0 for name, kind in DEAL_REPORT_COLUMNS if kind == 'string'}
+        self._write_schema()
+
+    def _encode(self, name, value):
+        """Returns the code of a categorical value, adding it to the categories if new."""
+        codes = self.category_codes[name]
+        if value not in codes:
+            codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return codes[value]
+
+    def write_deals(self, step, deals):
+        """Appends one step's closed deals."""
+        if not deals:
+            return
+        rows = [_deal_row(step, deal) for deal in deals]
+        for name, kind in DEAL_REPORT_COLUMNS:
+            values = [row[name] for row in rows]
+            if kind == 'category':
+                column = np.array([self._encode(name, value) for value in values], dtype='<i4')
+                self.files[name].write(column.tobytes())
+            elif kind == 'string':
+                encoded = [value.encode('utf-8') for value in values]
+                ends = self.string_bytes[name] + np.cumsum([len(value) for value in encoded], dtype='<i8')
+                self.string_bytes[name] = int(ends[-1])
+                self.files[name + '.offsets'].write(ends.tobytes())
+                self.files[name + '.utf8'].write(b''.join(encoded))
+            else:
+                self.files[name].write(np.array(values, dtype=np.dtype(kind).newbyteorder('<')).tobytes())
+        self.num_rows += len(rows)
+        for f in self.files.values():
+            f.flush()
+        self._write_schema()
+
+    def _write_schema(self):
+        schema = {
+            'num_rows': self.num_rows,
+            'columns': [{'name': name, 'type': kind} for name, kind in DEAL_REPORT_COLUMNS],
+            'categories': self.categories
+        }
+        path = os.path.join(self.path, SCHEMA_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(schema, f)
+        os.replace(path + '.tmp', path)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+def load_deal_report(path, decode_categories=True):
+    """
+    Loads a columnar deals report into NumPy arrays.
+
+    Args:
+        path (str): The report directory written by `ColumnarDealWriter`.
+        decode_categories (bool): Whether to turn categorical codes into string arrays;
+            if False the integer codes are returned and the categories are under '_categories'.
+
+    Returns:
+        dict: One array per column.
+    """
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        schema = json.load(f)
+    num_rows = schema['num_rows']
+    report = {}
+    for column in schema['columns']:
+        name, kind = column['name'], column['type']
+        if kind == 'string':
+            offsets = np.fromfile(os.path.join(path, name + '.offsets'), dtype='<i8', count=num_rows + 1)
+            with open(os.path.join(path, name + '.utf8'), 'rb') as f:
+                data = f.read(int(offsets[-1]))
+            report[name] = np.array([data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])])
+        elif kind == 'category':
+            codes = np.fromfile(os.path.join(path, name + '.bin'), dtype='<i4', count=num_rows)
+            if decode_categories:
+                report[name] = np.array(schema['categories'][name])[codes]
+            else:
+                report[name] = codes
+        else:
+            report[name] = np.fromfile(os.path.join(path, name + '.bin'), dtype=np.dtype(kind).newbyteorder('<'), count=num_rows)
+    if not decode_categories:
+        report['_categories'] = schema['categories']
+    return report
+
 class ReportGenerator:
     """Generates reports for the M&A simulation."""
 
     def __init__(self, report_dir='reports'):
+        # The directory is created on the first write, so engines that never report touch no files
         self.report_dir = report_dir
-        if not os.path.exists(self.report_dir):
-            os.makedirs(self.report_dir)
+
+    def _ensure_report_dir(self):
+        os.makedirs(self.report_dir, exist_ok=True)
 
     def generate_deals_report(self, completed_deals):
         """Generates a CSV report of all completed deals."""
@@ -16,6 +191,7 @@ class ReportGenerator:
             print("No deals were completed, so no report will be generated.")
             return
 
+        self._ensure_report_dir()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = os.path.join(self.report_dir, f"simulation_report_{timestamp}.csv")
 
@@ -30,17 +206,45 @@ class ReportGenerator:
             writer.writeheader()
 
             for deal in completed_deals:
+                target = deal.target
                 writer.writerow({
                     'Acquirer': deal.acquirer.name,
-                    'Target': deal.target['name'],
-                    'Target Sector': deal.target['sector'],
+                    'Target': target['name'],
+                    'Target Sector': target['sector'],
                     'Base Valuation': f"{deal.base_valuation:,.2f}",
                     'Final Price': f"{deal.final_price:,.2f}",
                     'Deal Structure': deal.structure,
                     'Negotiated Premium (%)': f"{deal.negotiated_premium:.2%}",
                     'Synergy Premium (%)': f"{deal.synergy_details.get('premium', 0):.2%}",
                     'Synergy Score': deal.synergy_details.get('score', 0),
-                    'Matched Synergy Assets': ', '.join(deal.synergy_details.get('matched_assets', []))
+                    'Matched Synergy Assets': ', '.join(deal.matched_assets)
                 })
         
         print(f"\nSimulation report generated successfully: {filename}")
+
+    def generate_metrics_report(self, snapshot):
+        """Writes an instrumentation snapshot to a timestamped JSON file."""
+        self._ensure_report_dir()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.report_dir, f"simulation_metrics_{timestamp}.json")
+        with open(filename, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        print(f"Simulation metrics written to: {filename}")
+
+    def open_deal_stream(self, report_format='columnar'):
+        """
+        Opens a timestamped report that closed deals are appended to as the simulation runs.
+
+        Args:
+            report_format (str): 'columnar' for a typed columnar directory, or 'csv'.
+
+        Returns:
+            CsvDealWriter or ColumnarDealWriter: The open writer.
+        """
+        if report_format not in ('csv', 'columnar'):
+            raise ValueError(f"Unknown report format: {report_format}")
+        self._ensure_report_dir()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if report_format == 'csv':
+            return CsvDealWriter(os.path.join(self.report_dir, f"simulation_deals_{timestamp}.csv"))
+        return ColumnarDealWriter(os.path.join(self.report_dir, f"simulation_deals_{timestamp}"))
@@ -0,0 +1,118 @@
+import numpy as np
+
+from tech_fusion.src.analytics.synergy import Synergy
+
+# Negotiated premium ranges by acquirer type, as drawn by Deal._negotiate_premium
+NEGOTIATED_PREMIUMS = {'Financial': (0.10, 0.25), 'Strategic': (0.15, 0.30)}
+
+# Screening outcomes of a bid; everything but BID is a pass reason reported in events
+BID = 'bid'
+FINANCIAL_CRITERIA = 'financial_criteria'
+INTEGRATION_COMPLEXITY = 'integration_complexity'
+DRY_POWDER = 'dry_powder'
+OUTBID = 'outbid'
+
+class BatchAuction:
+    """
+    Resolves every bid of a simulation step in one vectorized pass.
+
+    Acquirers screen their candidate targets independently, so screening does not depend
+    on the order acquirers are processed in. Bids that pass screening are priced with the
+    same premium ranges as Deal and Synergy, financial buyers cannot bid beyond their dry
+    powder, and each contested target goes to its highest bidder.
+    """
+
+    def __init__(self, acquirers, strategic_rows, max_financing_rate=0.04, integration_threshold=65):
+        """
+        Args:
+            acquirers (list): Every acquirer, indexed by acquirer ID.
+            strategic_rows (dict): The integration score row of each strategic acquirer.
+            max_financing_rate (float): Financial buyers only bid below this interest rate.
+            integration_threshold (float): Strategic acquirers only bid below this integration score.
+        """
+        self.max_financing_rate = max_financing_rate
+        self.integration_threshold = integration_threshold
+        self.is_strategic = np.array([acquirer.type == 'Strategic' for acquirer in acquirers])
+        self.strategic_rows = np.array([strategic_rows.get(acquirer, -1) for acquirer in acquirers], dtype=np.intp)
+        self.need_masks = np.array([getattr(acquirer, 'strategic_needs_mask', 0) for acquirer in acquirers], dtype=np.uint64)
+        # Strategic acquirers fund deals from their balance sheet, so only financial buyers are capped
+        self.dry_powder = np.array([getattr(acquirer, 'dry_powder_b', np.inf) * 1e9 for acquirer in acquirers])
+        premium_ranges = np.array([NEGOTIATED_PREMIUMS[acquirer.type] for acquirer in acquirers], dtype=float)
+        self.premium_low, self.premium_high = premium_ranges.reshape(-1, 2).T
+        self.synergy_analyzer = Synergy()
+
+    def screen(self, acquirer_ids, company_ids, universe, interest_rate, integration_scores):
+        """
+        Applies each acquirer's screening criteria to its candidate target.
+
+        Args:
+            acquirer_ids (np.ndarray): The bidding acquirer of each candidate pair.
+            company_ids (np.ndarray): The candidate target of each pair.
+            universe (CompanyUniverse): The target universe.
+            interest_rate (float): The current market interest rate.
+            integration_scores (callable): Maps arrays of strategic rows and company IDs to integration scores.
+
+        Returns:
+            tuple: The screening outcome of each pair (BID or a pass reason) and the integration
+                scores of the pairs, NaN for financial buyers.
+        """
+        is_strategic = self.is_strategic[acquirer_ids]
+        scores = np.full(len(acquirer_ids), np.nan)
+        if is_strategic.any():
+            scores[is_strategic] = integration_scores(self.strategic_rows[acquirer_ids[is_strategic]], company_ids[is_strategic])
+
+        # Financial buyers are more sensitive to interest rates
+        financial_ok = (universe['ebitda_margin'][company_ids] > 0) & (interest_rate < self.max_financing_rate)
+        with np.errstate(invalid='ignore'):
+            strategic_ok = scores < self.integration_threshold
+        outcome = np.where(is_strategic,
+                           np.where(strategic_ok, BID, INTEGRATION_COMPLEXITY),
+                           np.where(financial_ok, BID, FINANCIAL_CRITERIA)).astype(object)
+        return outcome, scores
+
+    def resolve(self, acquirer_ids, company_ids, base_valuations, asset_masks, rng=None):
+        """
+        Prices every bid and awards each target to its highest valid bidder.
+
+        Args:
+            acquirer_ids (np.ndarray): The acquirer of each bid.
+            company_ids (np.ndarray): The target of each bid.
+            base_valuations (np.ndarray): The current valuation of each bid's target.
+            asset_masks (np.ndarray): The technology-asset bitmask of each bid's target.
+            rng (np.random.Generator, optional): The random generator premiums are drawn from.
+
+        Returns:
+            dict: Per-bid arrays of negotiated premiums, synergy details, prices, the outcome of
+                each bid (BID for winners, else DRY_POWDER or OUTBID) and the number of valid
+                bids on each bid's target.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        negotiated_premium = rng.uniform(self.premium_low[acquirer_ids], self.premium_high[acquirer_ids])
+        synergy = self.synergy_analyzer.calculate_synergy_batch(self.need_masks[acquirer_ids], asset_masks, rng=rng)
+        price = base_valuations * (1 + negotiated_premium + synergy['premium'])
+
+        outcome = np.full(len(acquirer_ids), OUTBID, dtype=object)
+        affordable = price <= self.dry_powder[acquirer_ids]
+        outcome[~affordable] = DRY_POWDER
+
+        # Sort valid bids by target, highest price first, and take the first bid of each target
+        valid = np.flatnonzero(affordable)
+        order = valid[np.lexsort((-price[valid], company_ids[valid]))]
+        sorted_targets = company_ids[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_targets[1:] != sorted_targets[:-1]
+        outcome[order[first]] = BID
+
+        num_bids = np.zeros(len(acquirer_ids), dtype=np.intp)
+        _, inverse, counts = np.unique(sorted_targets, return_inverse=True, return_counts=True)
+        num_bids[order] = counts[inverse]
+
+        return {
+            'negotiated_premium': negotiated_premium,
+            'synergy_score': synergy['score'],
+            'synergy_premium': synergy['premium'],
+            'matched_assets_mask': synergy['matched_assets_mask'],
+            'price': price,
+            'outcome': outcome,
+            'num_bids': num_bids
+        }
@@ -0,0 +1,191 @@
+import heapq
+import numpy as np
+
+# The number of ranked candidates each acquirer keeps
+QUEUE_SIZE = 16
+# The number of live targets drawn from an acquirer's sectors to rank when its queue runs dry
+POOL_SIZE = 256
+
+class CandidateQueues:
+    """
+    Keeps a short queue of each acquirer's best-fitting live targets, best first.
+
+    Queues are heaps of (-fit, company ID, version) entries. Targets that go off the market
+    and companies whose valuation is invalidated are dropped lazily, when they reach the top
+    of a heap, so taking a target costs nothing up front. A queue with no live entry left is
+    refilled by ranking a pool of targets drawn from the acquirer's sectors, so looking up a
+    candidate costs O(log QUEUE_SIZE) and a refill O(POOL_SIZE), however large the universe is.
+    Only when a pool holds no target the acquirer would pursue are its sectors ranked in full;
+    if they hold none either, the acquirer is marked exhausted and is not refilled again
+    until targets return to the market or valuations change.
+    """
+
+    def __init__(self, num_acquirers, fit, target_index, sector_masks, rng=None, queue_size=QUEUE_SIZE, pool_size=POOL_SIZE):
+        """
+        Args:
+            num_acquirers (int): The number of acquirers, which are referred to by ID.
+            fit (callable): Maps an acquirer ID and an array of company IDs to fit scores,
+                higher being better and -inf for targets the acquirer would not pursue.
+            target_index (SectorIndex): The live targets.
+            sector_masks (np.ndarray): An (acquirers, sectors) boolean mask of each acquirer's sectors.
+            rng (np.random.Generator, optional): The random generator pools are drawn from.
+            queue_size (int): The number of candidates kept per acquirer.
+            pool_size (int): The number of targets drawn to rank on a refill.
+        """
+        self.heaps = [[] for _ in range(num_acquirers)]
+        # Incremented when a company's valuation changes, so that older entries are stale
+        self.versions = {}
+        # Acquirers whose sectors hold no live target they would pursue
+        self.exhausted = set()
+        # Targets back on the market since queues were last looked at
+        self.returned = []
+        self.queue_size = queue_size
+        self.pool_size = pool_size
+        self.attach(fit, target_index, sector_masks, rng)
+
+    def attach(self, fit, target_index, sector_masks, rng=None):
+        """Sets the collaborators queues read from, which are not part of their saved state."""
+        self.fit = fit
+        self.target_index = target_index
+        self.sector_masks = sector_masks
+        self.sector_codes = None if sector_masks is None else [tuple(np.flatnonzero(mask).tolist()) for mask in sector_masks]
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __getstate__(self):
+        # The owner reattaches the fit function, target index, sector masks and random stream on load
+        state = self.__dict__.copy()
+        for name in ('fit', 'target_index', 'sector_masks', 'sector_codes', 'rng'):
+            state[name] = None
+        return state
+
+    def _is_current(self, entry):
+        _, company_id, version = entry
+        return company_id in self.target_index and version == self.versions.get(company_id, 0)
+
+    def peek(self, acquirer_id):
+        """Returns the acquirer's best live candidate, or None if its sectors hold none it would pursue."""
+        if self.returned:
+            self._offer_returned()
+        heap = self.heaps[acquirer_id]
+        while heap:
+            if self._is_current(heap[0]):
+                return heap[0][1]
+            heapq.heappop(heap)
+        if acquirer_id in self.exhausted:
+            return None
+        heap = self._refill(acquirer_id)
+        return heap[0][1] if heap else None
+
+    def peek_many(self, acquirer_ids):
+        """Returns the best live candidate of each acquirer, -1 where there is none."""
+        candidates = [self.peek(acquirer_id) for acquirer_id in acquirer_ids.tolist()]
+        return np.array([-1 if company_id is None else company_id for company_id in candidates], dtype=np.intp)
+
+    def discard(self, acquirer_ids, company_ids):
+        """Drops candidates the acquirers passed on, so that each moves on to its next best target."""
+        for acquirer_id, company_id in zip(np.atleast_1d(acquirer_ids).tolist(), np.atleast_1d(company_ids).tolist()):
+            heap = self.heaps[acquirer_id]
+            if heap and heap[0][1] == company_id:
+                heapq.heappop(heap)
+
+    def invalidate(self, company_ids=None):
+        """
+        Rescores companies whose valuations changed; every queue is rebuilt if no IDs are given.
+
+        Old entries of the companies go stale, and each is queued again for the acquirers
+        whose sectors hold it and whose queues it now makes.
+
+        Args:
+            company_ids (np.ndarray, optional): The companies whose valuations changed.
+        """
+        if company_ids is None:
+            self.heaps = [[] for _ in self.heaps]
+            self.versions = {}
+            self.exhausted = set()
+            self.returned = []
+            return
+        company_ids = np.unique(np.asarray(company_ids, dtype=np.intp))
+        for company_id in company_ids.tolist():
+            self.versions[company_id] = self.versions.get(company_id, 0) + 1
+        self._offer(company_ids)
+
+    def restore(self, company_ids):
+        """
+        Notes targets that are back on the market, such as those of blocked deals.
+
+        They are offered to exhausted acquirers, all at once, the next time a queue is looked
+        at; other acquirers come across them in later pools.
+        """
+        self.returned.extend(np.atleast_1d(company_ids).tolist())
+
+    def _offer_returned(self):
+        returned = np.unique(np.array(self.returned, dtype=np.intp))
+        self.returned = []
+        if self.exhausted:
+            self._offer(returned, acquirer_ids=sorted(self.exhausted))
+
+    def forget_exhausted(self):
+        """Lets exhausted acquirers look again, for when every valuation may have changed."""
+        self.exhausted = set()
+
+    def _offer(self, company_ids, acquirer_ids=None):
+        """
+        Scores live companies for the acquirers whose sectors hold them, keeping each queue at `queue_size`.
+
+        Args:
+            company_ids (np.ndarray): The companies to offer, in ascending order.
+            acquirer_ids (list, optional): Only offer them to these acquirers.
+        """
+        target_index = self.target_index
+        company_ids = np.array([company_id for company_id in company_ids.tolist() if company_id in target_index], dtype=np.intp)
+        if not len(company_ids):
+            return
+        all_sectors = target_index.company_sectors
+        company_sectors = np.array([all_sectors[company_id] for company_id in company_ids.tolist()], dtype=np.intp)
+        interested = np.flatnonzero(self.sector_masks[:, np.unique(company_sectors)].any(axis=1))
+        if acquirer_ids is not None:
+            interested = np.intersect1d(interested, acquirer_ids)
+        versions = self.versions
+        for acquirer_id in interested.tolist():
+            heap = self.heaps[acquirer_id]
+            # Empty queues of acquirers that are not exhausted are refilled from scratch when next looked at
+            if not heap and acquirer_id not in self.exhausted:
+                continue
+            offered = company_ids[self.sector_masks[acquirer_id, company_sectors]]
+            scores = self.fit(acquirer_id, offered)
+            fit = np.flatnonzero(scores > -np.inf)
+            if not len(fit):
+                continue
+            entries = [entry for entry in heap if self._is_current(entry)]
+            queued = {entry[1] for entry in entries}
+            entries += [(-score, company_id, versions.get(company_id, 0))
+                        for score, company_id in zip(scores[fit].tolist(), offered[fit].tolist()) if company_id not in queued]
+            # A sorted list is a valid heap
+            self.heaps[acquirer_id] = heapq.nsmallest(self.queue_size, entries)
+            self.exhausted.discard(acquirer_id)
+
+    def _rank(self, acquirer_id, company_ids):
+        """Returns the best `queue_size` of the companies an acquirer would pursue, as a heap."""
+        if not len(company_ids):
+            return []
+        scores = self.fit(acquirer_id, company_ids)
+        keep = np.flatnonzero(scores > -np.inf)
+        if len(keep) > self.queue_size:
+            keep = keep[np.argpartition(-scores[keep], self.queue_size - 1)[:self.queue_size]]
+        versions = self.versions
+        heap = [(-score, company_id, versions.get(company_id, 0))
+                for score, company_id in zip(scores[keep].tolist(), company_ids[keep].tolist())]
+        heapq.heapify(heap)
+        return heap
+
+    def _refill(self, acquirer_id):
+        """Ranks a pool of live targets from the acquirer's sectors and keeps the best as its queue."""
+        sector_codes = self.sector_codes[acquirer_id]
+        heap = self._rank(acquirer_id, np.unique(self.target_index.sample_pool(sector_codes, self.pool_size, rng=self.rng)))
+        if not heap:
+            # A pool can miss the few targets an acquirer would pursue, so rank all of them before giving up
+            heap = self._rank(acquirer_id, self.target_index.members(sector_codes))
+        if not heap:
+            self.exhausted.add(acquirer_id)
+        self.heaps[acquirer_id] = heap
+        return heap
@@ -0,0 +1,33 @@
+import os
+import pickle
+
+from tech_fusion.src.data_generator.universe_store import open_universe, save_universe
+
+CHECKPOINT_FILE = 'checkpoint.pkl'
+UNIVERSE_DIR = 'universe'
+
+def write_universe(directory, universe):
+    """Writes the immutable company universe columns next to the checkpoints."""
+    save_universe(universe, os.path.join(directory, UNIVERSE_DIR))
+
+def read_universe(directory):
+    """Opens the company universe written by `write_universe`, memory-mapped."""
+    return open_universe(os.path.join(directory, UNIVERSE_DIR))
+
+def write_checkpoint(directory, state):
+    """
+    Atomically writes the mutable simulation state.
+
+    The state is pickled in one call so objects shared between components, such as
+    an RNG stream or an acquirer referenced by several deals, stay shared on load.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+def read_checkpoint(directory):
+    """Reads the simulation state written by `write_checkpoint`."""
+    with open(os.path.join(directory, CHECKPOINT_FILE), 'rb') as f:
+        return pickle.load(f)
@@ -1,38 +1,154 @@
 import random
 
-from tech_fusion.src.analytics.synergy import Synergy
+import numpy as np
+
+from tech_fusion.src.analytics.synergy import Synergy, decode_matched_assets
+from tech_fusion.src.data_generator.company_generator import SECTORS
+
+DEAL_STRUCTURES = ["All-Cash", "All-Stock", "Hybrid"]
+# Cumulative probabilities of the first structures; the rest of the mass goes to the last one
+STRUCTURE_THRESHOLDS = [0.5, 0.8]
+
+# Synergy scoring is stateless, so every deal shares one analyzer
+_synergy_analyzer = Synergy()
+
+def draw_structures(rng, size):
+    """Draws the structure codes of many deals at once, with the odds of Deal._determine_deal_structure."""
+    return np.searchsorted(STRUCTURE_THRESHOLDS, rng.random(size), side='right')
 
 class Deal:
     """Represents an M&A transaction."""
-    def __init__(self, acquirer, target):
+    def __init__(self, acquirer, target, synergy_details=None, rng=random, negotiated_premium=None, structure=None):
         self.acquirer = acquirer
         self.target = target
         self.base_valuation = target['valuation_details']['valuation']
-        self.synergy_details = Synergy().calculate_synergy(acquirer, target)
-        self.structure = self._determine_deal_structure()
-        self.status = "proposed"  # proposed, accepted, failed, closed
-        self.negotiated_premium = self._negotiate_premium()
+        if synergy_details is None:
+            synergy_details = _synergy_analyzer.calculate_synergy(acquirer, target)
+        self.synergy_details = synergy_details
+        # Batch code paths draw structures in bulk and pass them in
+        self.structure = structure if structure is not None else self._determine_deal_structure(rng)
+        self.status = "proposed"  # proposed, negotiating, accepted, under_review, failed, closed
+        # Auctions settle the premium while pricing competing bids
+        if negotiated_premium is None:
+            negotiated_premium = self._negotiate_premium(rng)
+        self.negotiated_premium = negotiated_premium
         self.synergy_premium = self.synergy_details['premium']
         self.final_price = self.base_valuation * (1 + self.negotiated_premium + self.synergy_premium)
 
-    def _determine_deal_structure(self):
+    def _determine_deal_structure(self, rng):
         """Determines the deal structure (cash, stock, hybrid)."""
-        roll = random.random()
-        if roll < 0.5:
-            return "All-Cash"
-        elif roll < 0.8:
-            return "All-Stock"
+        roll = rng.random()
+        if roll < STRUCTURE_THRESHOLDS[0]:
+            return DEAL_STRUCTURES[0]
+        elif roll < STRUCTURE_THRESHOLDS[1]:
+            return DEAL_STRUCTURES[1]
         else:
-            return "Hybrid"
+            return DEAL_STRUCTURES[2]
 
-    def _negotiate_premium(self):
+    def _negotiate_premium(self, rng):
         """Simulates a negotiation to determine the final premium."""
         # Financial buyers might offer lower premiums, strategics might offer higher
         if self.acquirer.type == 'Financial':
-            return random.uniform(0.10, 0.25)
+            return rng.uniform(0.10, 0.25)
         else: # Strategic
-            return random.uniform(0.15, 0.30)
+            return rng.uniform(0.15, 0.30)
+
+    def start_negotiation(self, scheduler, now, duration=0):
+        """
+        Opens negotiations and schedules their conclusion.
+
+        Args:
+            scheduler (EventScheduler): The simulation's event queue.
+            now (int): The current simulation step.
+            duration (int): The number of steps negotiation takes.
+        """
+        self.status = "negotiating"
+        scheduler.schedule(now + duration, 'negotiation', self)
+
+    def accept(self, scheduler, now):
+        """Concludes negotiations and schedules the regulatory filing."""
+        self.status = "accepted"
+        scheduler.schedule(now, 'regulatory_filing', self)
+
+    @property
+    def matched_assets(self):
+        """Names of the target assets that met the acquirer's strategic needs."""
+        return decode_matched_assets(self.synergy_details.get('matched_assets_mask', 0))
+
+    def to_record(self, ledger, acquirer_id):
+        """Compacts the deal into a DealRecord that references the acquirer and target by ID."""
+        return DealRecord(ledger, acquirer_id, self.target['id'], self.base_valuation, self.final_price,
+                          self.negotiated_premium, self.synergy_premium, self.synergy_details['score'],
+                          DEAL_STRUCTURES.index(self.structure), self.synergy_details.get('matched_assets_mask', 0))
+
+    def __repr__(self):
+        target = self.target.get('name', f"company {self.target.get('id')}")
+        return (f"Deal({self.acquirer.name} -> {target}, "
+                f"Price: ${self.final_price:,.2f}, Status: {self.status})")
+
+class DealLedger:
+    """The acquirers and universe that DealRecord IDs refer to, shared by all records of a run."""
+
+    def __init__(self, acquirers, universe):
+        self.acquirers = acquirers
+        self.universe = universe
+
+    def __getstate__(self):
+        # The universe is saved separately from checkpoints, so the owner reattaches it on load
+        return {'acquirers': self.acquirers, 'universe': None}
+
+class DealRecord:
+    """
+    A closed deal stored as IDs and numbers only.
+
+    Accessors rebuild the fields of a full Deal on demand, so summaries and reports can
+    treat records and deals alike.
+    """
+    __slots__ = ('ledger', 'acquirer_id', 'target_id', 'base_valuation', 'final_price', 'negotiated_premium',
+                 'synergy_premium', 'synergy_score', 'structure_code', 'matched_assets_mask')
+
+    status = "closed"
+
+    def __init__(self, ledger, acquirer_id, target_id, base_valuation, final_price, negotiated_premium,
+                 synergy_premium, synergy_score, structure_code, matched_assets_mask):
+        self.ledger = ledger
+        self.acquirer_id = acquirer_id
+        self.target_id = target_id
+        self.base_valuation = base_valuation
+        self.final_price = final_price
+        self.negotiated_premium = negotiated_premium
+        self.synergy_premium = synergy_premium
+        self.synergy_score = synergy_score
+        self.structure_code = structure_code
+        self.matched_assets_mask = matched_assets_mask
+
+    @property
+    def acquirer(self):
+        return self.ledger.acquirers[self.acquirer_id]
+
+    @property
+    def target(self):
+        """The target's dict view, rebuilt from the universe."""
+        return self.ledger.universe.company(self.target_id)
+
+    @property
+    def target_sector(self):
+        """The target's sector, without building its full dict view."""
+        return SECTORS[self.ledger.universe['sector'][self.target_id]]
+
+    @property
+    def structure(self):
+        return DEAL_STRUCTURES[self.structure_code]
+
+    @property
+    def synergy_details(self):
+        return {'score': self.synergy_score, 'premium': self.synergy_premium,
+                'matched_assets_mask': self.matched_assets_mask}
+
+    @property
+    def matched_assets(self):
+        return decode_matched_assets(self.matched_assets_mask)
 
     def __repr__(self):
-        return (f"Deal({self.acquirer.name} -> {self.target['name']}, "
+        return (f"DealRecord({self.acquirer.name} -> {self.target['name']}, "
                 f"Price: ${self.final_price:,.2f}, Status: {self.status})")
@@ -1,136 +1,849 @@
 import random
-from tech_fusion.src.data_generator.company_generator import CompanyGenerator
-from tech_fusion.src.market.participants import get_sample_participants
-from tech_fusion.src.market.valuation import Valuation
-from tech_fusion.src.simulation.deal import Deal
+import numpy as np
+from tech_fusion.src.data_generator.company_generator import CompanyGenerator, SECTORS
+from tech_fusion.src.data_generator.universe_store import open_universe
+from tech_fusion.src.market.participants import generate_participants, get_sample_participants
+from tech_fusion.src.market.valuation import Valuation, ValuationCache
+from tech_fusion.src.simulation.deal import DEAL_STRUCTURES, Deal, DealLedger, DealRecord, draw_structures
 from tech_fusion.src.market.environment import MarketEnvironment
+from tech_fusion.src.market.scenarios import ScenarioMarket
 from tech_fusion.src.analytics.integration import IntegrationComplexity
+from tech_fusion.src.analytics.synergy import Synergy
+from tech_fusion.src.analytics.deal_stats import DealAnalytics
+from tech_fusion.src.utils.helpers import popcount
 from tech_fusion.src.simulation.regulatory import RegulatoryEngine
+from tech_fusion.src.simulation.scheduler import EventScheduler
+from tech_fusion.src.simulation.auction import BID, FINANCIAL_CRITERIA, OUTBID, BatchAuction
+from tech_fusion.src.simulation.candidate_queues import CandidateQueues
+from tech_fusion.src.simulation.target_index import SectorIndex
+from tech_fusion.src.simulation.events import EventStream
+from tech_fusion.src.simulation.instrumentation import Instrumentation
+from tech_fusion.src.simulation import checkpoint
 from tech_fusion.src.reporting.report_generator import ReportGenerator
 
+# Above this many strategic acquirer x target pairs, integration scores are computed
+# per evaluated pair instead of being precomputed as a matrix
+MAX_SCORE_MATRIX_CELLS = 20_000_000
+
+# Independent random streams owned by the engine. NumPy streams feed the batch code paths,
+# the others are random.Random instances for scalar components.
+NUMPY_STREAMS = ['universe', 'valuation', 'auction', 'candidates']
+SCALAR_STREAMS = ['market', 'participants', 'targets', 'deals', 'synergy', 'regulatory']
+
+# The order streams are spawned in. New streams go last so that a seed keeps drawing
+# the same numbers for the existing ones.
+STREAM_ORDER = ['universe', 'valuation', 'market', 'participants', 'targets', 'deals', 'synergy', 'regulatory',
+                'auction', 'candidates']
+
+# How acquirers compete for targets within a step
+BIDDING_MODES = ['auction', 'sequential', 'vectorized']
+
+# How each acquirer picks the target it evaluates in a step
+TARGET_SELECTION_MODES = ['random', 'ranked']
+
+def create_rngs(seed=None):
+    """Spawns one seeded stream per engine component from a single seed or SeedSequence."""
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    rngs = {}
+    for name, child in zip(STREAM_ORDER, seed_sequence.spawn(len(STREAM_ORDER))):
+        if name in NUMPY_STREAMS:
+            rngs[name] = np.random.default_rng(child)
+        else:
+            rngs[name] = random.Random(int.from_bytes(child.generate_state(4).tobytes(), 'little'))
+    return rngs
+
 class SimulationEngine:
     """Manages the M&A simulation process."""
 
-    def __init__(self, num_companies=100):
+    def __init__(self, num_companies=100, seed=None, events=None, retain_deals=True, instrumentation=None,
+                 redraw_valuations=False, negotiation_steps=0, num_acquirers=None, bidding='auction',
+                 universe_path=None, market_scenarios=None, scenario_index=0, integration_threshold=65,
+                 max_financing_rate=0.04, block_probability=0.15, review_threshold=5_000_000_000, target_selection='random'):
+        if bidding not in BIDDING_MODES:
+            raise ValueError(f"Unknown bidding mode: {bidding}")
+        if target_selection not in TARGET_SELECTION_MODES:
+            raise ValueError(f"Unknown target selection: {target_selection}")
+        self.rngs = create_rngs(seed)
+        # Strategic acquirers only pursue targets below this integration complexity score,
+        # and financial buyers only buy while rates are below this financing rate
+        self.integration_threshold = integration_threshold
+        self.max_financing_rate = max_financing_rate
+        # Auctions let every acquirer bid on its candidate before contested targets are awarded;
+        # sequential bidding hands each target to whichever acquirer comes first in the list.
+        # Vectorized bidding runs the auction as an array kernel, drawing everything from the auction stream
+        self.bidding = bidding
+        # Acquirers either draw a random target from their sectors or work down a ranked queue
+        # of their best-fitting live targets
+        self.target_selection = target_selection
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        # Long runs that stream their report can drop closed deals to keep memory flat
+        self.retain_deals = retain_deals
+        self.events = events if events is not None else EventStream()
+        self._init_components()
+        # The market either evolves from its own stream or replays a precomputed scenario path
+        if market_scenarios is not None:
+            self.market_env = market_scenarios.path(scenario_index, events=self.events)
+        else:
+            self.market_env = MarketEnvironment(rng=self.rngs['market'], events=self.events)
+        self.synergy_analyzer = Synergy(rng=self.rngs['synergy'])
+        self.regulatory_engine = RegulatoryEngine(block_probability=block_probability, review_threshold=review_threshold,
+                                                  rng=self.rngs['regulatory'], events=self.events)
+        self.completed_deals = []
+        self.blocked_deals = 0
+        # Statistics of closed deals, kept whether or not the deals themselves are retained
+        self.deal_analytics = DealAnalytics()
+        self.current_step = 0
+        # Deals in flight move through their lifecycle as scheduled events
+        self.scheduler = EventScheduler()
+        self.negotiation_steps = negotiation_steps
+
+        # A saved universe store opens memory-mapped instead of being generated
+        self.universe_path = universe_path
+        if universe_path is not None:
+            self.universe = open_universe(universe_path)
+        else:
+            self.universe = self.company_gen.generate_universe(num_companies, rng=self.rngs['universe'])
+        self.regulatory_engine.track_market(self.universe)
+        self.valuations = None
+        # Company-specific valuation components are drawn once and rescaled by sentiment each step,
+        # unless the run asks for the per-step re-draw
+        self.valuation_cache = ValuationCache(self.valuation_engine, self.universe, rng=self.rngs['valuation'],
+                                              redraw=redraw_valuations)
+        # Companies that are still available for acquisition, indexed by sector
+        self.target_index = SectorIndex(SECTORS, self.universe['sector'])
+        # The six sample acquirers unless a generated, market-wide population is asked for
+        if num_acquirers is None:
+            participants = get_sample_participants(rng=self.rngs['participants'])
+        else:
+            participants = generate_participants(num_acquirers, rng=self.rngs['participants'])
+        self.strategic_acquirers, self.financial_buyers, self.advisors = participants
+        self._init_acquirers()
+        # Closed deals are kept as compact records that refer back to the acquirers and universe
+        self.deal_ledger = DealLedger(self.acquirers, self.universe)
+        self.candidate_queues = None
+        if target_selection == 'ranked':
+            self.candidate_queues = CandidateQueues(len(self.acquirers), self.target_fit, self.target_index,
+                                                    self.acquirer_sector_masks, rng=self.rngs['candidates'])
+        
+        # Pre-calculate valuations for all target companies
+        self.update_all_valuations()
+
+        if self.events.enabled:
+            self.events.emit('engine_initialized', num_targets=len(self.target_index), num_acquirers=len(self.acquirers))
+
+    def _init_components(self):
+        """Creates the components that hold no simulation state."""
         self.company_gen = CompanyGenerator()
         self.valuation_engine = Valuation()
-        self.market_env = MarketEnvironment()
         self.integration_analyzer = IntegrationComplexity()
-        self.regulatory_engine = RegulatoryEngine()
         self.report_generator = ReportGenerator(report_dir='tech_fusion/reports')
-        self.completed_deals = []
+        self._checkpointed_universe_to = None
+        self.event_handlers = {
+            'negotiation': self._on_negotiation,
+            'regulatory_filing': self._on_regulatory_filing,
+            'review_decision': self._on_review_decision,
+            'close': self._on_close
+        }
 
-        print("Initializing simulation environment...")
-        self.target_companies = self.company_gen.generate_companies(num_companies)
-        self.strategic_acquirers, self.financial_buyers, self.advisors = get_sample_participants()
+    def _init_acquirers(self, integration_scores=None):
+        """Derives the per-acquirer lookups used while matching targets, reusing a given score matrix."""
         self.acquirers = self.strategic_acquirers + self.financial_buyers
-        
-        # Pre-calculate valuations for all target companies
-        self.update_all_valuations()
+        self.acquirer_ids = {acquirer: acquirer_id for acquirer_id, acquirer in enumerate(self.acquirers)}
+        # Sector codes each acquirer's investment focus resolves to
+        self.acquirer_sectors = {acquirer: self.target_index.resolve(acquirer.investment_focus) for acquirer in self.acquirers}
+        self.acquirer_sector_masks = np.zeros((len(self.acquirers), len(SECTORS)), dtype=bool)
+        for acquirer_id, acquirer in enumerate(self.acquirers):
+            self.acquirer_sector_masks[acquirer_id, list(self.acquirer_sectors[acquirer])] = True
+        self.acquirer_types = np.array([acquirer.type for acquirer in self.acquirers])
+        # Integration factors never change, so every strategic acquirer x target pair is screened once,
+        # unless the population is too large for the matrix to fit in memory
+        self.encoded_strategics = self.integration_analyzer.encode_acquirers(self.strategic_acquirers)
+        self.integration_scores = integration_scores
+        if integration_scores is None and len(self.strategic_acquirers) * len(self.universe) <= MAX_SCORE_MATRIX_CELLS:
+            self.integration_scores = self.integration_analyzer.calculate_score_matrix(self.strategic_acquirers, self.universe)
+        self.strategic_rows = {acquirer: row for row, acquirer in enumerate(self.strategic_acquirers)}
+        self.auction = BatchAuction(self.acquirers, self.strategic_rows, max_financing_rate=self.max_financing_rate,
+                                    integration_threshold=self.integration_threshold)
+
+    def save_checkpoint(self, directory):
+        """
+        Saves the simulation so that a resumed run continues bit-identically.
+
+        The universe never changes during a run, so it is written once per directory;
+        later checkpoints only write the small mutable state. A universe opened from a
+        store is referenced by its path instead of being copied.
+        """
+        if self.universe_path is None and self._checkpointed_universe_to != directory:
+            checkpoint.write_universe(directory, self.universe)
+            self._checkpointed_universe_to = directory
+        checkpoint.write_checkpoint(directory, self.get_state())
 
-        print(f"Generated {len(self.target_companies)} target companies.")
-        print(f"Generated {len(self.acquirers)} potential acquirers.")
+    def get_state(self):
+        """Returns the mutable simulation state, everything but the universe and derived lookups."""
+        return {
+            'current_step': self.current_step,
+            'universe_path': self.universe_path,
+            'rngs': self.rngs,
+            'market_env': self.market_env,
+            'regulatory_engine': self.regulatory_engine,
+            'synergy_analyzer': self.synergy_analyzer,
+            'strategic_acquirers': self.strategic_acquirers,
+            'financial_buyers': self.financial_buyers,
+            'advisors': self.advisors,
+            'retain_deals': self.retain_deals,
+            'deal_ledger': self.deal_ledger,
+            'valuation_cache': self.valuation_cache,
+            'completed_deals': self.completed_deals,
+            'blocked_deals': self.blocked_deals,
+            'deal_analytics': self.deal_analytics,
+            'scheduler': self.scheduler,
+            'negotiation_steps': self.negotiation_steps,
+            'bidding': self.bidding,
+            'target_selection': self.target_selection,
+            'candidate_queues': self.candidate_queues,
+            'integration_threshold': self.integration_threshold,
+            'max_financing_rate': self.max_financing_rate,
+            'target_index': self.target_index.get_state()
+        }
+
+    def load_checkpoint(self, directory):
+        """Replaces the simulation state with the one saved in `directory`."""
+        state = checkpoint.read_checkpoint(directory)
+        if state['universe_path'] is not None:
+            universe = open_universe(state['universe_path'])
+        else:
+            universe = checkpoint.read_universe(directory)
+        self.set_state(state, universe)
+        self._checkpointed_universe_to = directory
+
+    def set_state(self, state, universe, integration_scores=None, company_sectors=None):
+        """
+        Replaces the simulation state with one returned by `get_state`.
+
+        The universe is only read, so engines restored from copies of one state can share it.
+
+        Args:
+            state (dict): The state to restore; it is taken over, not copied.
+            universe (CompanyUniverse): The universe the state was saved from.
+            integration_scores (np.ndarray, optional): The integration score matrix of the same
+                acquirers and universe, to share instead of recomputing it.
+            company_sectors (array, optional): The `company_sectors` of a target index over the same
+                universe, to share instead of copying it.
+        """
+        self.rngs = state['rngs']
+        self.integration_threshold = state['integration_threshold']
+        self.max_financing_rate = state['max_financing_rate']
+        self._init_components()
+        self.market_env = state['market_env']
+        self.regulatory_engine = state['regulatory_engine']
+        self.market_env.events = self.events
+        self.regulatory_engine.events = self.events
+        self.synergy_analyzer = state['synergy_analyzer']
+        self.universe_path = state['universe_path']
+        self.universe = universe
+        self.valuations = None
+        if company_sectors is None:
+            company_sectors = self.universe['sector']
+        self.target_index = SectorIndex.from_state(SECTORS, company_sectors, state['target_index'])
+        self.strategic_acquirers = state['strategic_acquirers']
+        self.financial_buyers = state['financial_buyers']
+        self.advisors = state['advisors']
+        self._init_acquirers(integration_scores)
+        self.retain_deals = state['retain_deals']
+        self.deal_ledger = state['deal_ledger']
+        self.deal_ledger.universe = self.universe
+        self.valuation_cache = state['valuation_cache']
+        self.valuation_cache.universe = self.universe
+        self.valuation_cache.valuation_engine = self.valuation_engine
+        self.completed_deals = state['completed_deals']
+        self.blocked_deals = state['blocked_deals']
+        self.deal_analytics = state['deal_analytics']
+        self.scheduler = state['scheduler']
+        self.negotiation_steps = state['negotiation_steps']
+        self.bidding = state['bidding']
+        self.target_selection = state['target_selection']
+        self.candidate_queues = state['candidate_queues']
+        if self.candidate_queues is not None:
+            self.candidate_queues.attach(self.target_fit, self.target_index, self.acquirer_sector_masks,
+                                         rng=self.rngs['candidates'])
+        self.current_step = state['current_step']
+        self._attach_rngs()
+
+    def _attach_rngs(self):
+        """
+        Points every component at its stream in `self.rngs`.
+
+        A restored state already shares its streams with its components, but a state whose
+        streams were replaced, such as a reseeded snapshot, would otherwise keep drawing
+        from the ones it was saved with.
+        """
+        if isinstance(self.market_env, MarketEnvironment):
+            self.market_env.rng = self.rngs['market']
+        self.synergy_analyzer.rng = self.rngs['synergy']
+        self.regulatory_engine.rng = self.rngs['regulatory']
+        self.valuation_cache.rng = self.rngs['valuation']
+
+    @classmethod
+    def from_checkpoint(cls, directory, events=None, instrumentation=None):
+        """Creates an engine from a checkpoint without generating a new universe."""
+        engine = cls.__new__(cls)
+        engine.events = events if events is not None else EventStream()
+        engine.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        engine.load_checkpoint(directory)
+        return engine
+
+    def get_company(self, company_id, identity=True):
+        """
+        Returns the dict view of a company, including its current valuation details.
+
+        Headless code paths pass identity=False so that no names are generated for them.
+        """
+        company = self.universe.company(company_id, identity=identity)
+        if self.valuations is not None:
+            company['valuation_details'] = {
+                key: (float(value[company_id]) if isinstance(value, np.ndarray) else value)
+                for key, value in self.valuations.items()
+            }
+        return company
 
     def find_potential_target(self, acquirer):
         """Finds a potential target company for an acquirer."""
-        potential_targets = []
-        for company in self.target_companies:
-            # Simple matching based on sector focus
-            if any(focus in company['sector'] for focus in acquirer.investment_focus) or "High-Growth Tech" in acquirer.investment_focus:
-                potential_targets.append(company)
-        
-        if not potential_targets:
+        company_id = self._find_candidate(self.acquirer_ids[acquirer], acquirer)
+        if company_id is None:
             return None
-        
-        # Acquirer chooses one target randomly from potential matches
-        return random.choice(potential_targets)
+        return self.get_company(company_id)
+
+    def _find_candidate(self, acquirer_id, acquirer):
+        """Returns the acquirer's next candidate target, or None if its sectors hold none."""
+        if self.candidate_queues is not None:
+            return self.candidate_queues.peek(acquirer_id)
+        # Acquirer chooses one target randomly from the sectors it focuses on
+        return self.target_index.sample(self.acquirer_sectors[acquirer], rng=self.rngs['targets'])
+
+    def target_fit(self, acquirer_id, company_ids):
+        """
+        Scores how well targets fit an acquirer, for ranked target selection.
+
+        Strategic acquirers rank targets by expected synergy plus the headroom of their
+        integration score below the threshold. Financial buyers rank profitable targets by
+        EBITDA margin plus the share of their dry powder the deal would deploy. Prices are
+        estimated at neutral sentiment, so the ranking does not churn as the market moves.
+
+        Args:
+            acquirer_id (int): The acquirer.
+            company_ids (np.ndarray): The targets to score.
+
+        Returns:
+            np.ndarray: The fit of each target, -inf for targets the acquirer's screening
+                rejects whatever the market or those it could never afford.
+        """
+        auction = self.auction
+        if auction.is_strategic[acquirer_id]:
+            rows = np.full(len(company_ids), auction.strategic_rows[acquirer_id])
+            integration_scores = self.integration_scores_for(rows, company_ids)
+            # Expected synergy score, as in Synergy.calculate_synergy_batch
+            need_mask = auction.need_masks[acquirer_id]
+            needed = popcount(need_mask[None])[0]
+            synergy = popcount(need_mask & self.universe['assets'][company_ids]) / needed if needed else 0.0
+            fit = synergy + 1 - integration_scores / self.integration_threshold
+            return np.where(integration_scores < self.integration_threshold, fit, -np.inf)
+        neutral_valuations = self.valuations['valuation'][company_ids] / self.valuations['sentiment_adjustment']
+        premium = (auction.premium_low[acquirer_id] + auction.premium_high[acquirer_id]) / 2
+        deployment = neutral_valuations * (1 + premium) / auction.dry_powder[acquirer_id]
+        ebitda_margins = self.universe['ebitda_margin'][company_ids]
+        return np.where((ebitda_margins > 0) & (deployment <= 1), ebitda_margins + deployment, -np.inf)
+
+    def integration_score(self, acquirer, company_id):
+        """Returns the integration complexity score of a strategic acquirer and a target."""
+        return self.integration_scores_for(self.strategic_rows[acquirer], company_id)
+
+    def integration_scores_for(self, rows, company_ids):
+        """Returns integration complexity scores for strategic acquirer rows and targets, scalars or arrays."""
+        if self.integration_scores is not None:
+            return self.integration_scores[rows, company_ids]
+        return self.integration_analyzer.calculate_pair_scores(self.encoded_strategics, rows, self.universe, company_ids)
 
     def update_all_valuations(self):
         """Recalculates valuations for all companies based on the current market environment."""
-        for company in self.target_companies:
-            company['valuation_details'] = self.valuation_engine.calculate_valuation(company, self.market_env)
+        self.valuations = self.valuation_cache.valuations(self.market_env)
+        # Redrawn components change every company's fit, so no acquirer stays exhausted
+        if self.valuation_cache.redraw and self.candidate_queues is not None:
+            self.candidate_queues.forget_exhausted()
+
+    def invalidate_valuations(self, company_ids=None):
+        """Marks company valuations stale after their fundamentals change; all companies if no IDs are given."""
+        self.valuation_cache.invalidate(company_ids)
+        self.update_all_valuations()
+        if self.candidate_queues is not None:
+            self.candidate_queues.invalidate(company_ids)
+
+    def _on_negotiation(self, deal, now, closed_deals):
+        deal.accept(self.scheduler, now)
+
+    def _on_regulatory_filing(self, deal, now, closed_deals):
+        with self.instrumentation.phase('regulatory_review'):
+            self.regulatory_engine.file_deal(deal, self.scheduler, now)
+
+    def _on_review_decision(self, deal, now, closed_deals):
+        with self.instrumentation.phase('regulatory_review'):
+            status, reason = self.regulatory_engine.decide(deal)
+        if status == "Approved":
+            self.scheduler.schedule(now, 'close', deal)
+            return
+        # Blocked by regulators, so the target is back on the market
+        deal.status = "failed"
+        self.blocked_deals += 1
+        self.target_index.add(deal.target['id'])
+        if self.candidate_queues is not None:
+            self.candidate_queues.restore(deal.target['id'])
+        if self.instrumentation.enabled:
+            self.instrumentation.count('blocks')
+        if self.events.enabled:
+            self.events.emit('block', step=now, acquirer=deal.acquirer.name, target_id=deal.target['id'],
+                             target=deal.target['name'], reason=reason)
+
+    def _on_close(self, deal, now, closed_deals):
+        deal.status = "closed"
+        self.regulatory_engine.record_close(deal)
+        if self.instrumentation.enabled:
+            self.instrumentation.count('closes')
+        if self.events.enabled:
+            self.events.emit('close', step=now, acquirer=deal.acquirer.name, target_id=deal.target['id'], target=deal.target['name'],
+                             price=deal.final_price, structure=deal.structure,
+                             synergy_score=deal.synergy_details['score'], synergy_premium=deal.synergy_details['premium'],
+                             matched_assets_mask=deal.synergy_details.get('matched_assets_mask', 0))
+        closed_deals.append(deal.to_record(self.deal_ledger, self.acquirer_ids[deal.acquirer]))
+
+    def process_events(self, until):
+        """
+        Advances every deal in flight through the lifecycle events due by step `until`.
+
+        Returns:
+            list: The deals closed by these events, as DealRecords.
+        """
+        closed_deals = []
+        handlers = self.event_handlers
+        events_enabled = self.events.enabled
+        for time, kind, deal in self.scheduler.pop_due(until):
+            if events_enabled and 'name' not in deal.target:
+                # Deals proposed while events were off, such as before a resumed checkpoint, have anonymous targets
+                deal.target['name'], deal.target['location'] = self.universe.company_identity(deal.target['id'])
+            handlers[kind](deal, time, closed_deals)
+        self.deal_analytics.record_deals(closed_deals)
+        return closed_deals
 
     def run_simulation_step(self):
-        """Runs a single step of the simulation."""
-        print("\n--- Running Simulation Step ---")
-        
-        for acquirer in self.acquirers:
-            if not self.target_companies:
+        """
+        Runs a single step of the simulation and returns the deals closed in it.
+
+        Acquirers propose deals on live targets, which are taken off the market while the
+        deal is in flight. Lifecycle events due by the end of the step are then processed,
+        so deals that need neither negotiation time nor a review close in the step they
+        were proposed.
+        """
+        step = self.current_step + 1
+        if self.events.enabled:
+            self.events.emit('step_started', step=step)
+        closed_deals = []
+        if self.bidding == 'auction':
+            self._propose_auction(step)
+        elif self.bidding == 'vectorized':
+            closed_deals = self._propose_vectorized(step)
+        else:
+            self._propose_sequential(step)
+
+        with self.instrumentation.phase('event_processing'):
+            closed_deals += self.process_events(step)
+        if self.retain_deals:
+            self.completed_deals.extend(closed_deals)
+        return closed_deals
+
+    def _propose(self, acquirer, target, deal, step, num_bids=1):
+        """Takes a target off the market and opens negotiations on the deal proposed for it."""
+        if self.instrumentation.enabled:
+            self.instrumentation.count('proposals')
+        if self.events.enabled:
+            self.events.emit('proposal', step=step, acquirer=acquirer.name, target_id=target['id'],
+                             target=target['name'], price=deal.final_price, num_bids=num_bids)
+        # The target is off the market while the deal is in flight
+        self.target_index.remove(target['id'])
+        deal.start_negotiation(self.scheduler, step, self.negotiation_steps)
+
+    def _propose_sequential(self, step):
+        """Acquirers take turns in list order, so earlier acquirers claim contested targets first."""
+        events = self.events
+        metrics = self.instrumentation
+        phase = metrics.phase
+        ebitda_margins = self.universe['ebitda_margin']
+        for acquirer_id, acquirer in enumerate(self.acquirers):
+            if not self.target_index:
                 break
             
-            target = self.find_potential_target(acquirer)
+            with phase('target_search'):
+                company_id = self._find_candidate(acquirer_id, acquirer)
             
-            if target:
-                print(f"-> {acquirer.name} ({acquirer.type}) is evaluating {target['name']} ({target['sector']}).")
+            if company_id is not None:
+                if metrics.enabled:
+                    metrics.count('evaluations')
+                # Screening reads the universe columns directly; the dict view is only built
+                # for events and for deals that go ahead
+                target = None
+                if events.enabled:
+                    target = self.get_company(company_id)
+                    events.emit('evaluation', step=step, acquirer=acquirer.name, acquirer_type=acquirer.type,
+                                target_id=company_id, target=target['name'], sector=target['sector'])
                 
                 propose_deal = False
-                pass_reason = ""
+                pass_reason = None
+                integration_score = None
 
                 # Financial buyers are more sensitive to interest rates
                 if acquirer.type == "Financial":
-                    if target['financials']['ebitda_margin'] > 0 and self.market_env.interest_rate < 0.04:
+                    if ebitda_margins[company_id] > 0 and self.market_env.interest_rate < self.max_financing_rate:
                         propose_deal = True
                     else:
-                        pass_reason = "Target does not meet financial criteria"
+                        pass_reason = 'financial_criteria'
 
                 elif acquirer.type == "Strategic":
-                    integration_score = self.integration_analyzer.calculate_score(acquirer, target)
-                    print(f"   Integration Complexity Score: {integration_score:.2f}")
-                    if integration_score < 65: # Threshold for acceptable complexity
+                    with phase('integration_scoring'):
+                        integration_score = self.integration_score(acquirer, company_id)
+                    if events.enabled:
+                        events.emit('integration_scored', step=step, acquirer=acquirer.name, target_id=company_id, score=integration_score)
+                    if integration_score < self.integration_threshold:
                         propose_deal = True
                     else:
-                        pass_reason = f"Integration complexity ({integration_score:.2f}) is too high"
+                        pass_reason = 'integration_complexity'
 
                 if propose_deal:
-                    deal = Deal(acquirer, target)
-                    # Regulatory review
-                    status, reason = self.regulatory_engine.review_deal(deal)
-
-                    if status == "Approved":
-                        print(f"   DEAL CLOSED: {acquirer.name} acquired {target['name']}.")
-                        print(f"   Price: ${deal.final_price:,.2f} ({deal.structure})")
-                        if deal.synergy_details['score'] > 0:
-                            print(f"   Synergy Premium: +{deal.synergy_details['premium']:.2%} (Assets: {deal.synergy_details['matched_assets']})")
-                        self.completed_deals.append(deal)
-                        self.target_companies.remove(target)
-                    else: # Blocked by regulators
-                        print(f"   DEAL BLOCKED: Acquisition of {target['name']} by {acquirer.name}. Reason: {reason}")
+                    with phase('deal_construction'):
+                        if target is None:
+                            target = self.get_company(company_id, identity=False)
+                        synergy_details = self.synergy_analyzer.calculate_synergy(acquirer, target)
+                        deal = Deal(acquirer, target, synergy_details=synergy_details, rng=self.rngs['deals'])
+                    self._propose(acquirer, target, deal, step)
                 else:
-                    if pass_reason:
-                        print(f"   Decision: Passed on {target['name']} ({pass_reason}).")
-                    else:
-                        print(f"   Decision: Passed on {target['name']}.")
+                    # Integration complexity rules the target out for good; financial criteria
+                    # may pass once rates fall
+                    if self.candidate_queues is not None and pass_reason != 'financial_criteria':
+                        self.candidate_queues.discard(acquirer_id, company_id)
+                    if metrics.enabled:
+                        metrics.count('passes.' + pass_reason)
+                    if events.enabled:
+                        events.emit('pass', step=step, acquirer=acquirer.name, target_id=company_id, target=target['name'],
+                                    reason=pass_reason, score=integration_score)
+            else:
+                if metrics.enabled:
+                    metrics.count('no_target')
+                if events.enabled:
+                    events.emit('no_target', step=step, acquirer=acquirer.name)
+
+    def _propose_auction(self, step):
+        """
+        Every acquirer screens one candidate target independently, then all bids are
+        resolved together, with each contested target going to its highest bidder.
+        """
+        events = self.events
+        metrics = self.instrumentation
+        phase = metrics.phase
+        acquirer_ids = []
+        company_ids = []
+        with phase('target_search'):
+            find_candidate = self._find_candidate
+            for acquirer_id, acquirer in enumerate(self.acquirers):
+                company_id = find_candidate(acquirer_id, acquirer)
+                if company_id is None:
+                    if metrics.enabled:
+                        metrics.count('no_target')
+                    if events.enabled:
+                        events.emit('no_target', step=step, acquirer=acquirer.name)
+                    continue
+                acquirer_ids.append(acquirer_id)
+                company_ids.append(company_id)
+        if not acquirer_ids:
+            return
+        acquirer_ids = np.array(acquirer_ids, dtype=np.intp)
+        company_ids = np.array(company_ids, dtype=np.intp)
+
+        with phase('screening'):
+            outcome, scores = self.auction.screen(acquirer_ids, company_ids, self.universe,
+                                                  self.market_env.interest_rate, self.integration_scores_for)
+        bids = np.flatnonzero(outcome == BID)
+        with phase('auction'):
+            bid_targets = company_ids[bids]
+            result = self.auction.resolve(acquirer_ids[bids], bid_targets, self.valuations['valuation'][bid_targets],
+                                          self.universe['assets'][bid_targets], rng=self.rngs['auction'])
+        outcome[bids] = result['outcome']
+        self._discard_passed(acquirer_ids, company_ids, outcome)
+        # Position of each pair in the auction result
+        bid_positions = np.full(len(acquirer_ids), -1, dtype=np.intp)
+        bid_positions[bids] = np.arange(len(bids))
+
+        if metrics.enabled:
+            metrics.count('evaluations', len(acquirer_ids))
+            metrics.count('contested_targets', int(np.count_nonzero((result['outcome'] == BID) & (result['num_bids'] > 1))))
+            reasons, counts = np.unique(outcome[outcome != BID].astype(str), return_counts=True)
+            for reason, count in zip(reasons, counts):
+                metrics.count('passes.' + reason, int(count))
+
+        for pair in range(len(acquirer_ids)):
+            acquirer = self.acquirers[acquirer_ids[pair]]
+            company_id = int(company_ids[pair])
+            won = outcome[pair] == BID
+            if not (won or events.enabled):
+                continue
+            target = self.get_company(company_id, identity=events.enabled)
+            integration_score = None if np.isnan(scores[pair]) else float(scores[pair])
+            if events.enabled:
+                events.emit('evaluation', step=step, acquirer=acquirer.name, acquirer_type=acquirer.type,
+                            target_id=company_id, target=target['name'], sector=target['sector'])
+                if integration_score is not None:
+                    events.emit('integration_scored', step=step, acquirer=acquirer.name, target_id=company_id, score=integration_score)
+            if not won:
+                if events.enabled:
+                    events.emit('pass', step=step, acquirer=acquirer.name, target_id=company_id, target=target['name'],
+                                reason=outcome[pair], score=integration_score)
+                continue
+            position = bid_positions[pair]
+            with phase('deal_construction'):
+                synergy_details = {'score': float(result['synergy_score'][position]),
+                                   'premium': float(result['synergy_premium'][position])}
+                matched_assets_mask = int(result['matched_assets_mask'][position])
+                if matched_assets_mask:
+                    synergy_details['matched_assets_mask'] = matched_assets_mask
+                deal = Deal(acquirer, target, synergy_details=synergy_details, rng=self.rngs['deals'],
+                            negotiated_premium=float(result['negotiated_premium'][position]))
+            self._propose(acquirer, target, deal, step, num_bids=int(result['num_bids'][position]))
+
+    def _propose_vectorized(self, step):
+        """
+        The auction as an array kernel: targets are drawn, screened, priced and structured
+        for all acquirers at once, and the regulatory review trigger is applied as a mask.
+
+        When negotiation takes no time, winning deals that need no review close in a single
+        pass over arrays; the others enter the lifecycle as Deal objects, as auction deals do.
+        Review triggers are judged against the concentration at the start of the step.
+
+        Returns:
+            list: The deals closed in the pass, as DealRecords.
+        """
+        events = self.events
+        metrics = self.instrumentation
+        phase = metrics.phase
+        rng = self.rngs['auction']
+        with phase('target_search'):
+            if self.candidate_queues is not None:
+                candidates = self.candidate_queues.peek_many(np.arange(len(self.acquirers)))
             else:
-                print(f"-> {acquirer.name} found no suitable targets in this step.")
-
-    def run_full_simulation(self, num_steps=5):
-        """Runs the full simulation for a number of steps."""
-        print(f"\n=== Starting Full M&A Simulation ({num_steps} steps) ===")
-        for i in range(num_steps):
-            if not self.target_companies:
-                print("\nNo more target companies available. Ending simulation.")
+                candidates = self.target_index.sample_many(self.acquirer_sector_masks, rng=rng)
+        found = candidates >= 0
+        if metrics.enabled and not found.all():
+            metrics.count('no_target', int(np.count_nonzero(~found)))
+        if events.enabled:
+            for acquirer_id in np.flatnonzero(~found):
+                events.emit('no_target', step=step, acquirer=self.acquirers[acquirer_id].name)
+        acquirer_ids = np.flatnonzero(found)
+        company_ids = candidates[found]
+        if not len(acquirer_ids):
+            return []
+
+        with phase('screening'):
+            outcome, scores = self.auction.screen(acquirer_ids, company_ids, self.universe,
+                                                  self.market_env.interest_rate, self.integration_scores_for)
+        bids = np.flatnonzero(outcome == BID)
+        with phase('auction'):
+            bid_targets = company_ids[bids]
+            result = self.auction.resolve(acquirer_ids[bids], bid_targets, self.valuations['valuation'][bid_targets],
+                                          self.universe['assets'][bid_targets], rng=rng)
+        outcome[bids] = result['outcome']
+        self._discard_passed(acquirer_ids, company_ids, outcome)
+
+        if metrics.enabled:
+            metrics.count('evaluations', len(acquirer_ids))
+            metrics.count('contested_targets', int(np.count_nonzero((result['outcome'] == BID) & (result['num_bids'] > 1))))
+            reasons, counts = np.unique(outcome[outcome != BID].astype(str), return_counts=True)
+            for reason, count in zip(reasons, counts):
+                metrics.count('passes.' + reason, int(count))
+        if events.enabled:
+            for pair in range(len(acquirer_ids)):
+                acquirer = self.acquirers[acquirer_ids[pair]]
+                company_id = int(company_ids[pair])
+                target = self.universe.company(company_id)
+                integration_score = None if np.isnan(scores[pair]) else float(scores[pair])
+                events.emit('evaluation', step=step, acquirer=acquirer.name, acquirer_type=acquirer.type,
+                            target_id=company_id, target=target['name'], sector=target['sector'])
+                if integration_score is not None:
+                    events.emit('integration_scored', step=step, acquirer=acquirer.name, target_id=company_id, score=integration_score)
+                if outcome[pair] != BID:
+                    events.emit('pass', step=step, acquirer=acquirer.name, target_id=company_id, target=target['name'],
+                                reason=outcome[pair], score=integration_score)
+
+        with phase('deal_construction'):
+            # Winning bids, as positions in the auction result
+            won = np.flatnonzero(result['outcome'] == BID)
+            deals = {key: values[won] for key, values in result.items()}
+            deals['acquirer_id'] = acquirer_ids[bids][won]
+            deals['company_id'] = bid_targets[won]
+            deals['structure'] = draw_structures(rng, len(won))
+            deals['sector'] = self.universe['sector'][deals['company_id']]
+            deals['revenue'] = self.universe['arr'][deals['company_id']].astype(float)
+            deals['base_valuation'] = self.valuations['valuation'][deals['company_id']]
+            acquirer_names = [self.acquirers[acquirer_id].name for acquirer_id in deals['acquirer_id'].tolist()]
+
+        if self.negotiation_steps == 0:
+            with phase('regulatory_review'):
+                deferred = self.regulatory_engine.requires_review_batch(acquirer_names, deals['sector'], deals['revenue'],
+                                                                        deals['price'])
+        else:
+            deferred = np.ones(len(won), dtype=bool)
+        for position in np.flatnonzero(deferred):
+            self._propose_deal_from(deals, position, step)
+
+        closing = np.flatnonzero(~deferred)
+        with phase('closing'):
+            closed_deals = self._close_batch({key: values[closing] for key, values in deals.items()},
+                                             [acquirer_names[position] for position in closing], step)
+        return closed_deals
+
+    def _discard_passed(self, acquirer_ids, company_ids, outcome):
+        """
+        Moves ranked acquirers past the candidates they passed on. Targets that were taken
+        leave the queues anyway, and financial criteria may pass once rates fall.
+        """
+        if self.candidate_queues is None:
+            return
+        passed = np.flatnonzero((outcome != BID) & (outcome != OUTBID) & (outcome != FINANCIAL_CRITERIA))
+        self.candidate_queues.discard(acquirer_ids[passed], company_ids[passed])
+
+    def _propose_deal_from(self, deals, position, step):
+        """Opens negotiations on one winning deal of a vectorized step, with its drawn terms."""
+        acquirer = self.acquirers[deals['acquirer_id'][position]]
+        target = self.get_company(int(deals['company_id'][position]), identity=self.events.enabled)
+        synergy_details = {'score': float(deals['synergy_score'][position]),
+                           'premium': float(deals['synergy_premium'][position])}
+        matched_assets_mask = int(deals['matched_assets_mask'][position])
+        if matched_assets_mask:
+            synergy_details['matched_assets_mask'] = matched_assets_mask
+        deal = Deal(acquirer, target, synergy_details=synergy_details,
+                    negotiated_premium=float(deals['negotiated_premium'][position]),
+                    structure=DEAL_STRUCTURES[deals['structure'][position]])
+        self._propose(acquirer, target, deal, step, num_bids=int(deals['num_bids'][position]))
+
+    def _close_batch(self, deals, acquirer_names, step):
+        """
+        Closes the deals of a vectorized step in one pass: takes their targets off the market,
+        merges them into sector concentration and deal analytics, and returns their DealRecords.
+        """
+        num_deals = len(deals['company_id'])
+        if num_deals == 0:
+            return []
+        company_ids = deals['company_id'].tolist()
+        remove = self.target_index.remove
+        for company_id in company_ids:
+            remove(company_id)
+        self.regulatory_engine.record_closes(acquirer_names, deals['sector'], deals['revenue'])
+        self.deal_analytics.record_batch(np.array(SECTORS)[deals['sector']], self.acquirer_types[deals['acquirer_id']],
+                                         np.array(DEAL_STRUCTURES)[deals['structure']], deals['price'],
+                                         deals['negotiated_premium'], deals['synergy_premium'])
+        ledger = self.deal_ledger
+        closed_deals = [
+            DealRecord(ledger, *fields) for fields in zip(
+                deals['acquirer_id'].tolist(), company_ids, deals['base_valuation'].tolist(), deals['price'].tolist(),
+                deals['negotiated_premium'].tolist(), deals['synergy_premium'].tolist(), deals['synergy_score'].tolist(),
+                deals['structure'].tolist(), deals['matched_assets_mask'].tolist())
+        ]
+        if self.instrumentation.enabled:
+            self.instrumentation.count('proposals', num_deals)
+            self.instrumentation.count('closes', num_deals)
+        if self.events.enabled:
+            for deal, num_bids in zip(closed_deals, deals['num_bids'].tolist()):
+                target = deal.target
+                self.events.emit('proposal', step=step, acquirer=deal.acquirer.name, target_id=deal.target_id,
+                                 target=target['name'], price=deal.final_price, num_bids=num_bids)
+                self.events.emit('close', step=step, acquirer=deal.acquirer.name, target_id=deal.target_id,
+                                 target=target['name'], price=deal.final_price, structure=deal.structure,
+                                 synergy_score=deal.synergy_score, synergy_premium=deal.synergy_premium,
+                                 matched_assets_mask=deal.matched_assets_mask)
+        return closed_deals
+
+    def run_full_simulation(self, num_steps=5, generate_report=True, checkpoint_dir=None, checkpoint_every=5, resume_from=None,
+                            summarize=True, stream_report=None):
+        """
+        Runs the full simulation for a number of steps.
+
+        Args:
+            num_steps (int): The total number of steps, including any already run before a checkpoint.
+            generate_report (bool): Whether to write a deals report.
+            checkpoint_dir (str, optional): Directory to save a checkpoint to every `checkpoint_every` steps.
+            checkpoint_every (int): The number of steps between checkpoints.
+            resume_from (str, optional): Checkpoint directory to resume from instead of starting at step 0.
+            summarize (bool): Whether to print the completed deals summary at the end.
+            stream_report (str, optional): 'columnar' or 'csv' to append each step's closed deals
+                to a typed report as they close, instead of writing a formatted CSV at the end.
+        """
+        if resume_from is not None:
+            self.load_checkpoint(resume_from)
+        # A replayed market path that runs out would fail partway through the run
+        if isinstance(self.market_env, ScenarioMarket) and self.market_env.remaining_steps < num_steps - self.current_step:
+            raise ValueError(f"The market path has {self.market_env.remaining_steps} steps left, "
+                             f"but {num_steps - self.current_step} steps are to be run")
+        events = self.events
+        deal_writer = None
+        if generate_report and stream_report is not None:
+            deal_writer = self.report_generator.open_deal_stream(stream_report)
+        if events.enabled:
+            events.emit('simulation_started', num_steps=num_steps)
+        while self.current_step < num_steps:
+            # Keep stepping while deals are in flight, even once no targets are left
+            if not self.target_index and not self.scheduler:
+                if events.enabled:
+                    events.emit('targets_exhausted', step=self.current_step)
                 break
             
-            self.market_env.update()
-            self.update_all_valuations()
-            self.run_simulation_step()
+            phase = self.instrumentation.phase
+            with phase('step'):
+                with phase('market_update'):
+                    self.market_env.update()
+                with phase('revaluation'):
+                    self.update_all_valuations()
+                closed_deals = self.run_simulation_step()
+            self.current_step += 1
+            if deal_writer is not None:
+                deal_writer.write_deals(self.current_step, closed_deals)
             
-            print(f"--- End of Step {i+1} ---")
-            print(f"Remaining target companies: {len(self.target_companies)}")
-        print("\n=== Simulation Finished ===")
-        self.summarize_deals()
-        self.report_generator.generate_deals_report(self.completed_deals)
+            if events.enabled:
+                events.emit('step_finished', step=self.current_step, remaining_targets=len(self.target_index),
+                            deals_in_flight=len(self.scheduler))
+            if checkpoint_dir is not None and self.current_step % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint_dir)
+        if events.enabled:
+            events.emit('simulation_finished', steps_run=self.current_step, remaining_targets=len(self.target_index),
+                        num_deals=self.deal_analytics.num_deals, deals_in_flight=len(self.scheduler))
+        if summarize:
+            self.summarize_deals()
+        if deal_writer is not None:
+            deal_writer.close()
+        elif generate_report:
+            self.report_generator.generate_deals_report(self.completed_deals)
+        if self.instrumentation.enabled:
+            self.instrumentation.emit(events)
+            if generate_report:
+                self.report_generator.generate_metrics_report(self.instrumentation.snapshot())
     
     def summarize_deals(self):
         """Prints a summary of all completed deals."""
         print("\n--- Completed Deals Summary ---")
+        if not self.retain_deals:
+            # Deal analytics count every closed deal, even those that were dropped
+            print(f"{self.deal_analytics.num_deals} deals were completed; closed deals were not retained, so none are listed.")
+            return
         if not self.completed_deals:
             print("No deals were completed in this simulation.")
             return
             
         for deal in self.completed_deals:
+            target = deal.target
             print(f"- Acquirer: {deal.acquirer.name}")
-            print(f"  Target: {deal.target['name']} ({deal.target['sector']})")
+            print(f"  Target: {target['name']} ({target['sector']})")
             print(f"  Price: ${deal.final_price:,.2f}")
             print(f"  Structure: {deal.structure}")
         print(f"\nTotal deals completed: {len(self.completed_deals)}")
@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tech_fusion.src.analytics.deal_stats import DealAnalytics
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+
+def run_single_simulation(seed_sequence, num_companies, num_steps, universe_path=None, market_path=None, engine_params=None):
+    """
+    Runs one quiet simulation and reduces it to a compact result.
+
+    Args:
+        seed_sequence (np.random.SeedSequence): The seed stream for this run.
+        num_companies (int): The number of target companies to generate.
+        num_steps (int): The number of simulation steps to run.
+        universe_path (str, optional): A universe store to open memory-mapped instead of generating one.
+        market_path (MarketScenarios, optional): A single-path scenario for the run's market to replay.
+        engine_params (dict, optional): Further SimulationEngine keyword arguments, such as thresholds.
+
+    Returns:
+        dict: Deal count, total deal value, blocked deals, per-sector premium sums and counts, and the
+            run's deal analytics as JSON-serializable data.
+    """
+    engine = SimulationEngine(num_companies=num_companies, seed=seed_sequence, events=EventStream(NullSink()),
+                              universe_path=universe_path, market_scenarios=market_path, **(engine_params or {}))
+    engine.run_full_simulation(num_steps=num_steps, generate_report=False, summarize=False)
+
+    sector_premiums = {}
+    for deal in engine.completed_deals:
+        total, count = sector_premiums.get(deal.target_sector, (0.0, 0))
+        sector_premiums[deal.target_sector] = (total + deal.negotiated_premium + deal.synergy_premium, count + 1)
+
+    return {
+        'num_deals': len(engine.completed_deals),
+        'total_value': sum(deal.final_price for deal in engine.completed_deals),
+        'blocked_deals': engine.blocked_deals,
+        'sector_premiums': sector_premiums,
+        'deal_analytics': engine.deal_analytics.to_dict()
+    }
+
+def _describe(values):
+    """Summary statistics of one per-run metric."""
+    values = np.asarray(values, dtype=float)
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'p5': float(np.percentile(values, 5)),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95))
+    }
+
+def summarize_ensemble(results):
+    """Merges compact per-run results into summary statistics across runs."""
+    sector_totals = {}
+    for result in results:
+        for sector, (total, count) in result['sector_premiums'].items():
+            sector_total, sector_count = sector_totals.get(sector, (0.0, 0))
+            sector_totals[sector] = (sector_total + total, sector_count + count)
+    # Each run's sketches merge exactly, so the pooled quantiles span every deal of the ensemble
+    deal_analytics = DealAnalytics()
+    for result in results:
+        deal_analytics.merge(DealAnalytics.from_dict(result['deal_analytics']))
+
+    return {
+        'num_runs': len(results),
+        'num_deals': _describe([result['num_deals'] for result in results]),
+        'total_value': _describe([result['total_value'] for result in results]),
+        'blocked_deals': _describe([result['blocked_deals'] for result in results]),
+        'sector_premiums': {
+            sector: {'mean_premium': total / count, 'num_deals': count}
+            for sector, (total, count) in sorted(sector_totals.items())
+        },
+        'deal_analytics': deal_analytics.summary()
+    }
+
+def run_ensemble(num_runs, num_companies=100, num_steps=5, seed=None, max_workers=None, universe_path=None,
+                 scenarios=None):
+    """
+    Runs independent simulations in a process pool and summarizes them.
+
+    Each run gets its own child of one SeedSequence, so an ensemble is reproducible
+    from its seed regardless of how runs are spread over workers.
+
+    Args:
+        num_runs (int): The number of simulations to run.
+        num_companies (int): The number of target companies per run.
+        num_steps (int): The number of steps per run.
+        seed (int, optional): The root seed of the ensemble.
+        max_workers (int, optional): The number of worker processes, defaulting to the CPU count.
+        universe_path (str, optional): A universe store every run opens memory-mapped, so workers
+            share its pages instead of each generating a universe; `num_companies` is then ignored.
+        scenarios (MarketScenarios, optional): Market paths to replay, run i using path i modulo the
+            number of paths, so that ensembles of different configurations see the same macro paths.
+
+    Returns:
+        dict: The per-run results under 'runs' and their summary under 'summary'.
+    """
+    # Checked before any run starts, rather than failing in a worker once runs reach the end of their paths
+    if scenarios is not None and scenarios.num_steps < num_steps:
+        raise ValueError(f"The market scenarios have {scenarios.num_steps} steps, but runs take {num_steps}")
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_runs)
+    max_workers = max_workers or os.cpu_count() or 1
+    # Hand out several runs per task so short runs are not dominated by IPC
+    chunksize = max(1, num_runs // (max_workers * 4))
+
+    # Workers only receive the path they replay, not the whole batch
+    market_paths = [None] * num_runs
+    if scenarios is not None:
+        market_paths = [scenarios.select(run % len(scenarios)) for run in range(num_runs)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run_single_simulation, seed_sequences,
+                                [num_companies] * num_runs, [num_steps] * num_runs, [universe_path] * num_runs,
+                                market_paths, chunksize=chunksize))
+
+    return {'runs': results, 'summary': summarize_ensemble(results)}
+
+if __name__ == '__main__':
+    import json
+    ensemble = run_ensemble(num_runs=200, num_companies=100, num_steps=5, seed=42)
+    summary = ensemble['summary']
+    deal_analytics = summary.pop('deal_analytics')
+    print(json.dumps(summary, indent=2))
+    print(json.dumps({'all': deal_analytics['all'], 'acquirer_type': deal_analytics['acquirer_type']}, indent=2))
@@ -0,0 +1,167 @@
+import collections
+import json
+
+from tech_fusion.src.analytics.synergy import decode_matched_assets
+
+# Event kinds emitted during a run, with the fields each carries:
+#   engine_initialized   num_targets, num_acquirers
+#   simulation_started   num_steps
+#   market_update        sentiment, interest_rate
+#   step_started         step
+#   evaluation           step, acquirer, acquirer_type, target_id, target, sector
+#   no_target            step, acquirer
+#   integration_scored   step, acquirer, target_id, score
+#   pass                 step, acquirer, target_id, target, reason, score
+#   proposal             step, acquirer, target_id, target, price, num_bids
+#   regulatory_review    target_id, target, price, post_hhi, delta_hhi (None where concentration is not tracked)
+#   close                step, acquirer, target_id, target, price, structure, synergy_score, synergy_premium, matched_assets_mask
+#   block                step, acquirer, target_id, target, reason
+#   step_finished        step, remaining_targets, deals_in_flight
+#   targets_exhausted    step
+#   simulation_finished  steps_run, remaining_targets, num_deals, deals_in_flight
+#   metrics              phases, counters (see Instrumentation.snapshot)
+
+def to_json(data):
+    """Serializes event fields, or any simulation output holding NumPy scalars, to a JSON string."""
+    # NumPy scalars are not JSON serializable, but all of them convert to float
+    return json.dumps(data, default=float)
+
+class NullSink:
+    """Discards every event. A stream with this sink skips building events altogether."""
+    enabled = False
+
+    def write(self, kind, fields):
+        pass
+
+    def close(self):
+        pass
+
+class RingBufferSink:
+    """Keeps the most recent events in memory."""
+    enabled = True
+
+    def __init__(self, capacity=10_000):
+        self.events = collections.deque(maxlen=capacity)
+
+    def write(self, kind, fields):
+        self.events.append((kind, fields))
+
+    def close(self):
+        pass
+
+class JsonLinesSink:
+    """Writes events to a JSON-lines file, buffering lines between flushes."""
+    enabled = True
+
+    def __init__(self, path, buffer_size=1_000):
+        self.file = open(path, 'w')
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, kind, fields):
+        self.buffer.append((kind, fields))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Serializes and writes the buffered events."""
+        for kind, fields in self.buffer:
+            self.file.write(to_json({'event': kind, **fields}))
+            self.file.write('\n')
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class ConsoleSink:
+    """Prints events in the simulation's human-readable console format."""
+    enabled = True
+
+    PASS_REASONS = {
+        'financial_criteria': "Target does not meet financial criteria",
+        'integration_complexity': "Integration complexity ({score:.2f}) is too high",
+        'dry_powder': "Price exceeds available dry powder",
+        'outbid': "Outbid by a competing acquirer"
+    }
+
+    def write(self, kind, fields):
+        f = fields
+        if kind == 'engine_initialized':
+            print(f"Generated {f['num_targets']} target companies.")
+            print(f"Generated {f['num_acquirers']} potential acquirers.")
+        elif kind == 'simulation_started':
+            print(f"\n=== Starting Full M&A Simulation ({f['num_steps']} steps) ===")
+        elif kind == 'market_update':
+            print(f"\n[Market Update] Sentiment: {f['sentiment'].upper()} | Interest Rate: {f['interest_rate']:.2%}")
+        elif kind == 'step_started':
+            print("\n--- Running Simulation Step ---")
+        elif kind == 'evaluation':
+            print(f"-> {f['acquirer']} ({f['acquirer_type']}) is evaluating {f['target']} ({f['sector']}).")
+        elif kind == 'no_target':
+            print(f"-> {f['acquirer']} found no suitable targets in this step.")
+        elif kind == 'integration_scored':
+            print(f"   Integration Complexity Score: {f['score']:.2f}")
+        elif kind == 'pass':
+            reason = self.PASS_REASONS.get(f['reason'], f['reason']).format(score=f['score'])
+            print(f"   Decision: Passed on {f['target']} ({reason}).")
+        elif kind == 'proposal':
+            rivals = f['num_bids'] - 1
+            contest = f", won against {rivals} competing bid{'s' if rivals > 1 else ''}" if rivals else ""
+            print(f"   Decision: Proposed a deal for {f['target']} (Value: ${f['price']:,.2f}{contest}).")
+        elif kind == 'regulatory_review':
+            concentration = ""
+            if f.get('post_hhi') is not None:
+                concentration = f", HHI: {f['post_hhi']:,.0f} (+{f['delta_hhi']:,.0f})"
+            print(f"   REGULATORY REVIEW for {f['target']} (Value: ${f['price']:,.2f}{concentration})")
+        elif kind == 'close':
+            print(f"   DEAL CLOSED: {f['acquirer']} acquired {f['target']}.")
+            print(f"   Price: ${f['price']:,.2f} ({f['structure']})")
+            if f['synergy_score'] > 0:
+                print(f"   Synergy Premium: +{f['synergy_premium']:.2%} (Assets: {decode_matched_assets(f['matched_assets_mask'])})")
+        elif kind == 'block':
+            print(f"   DEAL BLOCKED: Acquisition of {f['target']} by {f['acquirer']}. Reason: {f['reason']}")
+        elif kind == 'step_finished':
+            print(f"--- End of Step {f['step']} ---")
+            print(f"Remaining target companies: {f['remaining_targets']}")
+            if f['deals_in_flight']:
+                print(f"Deals in flight: {f['deals_in_flight']}")
+        elif kind == 'targets_exhausted':
+            print("\nNo more target companies available. Ending simulation.")
+        elif kind == 'simulation_finished':
+            print("\n=== Simulation Finished ===")
+        elif kind == 'metrics':
+            print("\n--- Phase Timings ---")
+            for name, phase in sorted(f['phases'].items(), key=lambda item: -item[1]['total_seconds']):
+                print(f"{name:<22} {phase['calls']:>9,} calls {phase['total_seconds']:>10.4f}s total "
+                      f"{phase['mean_seconds'] * 1e6:>10.1f}us mean {phase['max_seconds'] * 1e6:>10.1f}us max")
+            print("--- Counters ---")
+            for name, value in sorted(f['counters'].items()):
+                print(f"{name:<34} {value:>9,}")
+
+    def close(self):
+        pass
+
+class EventStream:
+    """
+    Routes structured simulation events to a sink.
+
+    Callers guard each emit with `if events.enabled:` so that a stream with a NullSink
+    costs one attribute check per event site and does no formatting at all.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.enabled = self.sink.enabled
+
+    def emit(self, kind, **fields):
+        self.sink.write(kind, fields)
+
+    def close(self):
+        self.sink.close()
+
+    def __reduce__(self):
+        # Sinks may hold open files, and event routing is not simulation state,
+        # so a pickled stream comes back silent.
+        return (EventStream, (NullSink(),))
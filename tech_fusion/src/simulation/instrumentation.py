@@ -0,0 +1,97 @@
+import time
+
+# Histogram buckets are powers of two of nanoseconds; bucket b holds durations in [2**(b-1), 2**b) ns
+NUM_BUCKETS = 64
+
+class _NullPhase:
+    """A do-nothing context manager, shared by every phase while instrumentation is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    """Times one pass through a phase and records it on exit."""
+    __slots__ = ('instrumentation', 'name', 'start')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.instrumentation.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class Instrumentation:
+    """
+    Per-phase wall-time histograms and event counters for the simulation loop.
+
+    While disabled, `phase` hands back a shared no-op context manager and callers skip
+    `count` behind an `enabled` check, so an uninstrumented run pays almost nothing.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Clears all recorded timings and counters."""
+        self.histograms = {}
+        self.totals = {}
+        self.maxima = {}
+        self.counters = {}
+
+    def phase(self, name):
+        """Returns a context manager that times the enclosed block as phase `name`."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, elapsed_ns):
+        """Adds one timing, in nanoseconds, to phase `name`."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = [0] * NUM_BUCKETS
+            self.totals[name] = 0
+            self.maxima[name] = 0
+        histogram[min(elapsed_ns.bit_length(), NUM_BUCKETS - 1)] += 1
+        self.totals[name] += elapsed_ns
+        if elapsed_ns > self.maxima[name]:
+            self.maxima[name] = elapsed_ns
+
+    def count(self, name, amount=1):
+        """Increments counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """
+        Returns the current timings and counters as plain data.
+
+        Returns:
+            dict: Per phase, the call count, total/mean/max seconds and the non-empty histogram
+                buckets keyed by their upper bound in seconds; plus the counters.
+        """
+        phases = {}
+        for name, histogram in self.histograms.items():
+            calls = sum(histogram)
+            phases[name] = {
+                'calls': calls,
+                'total_seconds': self.totals[name] / 1e9,
+                'mean_seconds': self.totals[name] / calls / 1e9,
+                'max_seconds': self.maxima[name] / 1e9,
+                'histogram': {f"{2 ** bucket / 1e9:.9g}": count for bucket, count in enumerate(histogram) if count}
+            }
+        return {'phases': phases, 'counters': dict(self.counters)}
+
+    def emit(self, events):
+        """Publishes the current snapshot as a 'metrics' event."""
+        if events.enabled:
+            events.emit('metrics', **self.snapshot())
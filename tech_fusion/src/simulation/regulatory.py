@@ -1,20 +1,126 @@
 import random
 
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.simulation.events import EventStream
+
+# Concentration thresholds on the 0-10,000 HHI scale, after the merger guidelines
+UNCONCENTRATED_HHI = 1_000
+HIGHLY_CONCENTRATED_HHI = 1_800
+# A merger that raises HHI by this much in a highly concentrated market is presumed anticompetitive
+SIGNIFICANT_HHI_DELTA = 100
+
 class RegulatoryEngine:
     """Simulates the regulatory review process for M&A deals."""
 
-    def __init__(self, block_probability=0.15, review_threshold=5_000_000_000):
+    def __init__(self, block_probability=0.15, review_threshold=5_000_000_000, review_steps=(1, 3), max_block_probability=0.9,
+                 rng=None, events=None):
         """
         Initializes the regulatory engine.
 
         Args:
-            block_probability (float): The base probability that a reviewed deal is blocked.
+            block_probability (float): The probability that a reviewed deal is blocked when it
+                barely changes concentration; deals that raise HHI are blocked more often.
             review_threshold (int): The deal value threshold that triggers a regulatory review.
+            review_steps (tuple): The inclusive range of steps a review takes when deals are filed.
+            max_block_probability (float): The cap on the concentration-driven block probability.
+            rng (random.Random, optional): The random stream for review outcomes, the global one by default.
+            events (EventStream, optional): Where review events go, the console by default.
         """
+        self.rng = rng if rng is not None else random
+        self.events = events if events is not None else EventStream()
         self.block_probability = block_probability
         self.review_threshold = review_threshold
+        self.review_steps = review_steps
+        self.max_block_probability = max_block_probability
         # Certain sectors might attract more scrutiny
         self.sensitive_sectors = ['AI', 'Infrastructure', 'Cybersecurity']
+        # Per-sector revenue totals and sums of squared firm revenues, from which HHI follows
+        # in O(1), and the revenue each acquirer has bought into each sector
+        self.sector_revenue = {}
+        self.sector_sum_squares = {}
+        self.holdings = {}
+
+    def track_market(self, universe):
+        """
+        Starts tracking concentration with every company of a universe as an independent firm.
+
+        Market shares are shares of sector ARR. Acquirers start with no share of any sector
+        and gain the target's revenue with every deal that closes.
+        """
+        sectors = universe['sector']
+        revenue = universe['arr'].astype(float)
+        totals = np.bincount(sectors, weights=revenue, minlength=len(SECTORS))
+        sum_squares = np.bincount(sectors, weights=revenue * revenue, minlength=len(SECTORS))
+        self.sector_revenue = {sector: float(totals[code]) for code, sector in enumerate(SECTORS)}
+        self.sector_sum_squares = {sector: float(sum_squares[code]) for code, sector in enumerate(SECTORS)}
+        self.holdings = {}
+
+    def hhi(self, sector):
+        """Returns the Herfindahl-Hirschman Index of a sector (0-10,000), or None if it is not tracked."""
+        total = self.sector_revenue.get(sector)
+        if not total:
+            return None
+        return 10_000 * self.sector_sum_squares[sector] / (total * total)
+
+    def concentration_change(self, deal):
+        """
+        Returns the (post-merger HHI, HHI change) a deal would cause, or None if its sector is not tracked.
+
+        Merging firms with shares s_a and s_t raises HHI by 2 * s_a * s_t * 10,000.
+        """
+        sector = deal.target['sector']
+        total = self.sector_revenue.get(sector)
+        if not total:
+            return None
+        acquirer_revenue = self.holdings.get((deal.acquirer.name, sector), 0.0)
+        delta = 10_000 * 2 * acquirer_revenue * deal.target['financials']['arr'] / (total * total)
+        return self.hhi(sector) + delta, delta
+
+    def record_close(self, deal):
+        """Merges a closed deal's target into its acquirer's sector revenue, in O(1)."""
+        self._merge(deal.acquirer.name, deal.target['sector'], deal.target['financials']['arr'])
+
+    def record_closes(self, acquirer_names, sector_codes, revenues):
+        """
+        Merges many closed deals at once, in the order given.
+
+        Args:
+            acquirer_names (list): The acquirer of each deal.
+            sector_codes (np.ndarray): The sector code of each deal's target.
+            revenues (np.ndarray): The ARR of each deal's target.
+        """
+        for name, code, revenue in zip(acquirer_names, sector_codes.tolist(), revenues.tolist()):
+            self._merge(name, SECTORS[code], revenue)
+
+    def _merge(self, acquirer_name, sector, target_revenue):
+        if sector not in self.sector_revenue:
+            return
+        key = (acquirer_name, sector)
+        acquirer_revenue = self.holdings.get(key, 0.0)
+        self.sector_sum_squares[sector] += 2 * acquirer_revenue * target_revenue
+        self.holdings[key] = acquirer_revenue + target_revenue
+
+    def block_probability_for(self, deal):
+        """
+        Returns the probability that a reviewed deal is blocked.
+
+        `block_probability` is the floor, so reviews block deals even in fragmented markets
+        and for an acquirer's first deal in a sector. Concentration scales it up by the HHI
+        change relative to SIGNIFICANT_HHI_DELTA, weighted half in unconcentrated markets and
+        double in highly concentrated ones, up to `max_block_probability`.
+        """
+        change = self.concentration_change(deal)
+        if change is None:
+            return self.block_probability
+        post_hhi, delta = change
+        pressure = delta / SIGNIFICANT_HHI_DELTA
+        if post_hhi >= HIGHLY_CONCENTRATED_HHI:
+            pressure *= 2
+        elif post_hhi < UNCONCENTRATED_HHI:
+            pressure *= 0.5
+        return min(self.max_block_probability, self.block_probability * (1 + pressure))
 
     def review_deal(self, deal):
         """
@@ -26,18 +132,87 @@ class RegulatoryEngine:
         Returns:
             tuple: A tuple containing the status (str) and a reason (str).
         """
-        is_sensitive = deal.target['sector'] in self.sensitive_sectors
-        is_large = deal.final_price > self.review_threshold
-
-        # Only large deals in sensitive sectors trigger a review
-        if not (is_large and is_sensitive):
+        if not self.requires_review(deal):
             return "Approved", "Deal did not meet criteria for regulatory review."
 
-        print(f"   REGULATORY REVIEW for {deal.target['name']} (Value: ${deal.final_price:,.2f})")
+        if self.events.enabled:
+            self._emit_review(deal)
+        return self.decide(deal)
+
+    def requires_review(self, deal):
+        """Large deals in sensitive sectors trigger a review, as do deals presumed to harm competition."""
+        if deal.final_price > self.review_threshold and deal.target['sector'] in self.sensitive_sectors:
+            return True
+        change = self.concentration_change(deal)
+        return change is not None and change[0] >= HIGHLY_CONCENTRATED_HHI and change[1] >= SIGNIFICANT_HHI_DELTA
+
+    def requires_review_batch(self, acquirer_names, sector_codes, revenues, prices):
+        """
+        Applies `requires_review` to many deals filed together, as one vectorized filter.
+
+        Every deal is judged against the concentration before any of them closes, as if
+        the filings were simultaneous.
+
+        Args:
+            acquirer_names (list): The acquirer of each deal.
+            sector_codes (np.ndarray): The sector code of each deal's target.
+            revenues (np.ndarray): The ARR of each deal's target.
+            prices (np.ndarray): The final price of each deal.
+
+        Returns:
+            np.ndarray: Whether each deal needs a review.
+        """
+        sensitive = np.array([sector in self.sensitive_sectors for sector in SECTORS])
+        large = (prices > self.review_threshold) & sensitive[sector_codes]
+        totals = np.array([self.sector_revenue.get(sector, 0.0) for sector in SECTORS])[sector_codes]
+        sum_squares = np.array([self.sector_sum_squares.get(sector, 0.0) for sector in SECTORS])[sector_codes]
+        holdings = np.array([self.holdings.get((name, SECTORS[code]), 0.0)
+                             for name, code in zip(acquirer_names, sector_codes.tolist())], dtype=float)
+        tracked = totals > 0
+        squared_totals = np.where(tracked, totals * totals, 1.0)
+        delta = 10_000 * 2 * holdings * revenues / squared_totals
+        post_hhi = 10_000 * sum_squares / squared_totals + delta
+        presumed = tracked & (post_hhi >= HIGHLY_CONCENTRATED_HHI) & (delta >= SIGNIFICANT_HHI_DELTA)
+        return large | presumed
+
+    def _emit_review(self, deal):
+        change = self.concentration_change(deal)
+        post_hhi, delta_hhi = change if change is not None else (None, None)
+        self.events.emit('regulatory_review', target_id=deal.target.get('id'), target=deal.target['name'], price=deal.final_price,
+                         post_hhi=post_hhi, delta_hhi=delta_hhi)
 
-        # Simulate the review outcome
-        if random.random() < self.block_probability:
+    def file_deal(self, deal, scheduler, now):
+        """
+        Files a deal and schedules its outcome instead of resolving it at once.
+
+        Deals that do not need a review are scheduled to close immediately; the others
+        go under review and get a review decision some steps later.
+
+        Args:
+            deal (Deal): The accepted deal.
+            scheduler (EventScheduler): The simulation's event queue.
+            now (int): The current simulation step.
+        """
+        if not self.requires_review(deal):
+            scheduler.schedule(now, 'close', deal)
+            return
+        deal.status = "under_review"
+        if self.events.enabled:
+            self._emit_review(deal)
+        scheduler.schedule(now + self.rng.randint(*self.review_steps), 'review_decision', deal)
+
+    def decide(self, deal):
+        """
+        Draws the outcome of a regulatory review from the sector's current concentration.
+
+        Returns:
+            tuple: A tuple containing the status (str) and a reason (str).
+        """
+        if self.rng.random() < self.block_probability_for(deal):
             reason = f"Blocked due to concerns over market concentration in the {deal.target['sector']} sector."
+            change = self.concentration_change(deal)
+            if change is not None:
+                reason = reason[:-1] + f" (HHI {change[0]:,.0f}, +{change[1]:,.0f})."
             return "Blocked", reason
         else:
             reason = "Approved after regulatory review."
@@ -0,0 +1,54 @@
+import heapq
+
+# Deal lifecycle events, in the order a deal passes through them:
+#   negotiation        negotiation has concluded, the deal moves on to regulatory filing
+#   regulatory_filing  the deal is filed with the regulator, which approves it or opens a review
+#   review_decision    a regulatory review has concluded and the deal is approved or blocked
+#   close              the deal closes
+# Proposals happen during the acquirer search itself and schedule the first of these.
+
+class EventScheduler:
+    """
+    A priority queue of timestamped simulation events.
+
+    Events are ordered by time and, within the same time, by the order they were
+    scheduled, so processing is deterministic. Each push and pop costs O(log n) in the
+    number of pending events, whatever the number of steps or deals in flight.
+    """
+
+    def __init__(self):
+        self.queue = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def schedule(self, time, kind, payload):
+        """
+        Schedules an event.
+
+        Args:
+            time (int): The simulation step the event fires at.
+            kind (str): The event kind.
+            payload: The object the event concerns, usually a Deal.
+        """
+        heapq.heappush(self.queue, (time, self.sequence, kind, payload))
+        self.sequence += 1
+
+    def next_time(self):
+        """Returns the time of the earliest pending event, or None if there are none."""
+        return self.queue[0][0] if self.queue else None
+
+    def pop_due(self, until):
+        """
+        Pops events due at or before `until`, earliest first.
+
+        Handlers may schedule new events while iterating; those are popped too if they are due.
+
+        Yields:
+            tuple: The (time, kind, payload) of each due event.
+        """
+        queue = self.queue
+        while queue and queue[0][0] <= until:
+            time, _, kind, payload = heapq.heappop(queue)
+            yield time, kind, payload
@@ -0,0 +1,337 @@
+import collections
+import io
+import json
+import pickle
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from tech_fusion.src.data_generator.name_pool import get_name_pool
+from tech_fusion.src.market.environment import SENTIMENT_MULTIPLIERS
+from tech_fusion.src.simulation.engine import SimulationEngine, create_rngs
+from tech_fusion.src.simulation.events import EventStream, NullSink, to_json
+from tech_fusion.src.simulation.instrumentation import Instrumentation
+
+INITIAL_SNAPSHOT = 'initial'
+# Snapshots keep arrays of at least this size out of their pickles and share them read-only
+SHARED_ARRAY_BYTES = 1 << 16
+# Each snapshot holds its own live target index, about 8 bytes per company, and shares valuation
+# components with the snapshots it was run from until they are redrawn; at a million companies
+# the default limit keeps a few hundred MB
+MAX_SNAPSHOTS = 16
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles a state with its large arrays set aside, so that restoring it does not copy them."""
+
+    def __init__(self, file, arrays):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+
+    def persistent_id(self, obj):
+        if type(obj) is np.ndarray and obj.nbytes >= SHARED_ARRAY_BYTES:
+            # Restored states share the array, so it must not change under them
+            obj.flags.writeable = False
+            self.arrays.append(obj)
+            return len(self.arrays) - 1
+        return None
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays):
+        super().__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+class SimulationService:
+    """
+    Keeps one simulation loaded in memory to answer what-if queries without a cold start.
+
+    The universe, valuation components and integration score matrix are built once and
+    only read afterwards, so value and score queries from many threads share them.
+    Snapshots hold the pickled mutable state of an engine; a run restores a private copy
+    of that state around the shared universe, so concurrent runs never interfere and
+    never copy the universe. Large arrays are kept out of the pickles and shared read-only
+    between snapshots and runs, which copy them only to change them.
+    """
+
+    def __init__(self, engine, max_snapshots=MAX_SNAPSHOTS):
+        """
+        Args:
+            engine (SimulationEngine): The engine to serve; it is only read, never stepped.
+            max_snapshots (int): The number of snapshots kept, the oldest saved ones being
+                evicted first; the initial snapshot is never evicted.
+        """
+        self.engine = engine
+        self.max_snapshots = max_snapshots
+        self.acquirers_by_name = {acquirer.name: acquirer for acquirer in engine.acquirers}
+        self.lock = threading.Lock()
+        self.snapshots = collections.OrderedDict()
+        self.snapshots[INITIAL_SNAPSHOT] = self._snapshot(engine)
+        # Responses name companies, so the name pool is generated before the first query
+        get_name_pool()
+
+    @staticmethod
+    def _snapshot(engine):
+        """Returns an engine's state as pickled bytes and the arrays they refer to."""
+        buffer, arrays = io.BytesIO(), []
+        _SnapshotPickler(buffer, arrays).dump(engine.get_state())
+        return buffer.getvalue(), arrays
+
+    @staticmethod
+    def _restore(saved):
+        data, arrays = saved
+        return _SnapshotUnpickler(io.BytesIO(data), arrays).load()
+
+    def _company_id(self, value):
+        # JSON true and false would otherwise pass as IDs 1 and 0
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid company ID: {value}")
+        company_id = int(value)
+        if not 0 <= company_id < len(self.engine.universe):
+            raise ValueError(f"Unknown company ID: {company_id}")
+        return company_id
+
+    def _acquirer(self, value):
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid acquirer: {value}")
+        if isinstance(value, int):
+            if not 0 <= value < len(self.engine.acquirers):
+                raise ValueError(f"Unknown acquirer ID: {value}")
+            return self.engine.acquirers[value]
+        if value not in self.acquirers_by_name:
+            raise ValueError(f"Unknown acquirer: {value}")
+        return self.acquirers_by_name[value]
+
+    def value(self, company_ids, sentiment=None):
+        """
+        Values companies under a market sentiment, from the cached valuation components.
+
+        Args:
+            company_ids (list): The companies to value.
+            sentiment (str, optional): 'bull', 'neutral' or 'bear'; the served market's by default.
+
+        Returns:
+            dict: The sentiment and the valuation details of each company.
+        """
+        engine = self.engine
+        ids = np.array([self._company_id(company_id) for company_id in company_ids], dtype=np.intp)
+        sentiment = sentiment or engine.market_env.market_sentiment
+        if sentiment not in SENTIMENT_MULTIPLIERS:
+            raise ValueError(f"Unknown sentiment: {sentiment}")
+        components = {key: values[ids] for key, values in engine.valuation_cache.components.items()}
+        details = engine.valuation_engine.apply_sentiment(engine.universe, components, SENTIMENT_MULTIPLIERS[sentiment],
+                                                          company_ids=ids)
+        companies = []
+        for i, company_id in enumerate(ids):
+            company = engine.universe.company(company_id)
+            companies.append({
+                'id': int(company_id),
+                'name': company['name'],
+                'sector': company['sector'],
+                **{key: (float(value[i]) if isinstance(value, np.ndarray) else value) for key, value in details.items()}
+            })
+        return {'sentiment': sentiment, 'companies': companies}
+
+    def score(self, acquirer, company_id, interest_rate=None):
+        """
+        Scores an acquirer/target pair: integration complexity, synergy and the screening outcome.
+
+        Args:
+            acquirer (str or int): The acquirer's name or ID.
+            company_id (int): The target company.
+            interest_rate (float, optional): The rate to screen at; the served market's by default.
+
+        Returns:
+            dict: The pair's integration score (None for financial buyers), synergy score and
+                premium range, and whether the acquirer would bid or why it would pass.
+        """
+        engine = self.engine
+        acquirer = self._acquirer(acquirer)
+        company_id = self._company_id(company_id)
+        interest_rate = engine.market_env.interest_rate if interest_rate is None else float(interest_rate)
+        acquirer_ids = np.array([engine.acquirer_ids[acquirer]])
+        outcome, scores = engine.auction.screen(acquirer_ids, np.array([company_id]), engine.universe, interest_rate,
+                                                engine.integration_scores_for)
+
+        synergy_score = 0.0
+        if acquirer.type == 'Strategic':
+            # Scored as in Synergy.calculate_synergy, without drawing a premium
+            needs = acquirer.strategic_needs_mask
+            matches = needs & int(engine.universe['assets'][company_id])
+            synergy_score = round(bin(matches).count('1') / bin(needs).count('1'), 2)
+        return {
+            'acquirer': acquirer.name,
+            'acquirer_type': acquirer.type,
+            'target_id': company_id,
+            'target': engine.universe.company(company_id)['name'],
+            'interest_rate': interest_rate,
+            'integration_score': None if np.isnan(scores[0]) else float(scores[0]),
+            'synergy_score': synergy_score,
+            # Synergy premiums are drawn from this range when a deal is priced
+            'synergy_premium_range': [synergy_score * 0.2, synergy_score * 0.4],
+            'outcome': outcome[0]
+        }
+
+    def run(self, snapshot=INITIAL_SNAPSHOT, steps=1, seed=None, save_as=None, params=None):
+        """
+        Runs a private copy of a snapshot for a number of steps.
+
+        Args:
+            snapshot (str): The snapshot to start from.
+            steps (int): The number of steps to run.
+            seed (int, optional): Reseeds every random stream, for a different path from the same state;
+                by default the snapshot's own streams continue, so a run is repeatable.
+            save_as (str, optional): Saves the resulting state as a new snapshot.
+            params (dict, optional): Overrides `integration_threshold` or `max_financing_rate`.
+
+        Returns:
+            dict: The steps run, the number of deals closed and blocked during them, the closed
+                deals themselves if the snapshot retains deals, and the final market state.
+        """
+        with self.lock:
+            if snapshot not in self.snapshots:
+                raise KeyError(f"Unknown snapshot: {snapshot}")
+            saved = self.snapshots[snapshot]
+        state = self._restore(saved)
+        for name, value in (params or {}).items():
+            if name not in ('integration_threshold', 'max_financing_rate'):
+                raise ValueError(f"Unknown run parameter: {name}")
+            state[name] = value
+        if seed is not None:
+            state['rngs'] = create_rngs(seed)
+
+        engine = SimulationEngine.__new__(SimulationEngine)
+        engine.events = EventStream(NullSink())
+        engine.instrumentation = Instrumentation()
+        engine.set_state(state, self.engine.universe, integration_scores=self.engine.integration_scores,
+                         company_sectors=self.engine.target_index.company_sectors)
+        if params and engine.candidate_queues is not None:
+            # Targets were ranked under the snapshot's thresholds
+            engine.candidate_queues.invalidate()
+        start_step, num_deals, blocked_deals = engine.current_step, engine.deal_analytics.num_deals, engine.blocked_deals
+        num_retained = len(engine.completed_deals)
+        # Runs answer in the response and never write reports, so concurrent runs touch no files
+        engine.run_full_simulation(num_steps=start_step + int(steps), generate_report=False, summarize=False)
+
+        if save_as is not None:
+            self.save_snapshot(save_as, engine)
+        deals = engine.completed_deals[num_retained:]
+        return {
+            'snapshot': snapshot,
+            'start_step': start_step,
+            'end_step': engine.current_step,
+            'num_deals': engine.deal_analytics.num_deals - num_deals,
+            'blocked_deals': engine.blocked_deals - blocked_deals,
+            'deals_in_flight': len(engine.scheduler),
+            'remaining_targets': len(engine.target_index),
+            'market': {'sentiment': engine.market_env.market_sentiment, 'interest_rate': engine.market_env.interest_rate},
+            'deals': [{'acquirer': deal.acquirer.name, 'target_id': int(deal.target_id), 'target': deal.target['name'],
+                       'sector': deal.target_sector, 'price': float(deal.final_price), 'structure': deal.structure}
+                      for deal in deals]
+        }
+
+    def save_snapshot(self, name, engine):
+        """Saves an engine's state under a name, evicting the oldest saved snapshots beyond `max_snapshots`."""
+        if name == INITIAL_SNAPSHOT:
+            raise ValueError(f"The {INITIAL_SNAPSHOT} snapshot cannot be replaced")
+        saved = self._snapshot(engine)
+        with self.lock:
+            self.snapshots.pop(name, None)
+            self.snapshots[name] = saved
+            while len(self.snapshots) > self.max_snapshots:
+                oldest = next(name for name in self.snapshots if name != INITIAL_SNAPSHOT)
+                del self.snapshots[oldest]
+
+    def list_snapshots(self):
+        with self.lock:
+            # Shared arrays are counted in every snapshot that refers to them
+            return {'snapshots': [{'name': name, 'bytes': len(data) + sum(array.nbytes for array in arrays)}
+                                  for name, (data, arrays) in self.snapshots.items()]}
+
+    def health(self):
+        return {'status': 'ok', 'num_companies': len(self.engine.universe), 'num_acquirers': len(self.engine.acquirers)}
+
+    def list_acquirers(self):
+        return {'acquirers': [{'id': acquirer_id, 'name': acquirer.name, 'type': acquirer.type}
+                              for acquirer_id, acquirer in enumerate(self.engine.acquirers)]}
+
+class SimulationRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's SimulationService."""
+
+    GET_ROUTES = {'/health': 'health', '/acquirers': 'list_acquirers', '/snapshots': 'list_snapshots'}
+    POST_ROUTES = {'/value': 'value', '/score': 'score', '/run': 'run'}
+
+    def do_GET(self):
+        self._dispatch(self.GET_ROUTES, {})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            self._respond(400, {'error': f"Invalid JSON: {e}"})
+            return
+        self._dispatch(self.POST_ROUTES, body)
+
+    def _dispatch(self, routes, body):
+        method = routes.get(self.path)
+        if method is None:
+            self._respond(404, {'error': f"Unknown route: {self.command} {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            result = getattr(self.server.service, method)(**body)
+        except KeyError as e:
+            self._respond(404, {'error': str(e.args[0]) if e.args else str(e)})
+            return
+        except (TypeError, ValueError) as e:
+            self._respond(400, {'error': str(e)})
+            return
+        result['elapsed_ms'] = (time.perf_counter() - start) * 1e3
+        self._respond(200, result)
+
+    def _respond(self, status, payload):
+        body = to_json(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def create_server(service, host='127.0.0.1', port=8765):
+    """Returns a threaded HTTP server for a service; call `serve_forever` to start it."""
+    server = ThreadingHTTPServer((host, port), SimulationRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve what-if queries against a simulation kept warm in memory.")
+    parser.add_argument('--companies', type=int, default=10_000, help="The number of companies to generate")
+    parser.add_argument('--universe', default=None, help="A universe store to open instead of generating companies")
+    parser.add_argument('--acquirers', type=int, default=None, help="Generate this many acquirers instead of the samples")
+    parser.add_argument('--seed', type=int, default=None, help="The simulation seed")
+    parser.add_argument('--host', default='127.0.0.1', help="The interface to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="The port to listen on")
+    parser.add_argument('--max-snapshots', type=int, default=MAX_SNAPSHOTS,
+                        help="The number of snapshots kept in memory, each about 32 bytes per company")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = SimulationEngine(num_companies=args.companies, seed=args.seed, events=EventStream(NullSink()),
+                              num_acquirers=args.acquirers, universe_path=args.universe)
+    server = create_server(SimulationService(engine, max_snapshots=args.max_snapshots), host=args.host, port=args.port)
+    print(f"Loaded {len(engine.universe):,} companies in {time.perf_counter() - start:.2f}s, "
+          f"serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,154 @@
+import hashlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tech_fusion.src.data_generator.universe_store import store_fingerprint
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.ensemble import run_single_simulation
+
+# SimulationEngine arguments that a sweep may vary; the rest configure plumbing, not the model
+SWEEPABLE_PARAMETERS = sorted(
+    set(inspect.signature(SimulationEngine.__init__).parameters)
+    - {'self', 'seed', 'events', 'retain_deals', 'instrumentation', 'market_scenarios'}
+)
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_code_version = None
+
+def code_version():
+    """Returns a hash of the simulation source code, so that cached results expire when it changes."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for directory, subdirectories, files in os.walk(_SOURCE_ROOT):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(directory, name)
+                    digest.update(os.path.relpath(path, _SOURCE_ROOT).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+def expand_grid(grid):
+    """
+    Expands a parameter grid into the list of every combination.
+
+    Args:
+        grid (dict): Maps each parameter name to a list of values; scalars are held fixed.
+
+    Returns:
+        list: One dict of parameters per grid point.
+    """
+    unknown = set(grid) - set(SWEEPABLE_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    names = sorted(grid)
+    values = [grid[name] if isinstance(grid[name], (list, tuple)) else [grid[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def describe_job(params, seed, num_steps):
+    """
+    Returns everything a run's result depends on: its parameters, seed, length and the code version,
+    plus the file fingerprint of the universe store it opens, since a store can be regenerated in place.
+    """
+    job = {'params': params, 'seed': seed, 'num_steps': num_steps, 'code_version': code_version()}
+    if params.get('universe_path') is not None:
+        job['universe_fingerprint'] = store_fingerprint(params['universe_path'])
+    return job
+
+def job_key(job):
+    """Hashes a job description into its cache key."""
+    return hashlib.sha256(json.dumps(job, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """Memoizes sweep results on disk as one JSON file per job key."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Returns the cached result of a job, or None if it has not been run."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)['result']
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, job, result):
+        """Atomically stores a job's result next to the job description it came from."""
+        path = self._path(key)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'job': job, 'result': result}, f)
+        os.replace(path + '.tmp', path)
+
+def run_sweep_point(params, seed, num_steps):
+    """Runs one grid point with one seed and returns its compact ensemble result."""
+    engine_params = dict(params)
+    num_companies = engine_params.pop('num_companies', 100)
+    return run_single_simulation(seed, num_companies, num_steps, engine_params=engine_params)
+
+def run_sweep(grid, seeds=(0,), num_steps=5, cache_dir='tech_fusion/sweeps', max_workers=None):
+    """
+    Runs every point of a parameter grid for every seed, in parallel, memoizing results on disk.
+
+    Jobs whose parameters, seed, length, code version and universe store were run before are
+    read from the cache, so rerunning an overlapping grid only computes the new points. Each
+    result is cached as soon as it completes, so an interrupted sweep keeps its progress.
+
+    Args:
+        grid (dict): Maps SimulationEngine parameter names, such as `block_probability` or
+            `num_companies`, to the values to sweep.
+        seeds (iterable): The integer seeds to run each grid point with.
+        num_steps (int): The number of steps per run.
+        cache_dir (str): The result cache directory.
+        max_workers (int, optional): The number of worker processes, defaulting to the CPU count.
+
+    Returns:
+        list: One dict per job with its 'params', 'seed', 'result' and whether it was 'cached'.
+    """
+    cache = ResultCache(cache_dir)
+    jobs = [(params, seed) for params in expand_grid(grid) for seed in seeds]
+    results = [None] * len(jobs)
+    pending = {}
+    for index, (params, seed) in enumerate(jobs):
+        job = describe_job(params, seed, num_steps)
+        key = job_key(job)
+        cached = cache.get(key)
+        if cached is not None:
+            results[index] = {'params': params, 'seed': seed, 'result': cached, 'cached': True}
+        else:
+            pending[index] = (key, job)
+
+    if pending:
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            futures = {pool.submit(run_sweep_point, jobs[index][0], jobs[index][1], num_steps): index for index in pending}
+            for future in as_completed(futures):
+                index = futures[future]
+                params, seed = jobs[index]
+                # Round-trip through JSON so fresh and cached results have the same types
+                result = json.loads(json.dumps(future.result()))
+                cache.put(*pending[index], result)
+                results[index] = {'params': params, 'seed': seed, 'result': result, 'cached': False}
+    return results
+
+if __name__ == '__main__':
+    sweep = run_sweep({'max_financing_rate': [0.03, 0.05], 'integration_threshold': [55, 65, 75], 'num_companies': 500},
+                      seeds=range(4), num_steps=5)
+    print(f"{sum(job['cached'] for job in sweep)} of {len(sweep)} jobs read from the cache")
+    by_point = {}
+    for job in sweep:
+        point = tuple(sorted(job['params'].items()))
+        by_point.setdefault(point, []).append(job['result']['num_deals'])
+    for point, num_deals in by_point.items():
+        print(f"{dict(point)}: {sum(num_deals) / len(num_deals):.1f} deals on average")
@@ -0,0 +1,177 @@
+import random
+from array import array
+
+import numpy as np
+
+# Investment focus that matches targets in every sector
+WILDCARD_FOCUS = "High-Growth Tech"
+
+def _int_array(values):
+    """Copies integers into a compact array, whose items index as Python ints without a per-item conversion."""
+    items = array('q')
+    items.frombytes(memoryview(np.ascontiguousarray(values, dtype=np.int64)).cast('B'))
+    return items
+
+class SectorIndex:
+    """Indexes live target companies by sector, with O(1) random draws and removals."""
+
+    def __init__(self, sectors, company_sectors):
+        """
+        Initializes the index with every company live.
+
+        Args:
+            sectors (list): Sector names, indexed by sector code.
+            company_sectors (array-like): The sector code of each company, indexed by company ID.
+        """
+        self.sectors = sectors
+        company_sectors = np.asarray(company_sectors)
+        self.company_sectors = _int_array(company_sectors)
+        # Buckets hold company IDs in ascending order; a stable sort by sector builds them all at once
+        order = np.argsort(company_sectors, kind='stable')
+        counts = np.bincount(company_sectors, minlength=len(sectors))
+        starts = np.cumsum(counts) - counts
+        self.buckets = [_int_array(bucket) for bucket in np.split(order, starts[1:])]
+        # Position of each live company inside its sector bucket, -1 once removed
+        positions = np.empty(len(company_sectors), dtype=np.int64)
+        positions[order] = np.arange(len(company_sectors)) - np.repeat(starts, counts)
+        self.positions = _int_array(positions)
+        self.size = len(self.company_sectors)
+
+    @classmethod
+    def from_state(cls, sectors, company_sectors, buckets):
+        """
+        Creates an index holding the live buckets captured by `get_state`.
+
+        Unlike restoring the state of a new index, nothing is built for every company first,
+        so a restore costs a few array copies. Company sectors never change, so indexes over
+        the same universe can share the `company_sectors` of an existing index.
+
+        Args:
+            sectors (list): Sector names, indexed by sector code.
+            company_sectors (array-like): The sector code of each company, or another index's `company_sectors`.
+            buckets (list): The live buckets returned by `get_state`.
+        """
+        index = cls.__new__(cls)
+        index.sectors = sectors
+        index.company_sectors = company_sectors if isinstance(company_sectors, array) else _int_array(company_sectors)
+        index.set_state(buckets)
+        return index
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, company_id):
+        return self.positions[company_id] >= 0
+
+    def resolve(self, investment_focus):
+        """Resolves an investment focus to the tuple of sector codes it matches."""
+        if WILDCARD_FOCUS in investment_focus:
+            return tuple(range(len(self.sectors)))
+        return tuple(code for code, sector in enumerate(self.sectors)
+                     if any(focus in sector for focus in investment_focus))
+
+    def sample(self, sector_codes, rng=random):
+        """Draws a live company uniformly from the given sectors, or None if they are empty."""
+        total = sum(len(self.buckets[code]) for code in sector_codes)
+        if total == 0:
+            return None
+        draw = rng.randrange(total)
+        for code in sector_codes:
+            bucket = self.buckets[code]
+            if draw < len(bucket):
+                return bucket[draw]
+            draw -= len(bucket)
+
+    def sample_many(self, sector_masks, rng=None):
+        """
+        Draws one live company per row of a sector mask, all rows at once.
+
+        Each draw is uniform over the live companies of the row's sectors, as with `sample`;
+        rows draw independently, so several rows may draw the same company.
+
+        Args:
+            sector_masks (np.ndarray): A (rows, sectors) boolean mask of the sectors each row draws from.
+            rng (np.random.Generator, optional): The random generator to draw from.
+
+        Returns:
+            np.ndarray: The company ID drawn for each row, -1 where its sectors are empty.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        sizes = np.array([len(bucket) for bucket in self.buckets], dtype=np.int64)
+        weights = sector_masks * sizes
+        cumulative = np.cumsum(weights, axis=1)
+        totals = cumulative[:, -1]
+        draws = rng.integers(np.maximum(totals, 1))
+        # The sector a draw falls in is the first whose cumulative count exceeds it
+        sectors = np.count_nonzero(cumulative <= draws[:, None], axis=1)
+        found = np.flatnonzero(totals > 0)
+        sectors = sectors[found]
+        offsets = draws[found] - (cumulative[found, sectors] - weights[found, sectors])
+        company_ids = np.full(len(totals), -1, dtype=np.intp)
+        company_ids[found] = self._lookup(range(len(self.buckets)), sectors, offsets)
+        return company_ids
+
+    def sample_pool(self, sector_codes, size, rng=None):
+        """
+        Draws `size` live companies uniformly, with replacement, from the given sectors.
+
+        Returns:
+            np.ndarray: The company IDs drawn, empty if the sectors are.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        sizes = np.array([len(self.buckets[code]) for code in sector_codes], dtype=np.int64)
+        cumulative = np.cumsum(sizes)
+        if not len(cumulative) or cumulative[-1] == 0:
+            return np.empty(0, dtype=np.intp)
+        draws = rng.integers(cumulative[-1], size=size)
+        sectors = np.searchsorted(cumulative, draws, side='right')
+        offsets = draws - (cumulative - sizes)[sectors]
+        return self._lookup(sector_codes, sectors, offsets)
+
+    def _lookup(self, sector_codes, positions, offsets):
+        """Returns the companies at the given offsets of the buckets of `sector_codes[positions]`."""
+        company_ids = np.empty(len(offsets), dtype=np.intp)
+        for position, code in enumerate(sector_codes):
+            drawn = positions == position
+            if drawn.any():
+                # A zero-copy view, released before the bucket can next be resized
+                company_ids[drawn] = np.frombuffer(self.buckets[code], dtype=np.int64)[offsets[drawn]]
+        return company_ids
+
+    def members(self, sector_codes):
+        """Returns every live company of the given sectors."""
+        buckets = [self.buckets[code] for code in sector_codes]
+        if not buckets:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([np.array(bucket, dtype=np.intp) for bucket in buckets])
+
+    def get_state(self):
+        """Returns the live buckets, in order, so that draws can be replayed after a restore."""
+        return [np.array(bucket, dtype=np.int64) for bucket in self.buckets]
+
+    def set_state(self, buckets):
+        """Restores the live buckets captured by `get_state`, with array copies rather than per-company work."""
+        self.buckets = [_int_array(bucket) for bucket in buckets]
+        positions = np.full(len(self.company_sectors), -1, dtype=np.int64)
+        for bucket in buckets:
+            positions[np.asarray(bucket, dtype=np.int64)] = np.arange(len(bucket))
+        self.positions = _int_array(positions)
+        self.size = sum(len(bucket) for bucket in self.buckets)
+
+    def add(self, company_id):
+        """Makes a removed company live again, appending it to its sector bucket."""
+        bucket = self.buckets[self.company_sectors[company_id]]
+        self.positions[company_id] = len(bucket)
+        bucket.append(company_id)
+        self.size += 1
+
+    def remove(self, company_id):
+        """Removes a company by swapping it with the last entry of its sector bucket."""
+        position = self.positions[company_id]
+        bucket = self.buckets[self.company_sectors[company_id]]
+        last = bucket.pop()
+        if last != company_id:
+            bucket[position] = last
+            self.positions[last] = position
+        self.positions[company_id] = -1
+        self.size -= 1
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def encode_mask(values, vocabulary):
+    """Packs a collection of vocabulary items into an integer bitmask."""
+    mask = 0
+    for value in values:
+        mask |= 1 << vocabulary.index(value)
+    return mask
+
+
+def decode_mask(mask, vocabulary):
+    """Unpacks an integer bitmask into the vocabulary items it contains."""
+    mask = int(mask)
+    return [item for bit, item in enumerate(vocabulary) if mask & (1 << bit)]
+
+
+def sample_masks(rng, num_rows, vocab_size, min_k, max_k):
+    """
+    Draws one random subset per row as a bitmask, like `random.sample` with a random k.
+
+    Each row gets k items (uniform in [min_k, max_k]) chosen without replacement from
+    `vocab_size` items. Subsets are packed into the bits of an unsigned integer.
+    """
+    k = rng.integers(min_k, max_k + 1, size=num_rows)
+    keys = rng.random((num_rows, vocab_size))
+    # The k smallest random keys in a row form a uniform sample without replacement
+    kth_key = np.take_along_axis(np.sort(keys, axis=1), (k - 1)[:, None], axis=1)
+    selected = keys <= kth_key
+    weights = np.left_shift(np.uint64(1), np.arange(vocab_size, dtype=np.uint64))
+    return (selected * weights).sum(axis=1, dtype=np.uint64)
+
+
+# Number of set bits in every possible byte, for NumPy versions without bitwise_count
+_BYTE_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(values):
+    """Counts the set bits in each element of an unsigned integer array."""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = values.view(np.uint8).reshape(values.shape + (8,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.uint8)
@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import pytest
+
+from tech_fusion.src.market.participants import generate_participants
+from tech_fusion.src.simulation.auction import (BID, DRY_POWDER, FINANCIAL_CRITERIA, INTEGRATION_COMPLEXITY, OUTBID,
+                                                BatchAuction)
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+
+
+def make_auction(num_acquirers=40):
+    strategic, financial, _ = generate_participants(num_acquirers, rng=random.Random(3))
+    acquirers = strategic + financial
+    strategic_rows = {acquirer: row for row, acquirer in enumerate(strategic)}
+    return BatchAuction(acquirers, strategic_rows), acquirers
+
+
+def test_resolve_awards_each_target_to_its_highest_affordable_bid():
+    auction, acquirers = make_auction()
+    rng = np.random.default_rng(0)
+    num_bids = 400
+    acquirer_ids = rng.integers(0, len(acquirers), num_bids)
+    company_ids = rng.integers(0, 60, num_bids)
+    # Valuations spread across financial buyers' dry powder, so some bids are unaffordable
+    base_valuations = rng.uniform(1e8, 2e10, 60)[company_ids]
+    asset_masks = rng.integers(0, 1 << 12, num_bids).astype(np.uint64)
+    result = auction.resolve(acquirer_ids, company_ids, base_valuations, asset_masks, rng=np.random.default_rng(1))
+
+    price = result['price']
+    assert price == pytest.approx(base_valuations * (1 + result['negotiated_premium'] + result['synergy_premium']))
+    low, high = auction.premium_low[acquirer_ids], auction.premium_high[acquirer_ids]
+    assert np.all((result['negotiated_premium'] >= low) & (result['negotiated_premium'] <= high))
+
+    outcome = result['outcome']
+    affordable = price <= auction.dry_powder[acquirer_ids]
+    assert np.array_equal(outcome == DRY_POWDER, ~affordable)
+    assert (outcome == DRY_POWDER).any() and (outcome == OUTBID).any()
+    for company_id in np.unique(company_ids):
+        bids = np.flatnonzero((company_ids == company_id) & affordable)
+        winners = np.flatnonzero((company_ids == company_id) & (outcome == BID))
+        if not len(bids):
+            assert not len(winners)
+            continue
+        assert list(winners) == [bids[np.argmax(price[bids])]]
+        assert np.all(result['num_bids'][bids] == len(bids))
+
+
+def test_screen_applies_each_acquirer_type_criteria():
+    engine = SimulationEngine(num_companies=500, seed=6, num_acquirers=30, events=EventStream(NullSink()))
+    auction = engine.auction
+    rng = np.random.default_rng(2)
+    acquirer_ids = rng.integers(0, len(engine.acquirers), 300)
+    company_ids = rng.integers(0, len(engine.universe), 300)
+
+    for interest_rate in (0.02, 0.08):
+        outcome, scores = auction.screen(acquirer_ids, company_ids, engine.universe, interest_rate,
+                                         engine.integration_scores_for)
+        for pair, (acquirer_id, company_id) in enumerate(zip(acquirer_ids.tolist(), company_ids.tolist())):
+            acquirer = engine.acquirers[acquirer_id]
+            if acquirer.type == 'Strategic':
+                score = engine.integration_score(acquirer, company_id)
+                assert scores[pair] == pytest.approx(score)
+                assert outcome[pair] == (BID if score < auction.integration_threshold else INTEGRATION_COMPLEXITY)
+            else:
+                assert np.isnan(scores[pair])
+                bids = engine.universe['ebitda_margin'][company_id] > 0 and interest_rate < auction.max_financing_rate
+                assert outcome[pair] == (BID if bids else FINANCIAL_CRITERIA)
+        assert set(outcome) - {BID, INTEGRATION_COMPLEXITY, FINANCIAL_CRITERIA} == set()
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from tech_fusion.src.simulation.candidate_queues import CandidateQueues
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+from tech_fusion.src.simulation.instrumentation import Instrumentation
+from tech_fusion.src.simulation.target_index import SectorIndex
+
+
+class TableFit:
+    """A fit function backed by an (acquirers, companies) score table, counting its calls."""
+
+    def __init__(self, scores):
+        self.scores = np.asarray(scores, dtype=float)
+        self.calls = 0
+
+    def __call__(self, acquirer_id, company_ids):
+        self.calls += 1
+        return self.scores[acquirer_id, company_ids]
+
+
+def make_queues(scores, company_sectors, sector_masks, **kwargs):
+    index = SectorIndex(['A', 'B'], np.asarray(company_sectors))
+    fit = TableFit(scores)
+    queues = CandidateQueues(len(sector_masks), fit, index, np.asarray(sector_masks), rng=np.random.default_rng(0), **kwargs)
+    return queues, index, fit
+
+
+def test_peek_returns_best_live_target_in_order():
+    scores = [[1.0, 5.0, 3.0, -np.inf, 4.0]]
+    queues, index, _ = make_queues(scores, [0, 0, 0, 0, 1], [[True, False]], pool_size=64)
+    assert queues.peek(0) == 1
+    index.remove(1)
+    assert queues.peek(0) == 2
+    queues.discard(0, 2)
+    assert queues.peek(0) == 0
+
+
+def test_refill_ranks_all_targets_when_the_pool_misses():
+    # One viable target among many, with a pool far too small to find it by sampling
+    scores = np.full((1, 1000), -np.inf)
+    scores[0, 777] = 1.0
+    queues, _, _ = make_queues(scores, np.zeros(1000, dtype=int), [[True, False]], pool_size=1)
+    assert queues.peek(0) == 777
+
+
+def test_exhausted_acquirer_is_not_refilled_until_targets_return():
+    scores = np.full((1, 6), -np.inf)
+    queues, index, fit = make_queues(scores, [0, 0, 0, 1, 1, 1], [[True, False]])
+    index.remove(0)
+    assert queues.peek(0) is None
+    calls = fit.calls
+    for _ in range(5):
+        assert queues.peek(0) is None
+    assert fit.calls == calls
+
+    # A target returning to the market wakes it up if it would pursue it
+    fit.scores[0, 0] = 2.0
+    index.add(0)
+    queues.restore(0)
+    assert queues.peek(0) == 0
+
+
+def test_invalidate_keeps_queues_bounded_and_current():
+    rng = np.random.default_rng(1)
+    num_companies = 400
+    scores = rng.random((3, num_companies))
+    queues, index, fit = make_queues(scores, rng.integers(0, 2, num_companies),
+                                     [[True, False], [False, True], [True, True]], queue_size=8, pool_size=64)
+    for acquirer_id in range(3):
+        queues.peek(acquirer_id)
+    for _ in range(50):
+        changed = rng.choice(num_companies, size=40, replace=False)
+        fit.scores[:, changed] = rng.random((3, len(changed))) * 2
+        queues.invalidate(changed)
+        assert all(len(heap) <= queues.queue_size for heap in queues.heaps)
+
+    for acquirer_id in range(3):
+        company_id = queues.peek(acquirer_id)
+        negative_fit, queued_id, version = queues.heaps[acquirer_id][0]
+        assert queued_id == company_id
+        # The queued fit is the company's current one, not the one it was queued with first
+        assert -negative_fit == fit.scores[acquirer_id, company_id]
+        assert version == queues.versions.get(company_id, 0)
+
+
+def test_invalidate_queues_improved_companies():
+    scores = np.array([[1.0, 2.0, 3.0, 4.0]])
+    queues, _, fit = make_queues(scores, [0, 0, 0, 0], [[True, False]], queue_size=2, pool_size=64)
+    assert queues.peek(0) == 3
+    fit.scores[0, 0] = 10.0
+    queues.invalidate([0])
+    assert queues.peek(0) == 0
+    assert len(queues.heaps[0]) == 2
+
+
+def run_engine(target_selection, **kwargs):
+    instrumentation = Instrumentation(enabled=True)
+    engine = SimulationEngine(num_companies=20_000, seed=4, num_acquirers=200, target_selection=target_selection,
+                              events=EventStream(NullSink()), instrumentation=instrumentation, **kwargs)
+    engine.run_full_simulation(num_steps=5, generate_report=False, summarize=False)
+    counters = instrumentation.snapshot()['counters']
+    return engine, counters['proposals'] / counters['evaluations']
+
+
+def test_ranked_selection_raises_proposal_share():
+    _, random_share = run_engine('random')
+    _, ranked_share = run_engine('ranked')
+    assert ranked_share > random_share
+
+
+@pytest.mark.parametrize('bidding', ['auction', 'sequential', 'vectorized'])
+def test_ranked_resume_is_identical(tmp_path, bidding):
+    kwargs = dict(num_companies=3000, seed=9, num_acquirers=100, bidding=bidding, target_selection='ranked',
+                  negotiation_steps=1, events=EventStream(NullSink()))
+    straight = SimulationEngine(**kwargs)
+    straight.run_full_simulation(num_steps=6, generate_report=False, summarize=False)
+
+    first = SimulationEngine(**kwargs)
+    first.run_full_simulation(num_steps=3, generate_report=False, summarize=False, checkpoint_dir=str(tmp_path),
+                              checkpoint_every=3)
+    resumed = SimulationEngine.from_checkpoint(str(tmp_path), events=EventStream(NullSink()))
+    resumed.run_full_simulation(num_steps=6, generate_report=False, summarize=False)
+
+    def deals(engine):
+        return [(deal.acquirer_id, deal.target_id, deal.final_price) for deal in engine.completed_deals]
+    assert deals(resumed) == deals(straight)
+    assert resumed.blocked_deals == straight.blocked_deals
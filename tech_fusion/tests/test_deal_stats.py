@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pytest
+
+from tech_fusion.src.analytics.deal_stats import (METRICS, MIN_VECTORIZED_BATCH, DealAnalytics, QuantileSketch,
+                                                  RunningStats)
+
+
+def exact_quantile(values, q):
+    """The value a sketch's q-quantile estimates: the one at rank q * (n - 1), rounded down."""
+    return np.sort(values)[int(q * (len(values) - 1))]
+
+
+@pytest.mark.parametrize('relative_accuracy', [0.01, 0.05])
+def test_sketch_quantiles_are_within_relative_accuracy(relative_accuracy):
+    values = np.random.default_rng(0).lognormal(mean=20, sigma=2, size=20_000)
+    sketch = QuantileSketch(relative_accuracy)
+    for value in values.tolist():
+        sketch.add(value)
+    for q in (0.0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=relative_accuracy * (1 + 1e-9))
+
+
+def test_sketch_merge_and_serialization_are_exact():
+    rng = np.random.default_rng(1)
+    first, second = rng.uniform(0, 1, 500), np.concatenate([rng.exponential(2, 500), np.zeros(20)])
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in np.concatenate([first, second]).tolist():
+        whole.add(value)
+    for value in first.tolist():
+        left.add(value)
+    for value in second.tolist():
+        right.add(value)
+    left.merge(right)
+    assert left.to_dict() == whole.to_dict()
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+    assert restored.to_dict() == whole.to_dict()
+    assert restored.quantile(0.5) == whole.quantile(0.5)
+    with pytest.raises(ValueError):
+        whole.merge(QuantileSketch(0.05))
+
+
+def test_running_stats_merge_matches_numpy():
+    values = np.random.default_rng(2).normal(1e9, 3e8, 1001)
+    whole, left, right = RunningStats(), RunningStats(), RunningStats()
+    for value in values.tolist():
+        whole.add(value)
+    for value in values[:400].tolist():
+        left.add(value)
+    for value in values[400:].tolist():
+        right.add(value)
+    left.merge(right)
+    for stats in (whole, left):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+        assert (stats.minimum, stats.maximum) == (values.min(), values.max())
+
+
+def random_deals(num_deals, seed=3):
+    rng = np.random.default_rng(seed)
+    acquirer_types = rng.choice(['Strategic', 'Financial'], num_deals)
+    return {
+        'sectors': rng.choice(['AI', 'SaaS', 'Fintech', 'Cybersecurity'], num_deals),
+        'acquirer_types': acquirer_types,
+        'structures': rng.choice(['All-Cash', 'All-Stock', 'Hybrid'], num_deals),
+        'final_prices': rng.lognormal(21, 1.5, num_deals),
+        'negotiated_premiums': rng.uniform(0.10, 0.30, num_deals),
+        # Financial buyers see no synergies, so many premiums are zero
+        'synergy_premiums': np.where(acquirer_types == 'Strategic', rng.uniform(0, 0.4, num_deals), 0.0)
+    }
+
+
+@pytest.mark.parametrize('num_deals', [MIN_VECTORIZED_BATCH - 1, 2000])
+def test_record_batch_matches_per_deal_records(num_deals):
+    deals = random_deals(num_deals)
+    per_deal, batched = DealAnalytics(), DealAnalytics()
+    for fields in zip(*(column.tolist() for column in deals.values())):
+        per_deal._record_values(*fields)
+    # Split in two batches, so that batches also merge into existing statistics
+    half = num_deals // 2
+    batched.record_batch(*(column[:half] for column in deals.values()))
+    batched.record_batch(*(column[half:] for column in deals.values()))
+
+    assert batched.num_deals == per_deal.num_deals == num_deals
+    assert set(batched.groups) == set(per_deal.groups)
+    for key, group in per_deal.groups.items():
+        for metric in METRICS:
+            expected, actual = group[metric], batched.groups[key][metric]
+            assert actual.stats.count == expected.stats.count
+            for name in ('total', 'mean', 'm2'):
+                assert getattr(actual.stats, name) == pytest.approx(getattr(expected.stats, name), rel=1e-9, abs=1e-12)
+            assert (actual.stats.minimum, actual.stats.maximum) == (expected.stats.minimum, expected.stats.maximum)
+            assert actual.sketch.to_dict() == expected.sketch.to_dict()
+
+
+def test_analytics_merge_and_round_trip():
+    deals = random_deals(600, seed=4)
+    whole, left, right = DealAnalytics(), DealAnalytics(), DealAnalytics()
+    whole.record_batch(*deals.values())
+    left.record_batch(*(column[:250] for column in deals.values()))
+    right.record_batch(*(column[250:] for column in deals.values()))
+    merged = DealAnalytics.from_dict(json.loads(json.dumps(left.merge(right).to_dict())))
+    assert merged.num_deals == whole.num_deals
+    for key, group in whole.groups.items():
+        for metric in METRICS:
+            assert merged.groups[key][metric].sketch.to_dict() == group[metric].sketch.to_dict()
+            assert merged.groups[key][metric].stats.mean == pytest.approx(group[metric].stats.mean, rel=1e-12)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.simulation.engine import BIDDING_MODES, SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink, RingBufferSink
+
+
+def deals(engine):
+    return [(deal.acquirer_id, deal.target_id, deal.final_price, deal.structure) for deal in engine.completed_deals]
+
+
+def run_vectorized(monkeypatch, batch_close):
+    """Runs vectorized bidding with reviews off, closing deals in one batch or through the per-deal lifecycle."""
+    engine = SimulationEngine(num_companies=3000, seed=12, num_acquirers=150, bidding='vectorized',
+                              events=EventStream(NullSink()))
+    regulatory = engine.regulatory_engine
+    monkeypatch.setattr(regulatory, 'requires_review', lambda deal: False)
+    monkeypatch.setattr(regulatory, 'requires_review_batch',
+                        lambda acquirer_names, sector_codes, revenues, prices: np.full(len(prices), not batch_close))
+    engine.run_full_simulation(num_steps=5, generate_report=False, summarize=False)
+    return engine
+
+
+def test_batch_close_matches_the_deal_lifecycle(monkeypatch):
+    batched = run_vectorized(monkeypatch, batch_close=True)
+    lifecycle = run_vectorized(monkeypatch, batch_close=False)
+    assert deals(batched)
+    assert deals(batched) == deals(lifecycle)
+    assert batched.deal_analytics.to_dict() == lifecycle.deal_analytics.to_dict()
+    assert len(batched.target_index) == len(lifecycle.target_index)
+    for sector in SECTORS:
+        assert batched.regulatory_engine.hhi(sector) == pytest.approx(lifecycle.regulatory_engine.hhi(sector), rel=1e-12)
+
+
+@pytest.mark.parametrize('bidding', BIDDING_MODES)
+def test_resume_matches_a_straight_run(tmp_path, bidding):
+    # Deals negotiate across the checkpoint, and reviews are frequent enough to be in flight too
+    kwargs = dict(num_companies=3000, seed=21, num_acquirers=100, bidding=bidding, negotiation_steps=2,
+                  block_probability=0.5, events=EventStream(NullSink()))
+    straight = SimulationEngine(**kwargs)
+    straight.run_full_simulation(num_steps=8, generate_report=False, summarize=False)
+
+    first = SimulationEngine(**kwargs)
+    first.run_full_simulation(num_steps=4, generate_report=False, summarize=False, checkpoint_dir=str(tmp_path),
+                              checkpoint_every=4)
+    assert first.scheduler
+    resumed = SimulationEngine.from_checkpoint(str(tmp_path), events=EventStream(NullSink()))
+    resumed.run_full_simulation(num_steps=8, generate_report=False, summarize=False)
+
+    assert deals(straight)
+    assert deals(resumed) == deals(straight)
+    assert resumed.blocked_deals == straight.blocked_deals
+    assert resumed.deal_analytics.to_dict() == straight.deal_analytics.to_dict()
+    assert resumed.market_env.interest_rate == straight.market_env.interest_rate
+
+
+def test_quiet_checkpoint_resumes_with_events(tmp_path):
+    kwargs = dict(num_companies=3000, seed=21, num_acquirers=100, negotiation_steps=2, block_probability=0.5)
+    straight = SimulationEngine(events=EventStream(NullSink()), **kwargs)
+    straight.run_full_simulation(num_steps=8, generate_report=False, summarize=False)
+
+    quiet = SimulationEngine(events=EventStream(NullSink()), **kwargs)
+    quiet.run_full_simulation(num_steps=4, generate_report=False, summarize=False, checkpoint_dir=str(tmp_path),
+                              checkpoint_every=4)
+    assert quiet.scheduler
+    sink = RingBufferSink(capacity=1_000_000)
+    resumed = SimulationEngine.from_checkpoint(str(tmp_path), events=EventStream(sink))
+    resumed.run_full_simulation(num_steps=8, generate_report=False, summarize=False)
+
+    assert deals(resumed) == deals(straight)
+    universe = resumed.universe
+    emitted = [(kind, fields) for kind, fields in sink.events if kind in ('regulatory_review', 'block', 'close')]
+    assert {kind for kind, _ in emitted} == {'regulatory_review', 'block', 'close'}
+    for _, fields in emitted:
+        assert fields['target'] == universe.company_identity(fields['target_id'])[0]
+
+
+def test_unretained_deals_are_still_counted(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    sink = RingBufferSink()
+    engine = SimulationEngine(num_companies=1000, seed=4, num_acquirers=40, retain_deals=False, events=EventStream(sink))
+    engine.run_full_simulation(num_steps=4, stream_report='columnar')
+    num_deals = engine.deal_analytics.num_deals
+    assert num_deals and not engine.completed_deals
+
+    finished = [fields for kind, fields in sink.events if kind == 'simulation_finished']
+    assert finished[-1]['num_deals'] == num_deals
+    summary = capsys.readouterr().out
+    assert f"{num_deals} deals were completed" in summary
+    assert "No deals were completed" not in summary
@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+import pytest
+
+from tech_fusion.src.analytics.integration import IntegrationComplexity
+from tech_fusion.src.data_generator.company_generator import CompanyGenerator
+from tech_fusion.src.market.participants import generate_participants, get_sample_participants
+
+
+@pytest.fixture(scope='module')
+def universe():
+    return CompanyGenerator().generate_universe(400, rng=np.random.default_rng(5))
+
+
+@pytest.mark.parametrize('acquirers', [get_sample_participants(rng=random.Random(0))[0],
+                                       generate_participants(60, rng=random.Random(1))[0]])
+def test_pair_scores_match_scalar_scores(universe, acquirers):
+    analyzer = IntegrationComplexity()
+    encoded = analyzer.encode_acquirers(acquirers)
+    rng = np.random.default_rng(6)
+    acquirer_idx = rng.integers(0, len(acquirers), 2000)
+    company_ids = rng.integers(0, len(universe), 2000)
+    scores = analyzer.calculate_pair_scores(encoded, acquirer_idx, universe, company_ids)
+    expected = [analyzer.calculate_score(acquirers[row], universe.company(company_id, identity=False))
+                for row, company_id in zip(acquirer_idx.tolist(), company_ids.tolist())]
+    assert scores.tolist() == expected
+
+
+def test_score_matrix_matches_scalar_scores(universe):
+    analyzer = IntegrationComplexity()
+    acquirers = generate_participants(20, rng=random.Random(2))[0]
+    company_ids = np.arange(0, len(universe), 7)
+    matrix = analyzer.calculate_score_matrix(acquirers, universe, company_ids)
+    assert matrix.shape == (len(acquirers), len(company_ids))
+    for row, acquirer in enumerate(acquirers):
+        assert matrix[row].tolist() == [analyzer.calculate_score(acquirer, universe.company(company_id, identity=False))
+                                        for company_id in company_ids.tolist()]
@@ -0,0 +1,17 @@
+import random
+
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.market.participants import generate_participants
+from tech_fusion.src.simulation.target_index import SectorIndex
+
+
+def test_every_generated_acquirer_can_reach_a_sector():
+    strategic, financial, _ = generate_participants(10_000, rng=random.Random(0))
+    index = SectorIndex(SECTORS, np.arange(len(SECTORS)))
+    for acquirer in strategic + financial:
+        assert index.resolve(acquirer.investment_focus)
+        assert len(set(acquirer.investment_focus)) == len(acquirer.investment_focus)
+    # Foci without a target sector are still drawn, just never on their own
+    assert any('Cloud' in acquirer.investment_focus for acquirer in strategic + financial)
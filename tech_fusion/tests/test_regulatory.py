@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+from tech_fusion.src.simulation.regulatory import SIGNIFICANT_HHI_DELTA
+
+
+def run_engine(bidding, num_steps=6):
+    engine = SimulationEngine(num_companies=600, seed=5, num_acquirers=30, bidding=bidding, negotiation_steps=1,
+                              events=EventStream(NullSink()))
+    engine.run_full_simulation(num_steps=num_steps, generate_report=False, summarize=False)
+    return engine
+
+
+def firm_revenues(engine):
+    """Recomputes every sector's firms from scratch: unacquired companies plus each acquirer's purchases."""
+    universe = engine.universe
+    firms = {sector: {('company', company_id): float(universe['arr'][company_id])
+                      for company_id in range(len(universe)) if universe['sector'][company_id] == code}
+             for code, sector in enumerate(SECTORS)}
+    for deal in engine.completed_deals:
+        sector = deal.target_sector
+        revenue = firms[sector].pop(('company', deal.target_id))
+        key = ('acquirer', deal.acquirer.name)
+        firms[sector][key] = firms[sector].get(key, 0.0) + revenue
+    return firms
+
+
+def brute_force_hhi(revenues):
+    total = sum(revenues.values())
+    return 10_000 * sum(revenue * revenue for revenue in revenues.values()) / (total * total)
+
+
+@pytest.mark.parametrize('bidding', ['auction', 'sequential', 'vectorized'])
+def test_incremental_hhi_matches_recompute(bidding):
+    engine = run_engine(bidding)
+    assert engine.completed_deals
+    firms = firm_revenues(engine)
+    for sector in SECTORS:
+        if firms[sector]:
+            assert engine.regulatory_engine.hhi(sector) == pytest.approx(brute_force_hhi(firms[sector]), rel=1e-9)
+
+
+def test_concentration_change_matches_recompute():
+    engine = run_engine('auction')
+    firms = firm_revenues(engine)
+    # Pair every acquirer with live targets in its sectors, including ones where it already holds revenue
+    checked = concentrating = 0
+    for acquirer in engine.acquirers:
+        for code in engine.acquirer_sectors[acquirer]:
+            bucket = engine.target_index.buckets[code]
+            if not bucket:
+                continue
+            target = engine.get_company(bucket[0], identity=False)
+            sector = SECTORS[code]
+            before = firms[sector]
+            after = dict(before)
+            revenue = after.pop(('company', target['id']))
+            key = ('acquirer', acquirer.name)
+            after[key] = after.get(key, 0.0) + revenue
+
+            post_hhi, delta = engine.regulatory_engine.concentration_change(SimpleNamespace(acquirer=acquirer, target=target))
+            assert post_hhi == pytest.approx(brute_force_hhi(after), rel=1e-9)
+            assert delta == pytest.approx(brute_force_hhi(after) - brute_force_hhi(before), rel=1e-6, abs=1e-9)
+            checked += 1
+            concentrating += delta > 0
+    assert checked and concentrating
+
+
+def test_block_probability_floor_and_scaling():
+    engine = SimulationEngine(num_companies=200, seed=1, events=EventStream(NullSink()))
+    regulatory = engine.regulatory_engine
+    acquirer = engine.strategic_acquirers[0]
+    target = engine.get_company(0, identity=False)
+    deal = SimpleNamespace(acquirer=acquirer, target=target)
+
+    # A first deal in a sector changes nothing, but reviews still block at the base rate
+    assert regulatory.concentration_change(deal)[1] == 0
+    assert regulatory.block_probability_for(deal) == regulatory.block_probability
+
+    # Holding revenue in the sector raises the HHI change and with it the block probability
+    sector = target['sector']
+    regulatory.holdings[(acquirer.name, sector)] = regulatory.sector_revenue[sector] / 4
+    assert regulatory.concentration_change(deal)[1] > 0
+    assert regulatory.block_probability_for(deal) > regulatory.block_probability
+
+    regulatory.holdings[(acquirer.name, sector)] = regulatory.sector_revenue[sector] * 100
+    assert regulatory.concentration_change(deal)[1] > SIGNIFICANT_HHI_DELTA
+    assert regulatory.block_probability_for(deal) == regulatory.max_block_probability
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from tech_fusion.src.market.scenarios import MarketScenarios
+from tech_fusion.src.simulation import ensemble
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+
+
+def make_engine(scenarios):
+    return SimulationEngine(num_companies=300, seed=1, market_scenarios=scenarios, events=EventStream(NullSink()))
+
+
+def test_short_market_path_is_rejected_before_running():
+    scenarios = MarketScenarios.generate(num_paths=1, num_steps=3, rng=np.random.default_rng(0))
+    engine = make_engine(scenarios)
+    with pytest.raises(ValueError):
+        engine.run_full_simulation(num_steps=4, generate_report=False, summarize=False)
+    assert engine.current_step == 0
+
+    engine.run_full_simulation(num_steps=3, generate_report=False, summarize=False)
+    assert engine.current_step == 3
+    assert engine.market_env.interest_rate == scenarios.interest_rates[0, 2]
+
+
+def test_short_scenarios_fail_an_ensemble_before_any_run(monkeypatch):
+    def run_single_simulation(*args, **kwargs):
+        raise AssertionError("No run should start")
+    monkeypatch.setattr(ensemble, 'run_single_simulation', run_single_simulation)
+    scenarios = MarketScenarios.generate(num_paths=4, num_steps=3, rng=np.random.default_rng(0))
+    with pytest.raises(ValueError):
+        ensemble.run_ensemble(num_runs=4, num_companies=100, num_steps=5, seed=0, max_workers=1, scenarios=scenarios)
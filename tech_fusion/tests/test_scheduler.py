@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from tech_fusion.src.data_generator.company_generator import SECTORS
+from tech_fusion.src.simulation.deal import Deal
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+from tech_fusion.src.simulation.scheduler import EventScheduler
+
+
+def test_events_pop_by_time_then_scheduling_order():
+    scheduler = EventScheduler()
+    scheduler.schedule(3, 'close', 'c')
+    scheduler.schedule(1, 'negotiation', 'a')
+    scheduler.schedule(1, 'negotiation', 'b')
+    scheduler.schedule(5, 'close', 'd')
+    assert scheduler.next_time() == 1
+    assert [payload for _, _, payload in scheduler.pop_due(3)] == ['a', 'b', 'c']
+    assert len(scheduler) == 1 and scheduler.next_time() == 5
+
+
+def test_events_scheduled_while_popping_are_popped_when_due():
+    scheduler = EventScheduler()
+    scheduler.schedule(1, 'negotiation', 'deal')
+    popped = []
+    for time, kind, payload in scheduler.pop_due(2):
+        popped.append((time, kind))
+        if kind == 'negotiation':
+            scheduler.schedule(time, 'regulatory_filing', payload)
+            scheduler.schedule(time + 5, 'review_decision', payload)
+    assert popped == [(1, 'negotiation'), (1, 'regulatory_filing')]
+    assert scheduler.next_time() == 6
+
+
+def propose_reviewed_deal(block_probability, negotiation_steps=2):
+    """Proposes a deal at step 1 that negotiates for some steps and is always reviewed."""
+    engine = SimulationEngine(num_companies=300, seed=2, negotiation_steps=negotiation_steps,
+                              block_probability=block_probability, events=EventStream(NullSink()))
+    regulatory = engine.regulatory_engine
+    regulatory.review_threshold = 0
+    regulatory.max_block_probability = 1.0
+    sensitive = [code for code, sector in enumerate(SECTORS) if sector in regulatory.sensitive_sectors]
+    company_id = next(company_id for company_id in range(len(engine.universe))
+                      if engine.universe['sector'][company_id] in sensitive)
+    acquirer = engine.strategic_acquirers[0]
+    target = engine.get_company(company_id)
+    deal = Deal(acquirer, target, rng=random.Random(0))
+    engine._propose(acquirer, target, deal, 1)
+    return engine, deal, company_id
+
+
+def run_until_settled(engine, deal, start=1, limit=10):
+    for step in range(start, limit):
+        closed = engine.process_events(step)
+        if deal.status in ('closed', 'failed'):
+            return step, closed
+    raise AssertionError(f"Deal still {deal.status} at step {limit}")
+
+
+@pytest.mark.parametrize('block_probability, status', [(0.0, 'closed'), (1.0, 'failed')])
+def test_reviewed_deal_lifecycle(block_probability, status):
+    engine, deal, company_id = propose_reviewed_deal(block_probability)
+    assert deal.status == 'negotiating'
+    assert company_id not in engine.target_index
+
+    # Negotiation concludes two steps later, when the deal is filed and goes under review
+    assert engine.process_events(2) == []
+    assert deal.status == 'negotiating'
+    assert engine.process_events(3) == []
+    assert deal.status == 'under_review'
+
+    step, closed = run_until_settled(engine, deal, start=4)
+    assert 3 + engine.regulatory_engine.review_steps[0] <= step <= 3 + engine.regulatory_engine.review_steps[1]
+    assert deal.status == status
+    assert not engine.scheduler
+    if status == 'closed':
+        assert [record.target_id for record in closed] == [company_id]
+        assert company_id not in engine.target_index
+        assert engine.blocked_deals == 0
+    else:
+        # A blocked target is back on the market
+        assert closed == []
+        assert company_id in engine.target_index
+        assert engine.blocked_deals == 1
+
+
+def test_unreviewed_deal_closes_when_negotiation_ends():
+    engine, deal, company_id = propose_reviewed_deal(0.0, negotiation_steps=0)
+    engine.regulatory_engine.review_threshold = float('inf')
+    closed = engine.process_events(1)
+    assert deal.status == 'closed'
+    assert [record.target_id for record in closed] == [company_id]
+    assert engine.deal_analytics.num_deals == 1
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+
+from tech_fusion.src.simulation import server
+from tech_fusion.src.simulation.engine import SimulationEngine
+from tech_fusion.src.simulation.events import EventStream, NullSink
+from tech_fusion.src.simulation.server import INITIAL_SNAPSHOT, SimulationService
+
+
+@pytest.fixture(scope='module')
+def service():
+    engine = SimulationEngine(num_companies=2000, seed=3, num_acquirers=60, target_selection='ranked',
+                              events=EventStream(NullSink()))
+    return SimulationService(engine)
+
+
+@pytest.mark.parametrize('value', [True, False])
+def test_boolean_ids_are_rejected(service, value):
+    with pytest.raises(ValueError):
+        service.value([value])
+    with pytest.raises(ValueError):
+        service.score(value, 0)
+    with pytest.raises(ValueError):
+        service.score(0, value)
+
+
+def test_runs_are_repeatable(service):
+    assert service.run(steps=3) == service.run(steps=3)
+    assert service.run(steps=3, seed=11) == service.run(steps=3, seed=11)
+
+
+def test_continuing_a_snapshot_matches_a_straight_run(service):
+    straight = service.run(steps=4)
+    first = service.run(steps=2, save_as='halfway')
+    second = service.run(snapshot='halfway', steps=2)
+    assert second['end_step'] == straight['end_step']
+    assert first['deals'] + second['deals'] == straight['deals']
+    assert first['blocked_deals'] + second['blocked_deals'] == straight['blocked_deals']
+    assert second['remaining_targets'] == straight['remaining_targets']
+
+
+def test_runs_write_no_files(service, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service.run(steps=2, params={'integration_threshold': 60})
+    assert os.listdir(tmp_path) == []
+
+
+def test_seeds_reseed_every_stream(service):
+    runs = [service.run(steps=4, seed=seed) for seed in (1, 2, 3)]
+    # The market draws from its own stream, so reseeded runs follow different market paths
+    assert len({run['market']['interest_rate'] for run in runs}) == 3
+    assert service.run(steps=4)['market'] != service.run(steps=4, seed=1)['market']
+
+
+def test_snapshots_share_arrays_and_copy_them_on_write(service, monkeypatch):
+    # Share every array, however small the test universe
+    monkeypatch.setattr(server, 'SHARED_ARRAY_BYTES', 0)
+    shared = SimulationService(service.engine)
+    baseline = shared.run(steps=3)
+    shared.run(steps=1, save_as='first')
+    initial_arrays = shared.snapshots[INITIAL_SNAPSHOT][1]
+    assert any(array is initial for array in shared.snapshots['first'][1] for initial in initial_arrays)
+
+    state = shared._restore(shared.snapshots[INITIAL_SNAPSHOT])
+    cache = state['valuation_cache']
+    cache.universe, cache.valuation_engine = service.engine.universe, service.engine.valuation_engine
+    before = {name: values.copy() for name, values in cache.components.items()}
+    cache.invalidate(np.arange(10))
+    restored = shared._restore(shared.snapshots[INITIAL_SNAPSHOT])['valuation_cache'].components
+    for name, values in restored.items():
+        assert np.array_equal(values, before[name])
+        assert not np.array_equal(cache.components[name], values)
+    # Runs from the snapshot are unaffected by the private copy's change
+    assert shared.run(steps=3) == baseline
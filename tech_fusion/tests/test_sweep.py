@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+
+from tech_fusion.src.data_generator.company_generator import CompanyGenerator
+from tech_fusion.src.data_generator.universe_store import save_universe
+from tech_fusion.src.simulation.sweep import describe_job, job_key, run_sweep, run_sweep_point
+
+
+def test_job_key_tracks_universe_store_rewrites(tmp_path):
+    store = str(tmp_path / 'universe')
+    save_universe(CompanyGenerator().generate_universe(200, rng=np.random.default_rng(1)), store)
+    params = {'universe_path': store}
+    key = job_key(describe_job(params, 0, 3))
+    assert job_key(describe_job(params, 0, 3)) == key
+
+    # Regenerating the store in place must not serve the old store's results
+    save_universe(CompanyGenerator().generate_universe(200, rng=np.random.default_rng(2)), store)
+    # Move the modification time on explicitly, for filesystems with coarse timestamps
+    path = os.path.join(store, 'arr.npy')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert job_key(describe_job(params, 0, 3)) != key
+
+
+def test_block_probability_changes_results():
+    params = {'num_companies': 2000, 'num_acquirers': 100}
+    never = run_sweep_point({**params, 'block_probability': 0.0}, 1, 5)
+    always = run_sweep_point({**params, 'block_probability': 1.0}, 1, 5)
+    assert never['blocked_deals'] == 0
+    assert always['blocked_deals'] > 0
+
+
+def test_rerun_reads_the_cache(tmp_path):
+    grid = {'integration_threshold': [55, 75], 'num_companies': 100}
+    first = run_sweep(grid, seeds=[0], num_steps=2, cache_dir=str(tmp_path), max_workers=1)
+    second = run_sweep(grid, seeds=[0], num_steps=2, cache_dir=str(tmp_path), max_workers=1)
+    assert not any(job['cached'] for job in first)
+    assert all(job['cached'] for job in second)
+    assert [job['result'] for job in first] == [job['result'] for job in second]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from tech_fusion.src.data_generator.company_generator import CompanyGenerator
+from tech_fusion.src.data_generator.universe_store import open_universe, save_universe
+from tech_fusion.src.simulation.engine import SimulationEngine, create_rngs
+from tech_fusion.src.simulation.events import EventStream, NullSink
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_store_round_trip(tmp_path, mmap):
+    universe = CompanyGenerator().generate_universe(300, rng=np.random.default_rng(4))
+    save_universe(universe, str(tmp_path))
+    opened = open_universe(str(tmp_path), mmap=mmap)
+
+    assert len(opened) == len(universe)
+    assert opened.name_seed == universe.name_seed
+    assert list(opened.columns) == list(universe.columns)
+    for name, column in universe.columns.items():
+        assert opened[name].dtype == column.dtype
+        assert np.array_equal(opened[name], column)
+        assert isinstance(opened[name], np.memmap) == mmap
+    for company_id in (0, 150, 299):
+        assert opened.company(company_id) == universe.company(company_id)
+
+
+def test_mapped_columns_are_read_only(tmp_path):
+    save_universe(CompanyGenerator().generate_universe(50, rng=np.random.default_rng(0)), str(tmp_path))
+    opened = open_universe(str(tmp_path))
+    with pytest.raises(ValueError):
+        opened['arr'][0] = 0
+
+
+def test_engine_on_a_store_matches_a_generated_universe(tmp_path):
+    seed, num_companies = 8, 1000
+    universe = CompanyGenerator().generate_universe(num_companies, rng=create_rngs(seed)['universe'])
+    save_universe(universe, str(tmp_path))
+
+    def deals(**kwargs):
+        engine = SimulationEngine(seed=seed, num_acquirers=40, events=EventStream(NullSink()), **kwargs)
+        engine.run_full_simulation(num_steps=4, generate_report=False, summarize=False)
+        return [(deal.acquirer_id, deal.target_id, deal.final_price) for deal in engine.completed_deals]
+
+    generated = deals(num_companies=num_companies)
+    assert generated
+    assert deals(universe_path=str(tmp_path)) == generated